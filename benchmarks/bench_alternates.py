@@ -0,0 +1,104 @@
+"""
+hreflang alternates for 40 and 200 locales: one ``Link(rel="alternate")``
+per locale versus a single ``Alternates`` element.
+
+- memory: bytes allocated to hold the elements, measured with tracemalloc.
+- build + compile: creating the elements and rendering them once, as a view
+  building per-page alternates does.
+- compile: rendering already built elements without their memo.
+
+Run with::
+
+    python benchmarks/bench_alternates.py
+"""
+
+import timeit
+import tracemalloc
+
+from markupsafe import Markup
+
+from pyhead.elements import Alternates, Link
+
+SIZES = (40, 200)
+
+TEMPLATE = "https://example.com/{locale}/articles/some-article?ref=hreflang&x=1"
+
+
+def _locales(count: int) -> list[str]:
+    return [f"l{n:03d}" for n in range(count)]
+
+
+def _links(locales: list[str]) -> list[Link]:
+    return [
+        Link(rel="alternate", href=TEMPLATE.format(locale=locale), hreflang=locale)
+        for locale in locales
+    ]
+
+
+def _alternates(locales: list[str]) -> Alternates:
+    return Alternates(template=TEMPLATE, locales=locales)
+
+
+def _render_links(links: list[Link]) -> str:
+    return "\n".join([str(Markup(link.compile())) for link in links])
+
+
+def _render_alternates(alternates: Alternates) -> str:
+    return str(Markup(alternates.compile()))
+
+
+def _allocated(build, locales: list[str]) -> int:
+    tracemalloc.start()
+    try:
+        kept = build(locales)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    print(
+        f"{'locales':>8}  {'element':<12}{'memory (KB)':>12}"
+        f"{'build + compile (us)':>22}{'compile (us)':>14}"
+    )
+    for size in SIZES:
+        locales = _locales(size)
+        links = _links(locales)
+        alternates = _alternates(locales)
+        assert _render_links(links) == _render_alternates(alternates)
+
+        number = 20_000 // size
+        rows = (
+            (
+                "Link",
+                _allocated(_links, locales),
+                timeit.timeit(
+                    lambda locales=locales: _render_links(_links(locales)),
+                    number=number,
+                ),
+                timeit.timeit(lambda links=links: _render_links(links), number=number),
+            ),
+            (
+                "Alternates",
+                _allocated(_alternates, locales),
+                timeit.timeit(
+                    lambda locales=locales: _render_alternates(_alternates(locales)),
+                    number=number,
+                ),
+                timeit.timeit(
+                    lambda alternates=alternates: _render_alternates(alternates),
+                    number=number,
+                ),
+            ),
+        )
+        for name, memory, build, compile_ in rows:
+            print(
+                f"{size:>8}  {name:<12}{memory / 1024:>12.1f}"
+                f"{build / number * 1e6:>22.1f}{compile_ / number * 1e6:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
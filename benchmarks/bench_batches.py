@@ -0,0 +1,73 @@
+"""
+Generated heads with many tags: one ``Meta`` / ``Link`` per tag versus a
+single ``MetaBatch`` / ``LinkBatch`` holding the values in columns.
+
+- memory: bytes allocated to hold the elements, measured with tracemalloc.
+- head: building a ``Head`` from the elements and compiling it.
+
+Run with::
+
+    python benchmarks/bench_batches.py
+"""
+
+import timeit
+import tracemalloc
+
+from pyhead import Head
+from pyhead.elements import Link, LinkBatch, Meta, MetaBatch
+
+SIZES = (100, 1_000)
+
+
+def _columns(count: int) -> tuple[list[str], list[str]]:
+    names = [f"custom:field-{n}" for n in range(count)]
+    values = [f"value {n} & more" for n in range(count)]
+    return names, values
+
+
+def _objects(count: int) -> list:
+    names, values = _columns(count)
+    return [
+        *(Meta(name=name, content=value) for name, value in zip(names, values)),
+        *(Link(rel="prefetch", href=f"/p/{value}") for value in values),
+    ]
+
+
+def _batches(count: int) -> list:
+    names, values = _columns(count)
+    return [
+        MetaBatch(name=names, content=values),
+        LinkBatch(rel="prefetch", href=[f"/p/{value}" for value in values]),
+    ]
+
+
+def _allocated(build, count: int) -> int:
+    tracemalloc.start()
+    try:
+        kept = build(count)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    print(f"{'tags':>8}  {'elements':<10}{'memory (KB)':>14}{'head (ms)':>12}")
+    for size in SIZES:
+        assert str(Head(_objects(size))) == str(Head(_batches(size)))
+
+        number = max(1, 20_000 // size)
+        for name, build in (("objects", _objects), ("batches", _batches)):
+            memory = _allocated(build, size)
+            head = timeit.timeit(
+                lambda build=build, size=size: str(Head(build(size))), number=number
+            )
+            print(
+                f"{size * 2:>8}  {name:<10}{memory / 1024:>14.1f}"
+                f"{head / number * 1e3:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
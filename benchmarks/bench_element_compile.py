@@ -0,0 +1,83 @@
+"""
+Per-element compile cost: uncached ``str(element)`` (every call, including
+nested elements, runs ``compile()``) versus the memoized ``str(element)``.
+
+Run with::
+
+    python benchmarks/bench_element_compile.py
+"""
+
+import timeit
+
+from markupsafe import Markup
+
+from pyhead._base import BaseElement
+from pyhead.elements import (
+    Charset,
+    ContentSecurityPolicy,
+    Favicon,
+    Link,
+    Meta,
+    OpenGraphWebsite,
+    Robots,
+    Script,
+    Stylesheet,
+    TwitterCard,
+    Verification,
+    Viewport,
+)
+
+ELEMENTS = {
+    "Charset": Charset(),
+    "Meta": Meta(name="description", content="A page about things"),
+    "Link": Link(rel="icon", href="/static/favicon.ico", sizes="16x16"),
+    "Script": Script("/static/app.js", type_="module", defer=True),
+    "Viewport": Viewport(),
+    "Stylesheet": Stylesheet("/static/main.css"),
+    "Robots": Robots("index, follow"),
+    "ContentSecurityPolicy": ContentSecurityPolicy(),
+    "Verification": Verification(google="123", yandex="456", bing="789"),
+    "OpenGraphWebsite": OpenGraphWebsite(
+        site_name="Example",
+        title="Example",
+        description="Example description",
+        url="https://example.com",
+        image="https://example.com/og.png",
+    ),
+    "TwitterCard": TwitterCard(
+        title="Example", description="Example description", image="/og.png"
+    ),
+    "Favicon": Favicon(
+        ico_icon_href="/favicon.ico",
+        png_icon_16_href="/favicon-16x16.png",
+        png_icon_32_href="/favicon-32x32.png",
+        png_apple_touch_icon_180_href="/apple-touch-icon-180x180.png",
+    ),
+}
+
+NUMBER = 20_000
+
+
+def _uncached(self: BaseElement) -> Markup:
+    return Markup(self.compile())
+
+
+def main() -> None:
+    memoized = BaseElement.__str__
+    print(f"{'element':<24}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, element in ELEMENTS.items():
+        BaseElement.__str__ = _uncached  # type: ignore[method-assign]
+        before = timeit.timeit(lambda element=element: str(element), number=NUMBER)
+        BaseElement.__str__ = memoized  # type: ignore[method-assign]
+        str(element)
+        after = timeit.timeit(lambda element=element: str(element), number=NUMBER)
+        print(
+            f"{name:<24}"
+            f"{before / NUMBER * 1e6:>14.3f}"
+            f"{after / NUMBER * 1e6:>14.3f}"
+            f"{before / after:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
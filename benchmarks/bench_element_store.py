@@ -0,0 +1,98 @@
+"""
+Scaling of ``head.e`` with the number of keyless elements, from 10 to
+10,000 ``Link`` elements.
+
+- insert: adding N/2 keyless links to a head of N links from which every
+  other link was removed, with the previous ``str(len(e))`` probing versus
+  ``ElementStore.fallback_key()``.
+- lookup: finding the canonical link by scanning ``head.e`` versus
+  ``ElementStore.lookup("rel", ...)``.
+- copy + find: ``head.copy().find(rel="canonical")`` on a head that was
+  searched before, as when each request derives a head from a shared one.
+
+Run with::
+
+    python benchmarks/bench_element_store.py
+"""
+
+import time
+import timeit
+
+from pyhead import Head
+from pyhead.elements import Link
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+def _links(count: int) -> list[Link]:
+    return [
+        Link(rel="alternate", href=f"/{n}", hreflang=f"x-{n}") for n in range(count)
+    ]
+
+
+def _thinned(size: int) -> Head:
+    head = Head([*_links(size), Link(rel="canonical", href="/")])
+    for key in list(head.e)[::2]:
+        del head.e[key]
+    return head
+
+
+def _probing_insert(head: Head, links: list[Link]) -> None:
+    for link in links:
+        fallback = str(len(head.e))
+        while fallback in head.e:
+            fallback = str(int(fallback) + 1)
+        head.e[fallback] = link
+
+
+def _indexed_insert(head: Head, links: list[Link]) -> None:
+    for link in links:
+        head.e[head.e.fallback_key()] = link
+
+
+def _timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(
+        f"{'elements':>10}"
+        f"{'insert before (ms)':>20}{'insert after (ms)':>20}"
+        f"{'lookup scan (us)':>18}{'lookup index (us)':>19}"
+        f"{'copy + find (us)':>18}"
+    )
+    for size in SIZES:
+        links = _links(size // 2)
+        before = _timed(_probing_insert, _thinned(size), links)
+        after = _timed(_indexed_insert, _thinned(size), links)
+
+        head = _thinned(size)
+        head.e.lookup("rel", "canonical")
+        number = max(1, 10_000 // size)
+        scan = timeit.timeit(
+            lambda head=head: [
+                key
+                for key, element in head.e.peek_items()
+                if getattr(element, "_rel", None) == "canonical"
+            ],
+            number=number,
+        )
+        index = timeit.timeit(
+            lambda head=head: head.e.lookup("rel", "canonical"), number=number
+        )
+        copy_find = timeit.timeit(
+            lambda head=head: head.copy().find(rel="canonical"), number=number
+        )
+
+        print(
+            f"{size:>10}"
+            f"{before * 1e3:>20.2f}{after * 1e3:>20.2f}"
+            f"{scan / number * 1e6:>18.1f}{index / number * 1e6:>19.2f}"
+            f"{copy_find / number * 1e6:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
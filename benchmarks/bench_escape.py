@@ -0,0 +1,114 @@
+"""
+Escaping attribute values: ``markupsafe.escape`` versus ``escape_attribute``
+over corpora of values typical of a head, and the uncached render of a few
+elements that use it.
+
+- names: meta names and properties, rel values, MIME types.
+- urls: asset and page URLs, some with query strings containing ``&``.
+- content: descriptions and titles, some with apostrophes or quotes.
+- tokens: integrity hashes, nonces and verification codes.
+
+Elements are rendered without their memo, with either function.
+
+Run with::
+
+    python benchmarks/bench_escape.py
+"""
+
+import timeit
+
+from markupsafe import Markup, escape
+
+from pyhead import _base
+from pyhead._base import escape_attribute
+from pyhead.elements import Link, Meta, Script, Title
+
+NUMBER = 200
+
+CORPORA = {
+    "names": [
+        "description",
+        "viewport",
+        "og:title",
+        "og:image",
+        "twitter:card",
+        "theme-color",
+        "stylesheet",
+        "preload",
+        "icon",
+        "image/png",
+        "text/css",
+        "module",
+    ]
+    * 10,
+    "urls": [
+        f"https://cdn.example.com/static/{name}.{ext}?v={version}"
+        + ("&h=abc123" if version % 4 == 0 else "")
+        for name in ("app", "main", "vendor", "favicon", "og")
+        for ext in ("js", "css")
+        for version in range(12)
+    ],
+    "content": [
+        "The Python HTML <head> filler.",
+        "Shop the latest products from independent makers",
+        "Don't miss our summer sale",
+        "width=device-width, initial-scale=1",
+        "index, follow",
+        "A page about things, stuff and more things",
+        'The "best" page on the internet',
+        "en_US",
+    ]
+    * 15,
+    "tokens": [f"sha384-{n:064x}" for n in range(60)]
+    + [f"{n:032x}" for n in range(60)],
+}
+
+ELEMENTS = {
+    "Meta": Meta(name="description", content="A page about things"),
+    "Link": Link(rel="preload", href="/static/font.woff2", type_="font/woff2"),
+    "Script": Script("/static/app.js?v=3&h=abc", type_="module", defer=True),
+    "Title": Title("Don't miss our summer sale"),
+}
+
+
+def _per_value(escape_, values: list) -> float:
+    escape_(values[0])
+
+    def run() -> None:
+        for value in values:
+            escape_(value)
+
+    return timeit.timeit(run, number=NUMBER) / (NUMBER * len(values))
+
+
+def _uncached(element) -> float:
+    return timeit.timeit(lambda: Markup(element.compile()), number=NUMBER * 50) / (
+        NUMBER * 50
+    )
+
+
+def main() -> None:
+    print(
+        f"{'corpus':<10}{'values':>8}{'escape (ns)':>14}{'escape_attribute (ns)':>24}"
+    )
+    for name, values in CORPORA.items():
+        for value in values:
+            assert escape_attribute(value) == escape(value)
+        before = _per_value(escape, values)
+        after = _per_value(escape_attribute, values)
+        print(f"{name:<10}{len(values):>8}{before * 1e9:>14.0f}{after * 1e9:>24.0f}")
+
+    print()
+    print(
+        f"{'element':<10}{'render with escape (us)':>26}{'escape_attribute (us)':>24}"
+    )
+    for name, element in ELEMENTS.items():
+        _base.escape_attribute = escape  # type: ignore[assignment]
+        before = _uncached(element)
+        _base.escape_attribute = escape_attribute
+        after = _uncached(element)
+        print(f"{name:<10}{before * 1e6:>26.2f}{after * 1e6:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Resolving the ``FlaskUrlFor`` values of a head: one ``url_for`` call per
+value versus the batched ``FlaskUrlFor.compile_many``.
+
+Run with::
+
+    python benchmarks/bench_flask_url_for.py
+"""
+
+import timeit
+
+from flask import Flask
+
+from pyhead import Head
+from pyhead import elements as e
+from pyhead.flask import FlaskUrlFor
+
+ICONS = [
+    "ico_icon_href",
+    "png_icon_16_href",
+    "png_icon_32_href",
+    "png_icon_64_href",
+    "png_icon_96_href",
+    "png_icon_180_href",
+    "png_icon_196_href",
+    "png_apple_touch_icon_57_href",
+    "png_apple_touch_icon_60_href",
+    "png_apple_touch_icon_72_href",
+    "png_apple_touch_icon_76_href",
+    "png_apple_touch_icon_114_href",
+    "png_apple_touch_icon_120_href",
+    "png_apple_touch_icon_144_href",
+    "png_apple_touch_icon_152_href",
+    "png_apple_touch_icon_167_href",
+    "png_apple_touch_icon_180_href",
+    "png_mstile_70_href",
+    "png_mstile_270_href",
+    "png_mstile_310x150_href",
+    "png_mstile_310_href",
+]
+
+NUMBER = 1_000
+REPEAT = 5
+
+
+def build_head() -> Head:
+    return Head(
+        [
+            e.Page(title="Benchmark"),
+            e.SocialMediaCard(
+                title="Benchmark",
+                image=FlaskUrlFor("static", filename="og.png"),
+            ),
+            e.Favicon(
+                **{
+                    name: FlaskUrlFor("static", filename=f"favicons/{name}.png")
+                    for name in ICONS
+                }
+            ),
+            e.Stylesheet(FlaskUrlFor("static", filename="main.css")),
+            e.Script(FlaskUrlFor("static", filename="main.js")),
+        ]
+    )
+
+
+def _per_call(cls: type, values: list[FlaskUrlFor]) -> list[str]:
+    return [value.compile() for value in values]
+
+
+def _best(func: object) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6  # type: ignore[arg-type]
+
+
+def main() -> None:
+    app = Flask(__name__)
+    head = build_head()
+    batched = FlaskUrlFor.__dict__["compile_many"]
+
+    with app.test_request_context():
+        values = list(Head._delayed_values(head._plan(True, True)).values())
+
+        resolve_before = _best(lambda: [value.compile() for value in values])
+        resolve_after = _best(lambda: FlaskUrlFor.compile_many(values))
+
+        FlaskUrlFor.compile_many = classmethod(_per_call)  # type: ignore[assignment]
+        head_before = _best(head.compile)
+        FlaskUrlFor.compile_many = batched  # type: ignore[assignment]
+        head_after = _best(head.compile)
+
+    print(f"FlaskUrlFor values per head: {len(values)}")
+    print(f"{'':<22}{'per-call (us)':>15}{'batched (us)':>15}{'speedup':>10}")
+    for label, before, after in (
+        ("resolve all values", resolve_before, resolve_after),
+        ("head.compile()", head_before, head_after),
+    ):
+        print(f"{label:<22}{before:>15.1f}{after:>15.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
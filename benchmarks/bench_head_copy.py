@@ -0,0 +1,107 @@
+"""
+The per-request ``head.copy().extend([Page(...)])`` pattern: the previous
+deepcopy-based copy versus the copy-on-write copy and a layer
+(``head.layer([Page(...)])``), each followed by a compile.
+
+The second table grows the shared head from 10 to 1,000 alternate links:
+a layer only plans its own elements on top of the shared head's plan, so
+what it costs beyond the size of the output should not grow with it.
+
+Run with::
+
+    python benchmarks/bench_head_copy.py
+"""
+
+import timeit
+from copy import deepcopy
+
+from pyhead import Head
+from pyhead import elements as e
+
+ELEMENTS = [
+    e.Page(
+        title="Hello World",
+        description="This is a test",
+        keywords="test, hello, world",
+        subject="Hello World",
+        rating="General",
+    ),
+    e.Base("https://example.com"),
+    e.Robots("index, follow"),
+    e.ContentSecurityPolicy(),
+    e.ReferrerPolicy("no-referrer"),
+    e.Google(googlebot="index, follow", no_sitelinks_search_box=True),
+    e.Verification(google="123", yandex="456", bing="789"),
+    e.GeoPosition(icbm="1, 1", geo_position="1;1", geo_region="en-GB"),
+    e.SocialMediaCard(
+        title="Hello World",
+        site_name="Example",
+        description="This is a test",
+        image="https://example.com/og.png",
+        url="https://example.com",
+    ),
+    e.Favicon(
+        ico_icon_href="/favicon.ico",
+        png_icon_16_href="/favicon-16x16.png",
+        png_icon_32_href="/favicon-32x32.png",
+        png_apple_touch_icon_180_href="/apple-touch-icon-180x180.png",
+    ),
+    e.Stylesheet("/static/main.css"),
+    e.Script("/static/app.js", defer=True),
+]
+
+HEAD = Head(ELEMENTS)
+
+NUMBER = 5_000
+SIZES = (10, 100, 1_000)
+
+
+def _deepcopy_request() -> str:
+    return str(Head(deepcopy(ELEMENTS)).extend([e.Page(title="Page")]))
+
+
+def _cow_request() -> str:
+    return str(HEAD.copy().extend([e.Page(title="Page")]))
+
+
+def _layer_request() -> str:
+    return str(HEAD.layer([e.Page(title="Page")]))
+
+
+def main() -> None:
+    assert _deepcopy_request() == _cow_request() == _layer_request()
+    str(HEAD)
+
+    before = timeit.timeit(_deepcopy_request, number=NUMBER)
+    print(f"{'copy + extend + compile':<28}{'us':>10}{'speedup':>10}")
+    print(f"{'deepcopy':<28}{before / NUMBER * 1e6:>10.1f}")
+    for name, request in (("copy-on-write", _cow_request), ("layer", _layer_request)):
+        after = timeit.timeit(request, number=NUMBER)
+        print(f"{name:<28}{after / NUMBER * 1e6:>10.1f}{before / after:>9.1f}x")
+
+    print()
+    print(f"{'alternates':>10}{'copy-on-write (us)':>20}{'layer (us)':>12}")
+    for size in SIZES:
+        head = Head(
+            [
+                *ELEMENTS,
+                *[
+                    e.Link(rel="alternate", href=f"/{n}", hreflang=f"x-{n}")
+                    for n in range(size)
+                ],
+            ]
+        )
+        str(head.layer([]))
+        number = max(100, NUMBER * 10 // size)
+        cow = timeit.timeit(
+            lambda head=head: str(head.copy().extend([e.Page(title="Page")])),
+            number=number,
+        )
+        layer = timeit.timeit(
+            lambda head=head: str(head.layer([e.Page(title="Page")])), number=number
+        )
+        print(f"{size:>10}{cow / number * 1e6:>20.1f}{layer / number * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+A registry of per-tenant heads that differ only in a few values, built and
+rendered with and without interning (``Head.intern_elements``).
+
+- memory: bytes held by the registry after every head has been rendered.
+- build + render: building every head and rendering it once.
+
+Run with::
+
+    python benchmarks/bench_intern.py
+"""
+
+import time
+import tracemalloc
+
+from pyhead import Head
+from pyhead import elements as e
+from pyhead._intern import _interned
+
+TENANTS = 1_000
+
+
+class InternedHead(Head):
+    intern_elements = True
+
+
+def _elements(tenant: int) -> list:
+    return [
+        e.Page(title=f"Tenant {tenant}", description="Shop the latest products"),
+        e.Robots("index, follow"),
+        e.ThemeColor("#ffffff"),
+        e.SocialMediaCard(
+            title=f"Tenant {tenant}",
+            site_name="Shops",
+            description="Shop the latest products",
+            image="https://cdn.example.com/og.png",
+        ),
+        e.Favicon(
+            ico_icon_href="/favicon.ico",
+            png_icon_16_href="/favicon-16x16.png",
+            png_icon_32_href="/favicon-32x32.png",
+            png_apple_touch_icon_180_href="/apple-touch-icon-180x180.png",
+        ),
+        e.Stylesheet("https://cdn.example.com/main.css"),
+        e.Script("https://cdn.example.com/app.js", defer=True),
+    ]
+
+
+def _registry(head_class: type[Head]) -> list[Head]:
+    heads = [head_class(_elements(tenant)) for tenant in range(TENANTS)]
+    for head in heads:
+        str(head)
+    return heads
+
+
+def main() -> None:
+    print(f"{'':<12}{'memory (KB)':>14}{'build + render (ms)':>22}")
+    for name, head_class in (("plain", Head), ("interned", InternedHead)):
+        _interned.clear()
+
+        start = time.perf_counter()
+        _registry(head_class)
+        elapsed = time.perf_counter() - start
+
+        _interned.clear()
+        tracemalloc.start()
+        try:
+            heads = _registry(head_class)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del heads
+
+        print(f"{name:<12}{size / 1024:>14.0f}{elapsed * 1e3:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Memory held by elements and heads, measured with tracemalloc: the bytes per
+instance of common elements (including nested elements, excluding strings
+shared between instances) and per full ``Head``.
+
+Run with::
+
+    python benchmarks/bench_memory.py
+"""
+
+import tracemalloc
+
+from pyhead import Head
+from pyhead import elements as e
+
+COUNT = 1_000
+
+ELEMENTS = {
+    "Meta": lambda: e.Meta(name="description", content="A page about things"),
+    "Link": lambda: e.Link(rel="canonical", href="https://example.com/"),
+    "Script": lambda: e.Script("/static/app.js", defer=True),
+    "Title": lambda: e.Title("Hello World"),
+    "Viewport": lambda: e.Viewport(),
+    "OpenGraphWebsite": lambda: e.OpenGraphWebsite(
+        site_name="Example",
+        title="Example",
+        description="Example description",
+        url="https://example.com",
+        image="https://example.com/og.png",
+    ),
+    "TwitterCard": lambda: e.TwitterCard(
+        title="Example", description="Example description", image="/og.png"
+    ),
+    "Verification": lambda: e.Verification(google="123", yandex="456", bing="789"),
+    "Favicon": lambda: e.Favicon(
+        ico_icon_href="/favicon.ico",
+        png_icon_16_href="/favicon-16x16.png",
+        png_icon_32_href="/favicon-32x32.png",
+        png_apple_touch_icon_180_href="/apple-touch-icon-180x180.png",
+    ),
+}
+
+
+def _head() -> Head:
+    return Head(
+        [
+            e.Page(
+                title="Hello World",
+                description="This is a test",
+                keywords="test, hello, world",
+            ),
+            e.Base("https://example.com"),
+            e.Robots("index, follow"),
+            e.SocialMediaCard(
+                title="Hello World",
+                site_name="Example",
+                description="This is a test",
+                image="https://example.com/og.png",
+                url="https://example.com",
+            ),
+            *(ELEMENTS[name]() for name in ("Verification", "Favicon")),
+            e.Stylesheet("/static/main.css"),
+            e.Script("/static/app.js", defer=True),
+        ]
+    )
+
+
+def _bytes_each(build) -> float:
+    build()
+    tracemalloc.start()
+    try:
+        kept = [build() for _ in range(COUNT)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size / COUNT
+
+
+def main() -> None:
+    print(f"{'':<20}{'bytes':>10}")
+    for name, build in ELEMENTS.items():
+        print(f"{name:<20}{_bytes_each(build):>10.0f}")
+    print(f"{'Head':<20}{_bytes_each(_head):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
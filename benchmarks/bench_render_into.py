@@ -0,0 +1,100 @@
+"""
+Rendering a page around a head: joining ``head.compile()`` into the page
+versus ``head.render_into()`` appending to the page's own buffer.
+
+- peak (bytes): memory allocated at the peak of one render, above what was
+  allocated before it, measured with tracemalloc.
+- time: one render of the page.
+
+The static head is fully memoized; the dynamic head holds delayed values
+that are resolved on every render.
+
+Run with::
+
+    python benchmarks/bench_render_into.py
+"""
+
+import timeit
+import tracemalloc
+
+from pyhead import Head
+from pyhead import elements as e
+
+NUMBER = 2_000
+
+
+class _Url:
+    """A delayed value that can't be cached, resolved on every render."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def compile(self) -> str:
+        return "https://cdn.example.com" + self.path
+
+
+def _head(url) -> Head:
+    return Head(
+        [
+            e.Page(
+                title="Hello World",
+                description="This is a test",
+                keywords="test, hello, world",
+            ),
+            e.SocialMediaCard(
+                title="Hello World",
+                site_name="Example",
+                description="This is a test",
+                image=url("/og.png"),
+                url=url("/"),
+            ),
+            e.Favicon(
+                ico_icon_href=url("/favicon.ico"),
+                png_icon_16_href=url("/favicon-16x16.png"),
+                png_icon_32_href=url("/favicon-32x32.png"),
+            ),
+            e.Stylesheet(url("/main.css")),
+            e.Script(url("/app.js"), defer=True),
+        ]
+    )
+
+
+def _compile(head: Head) -> str:
+    return f"<!DOCTYPE html>\n<html>\n{head.compile()}\n<body></body>"
+
+
+def _render_into(head: Head) -> str:
+    buffer = ["<!DOCTYPE html>\n<html>\n"]
+    head.render_into(buffer)
+    buffer.append("\n<body></body>")
+    return "".join(buffer)
+
+
+def _peak(render, head: Head) -> int:
+    render(head)
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        render(head)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def main() -> None:
+    heads = {"static": _head(lambda path: path), "dynamic": _head(_Url)}
+    print(f"{'head':<10}{'render':<14}{'peak (bytes)':>14}{'time (us)':>12}")
+    for name, head in heads.items():
+        assert _compile(head) == _render_into(head)
+        for label, render in (("compile", _compile), ("render_into", _render_into)):
+            peak = _peak(render, head)
+            elapsed = timeit.timeit(
+                lambda render=render, head=head: render(head), number=NUMBER
+            )
+            print(f"{name:<10}{label:<14}{peak:>14}{elapsed / NUMBER * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
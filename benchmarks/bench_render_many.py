@@ -0,0 +1,96 @@
+"""
+Rendering a head for every record of a catalogue: building a ``Head`` per
+record versus ``render_many()`` over a ``HeadTemplate``, in this process and
+fanned out to a ``ProcessPoolExecutor`` with one worker per CPU.
+
+- records/s: heads rendered per second, consuming them as they come.
+- peak (KB): memory allocated at the peak of the run, measured with
+  tracemalloc (in this process only); it stays flat as records grow.
+
+Run with::
+
+    python benchmarks/bench_render_many.py
+"""
+
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from pyhead import Head, HeadTemplate, Slot, render_many
+from pyhead import elements as e
+
+SIZES = (5_000, 25_000)
+
+
+def _records(count: int):
+    for n in range(count):
+        yield {
+            "title": f"Product {n} & more",
+            "description": f"Everything about product {n}",
+            "url": f"https://example.com/products/{n}",
+            "image": f"https://cdn.example.com/products/{n}.png",
+        }
+
+
+def _elements(title, description, url, image) -> list:
+    return [
+        e.Page(title=title, description=description),
+        e.SocialMediaCard(
+            title=title, site_name="Shop", description=description, url=url, image=image
+        ),
+        e.Link(rel="canonical", href=url),
+    ]
+
+
+TEMPLATE = HeadTemplate(
+    _elements(Slot("title"), Slot("description"), Slot("url"), Slot("image"))
+)
+
+
+def _heads(count: int):
+    for record in _records(count):
+        yield Head(_elements(**record)).compile()
+
+
+def _render_many(count: int):
+    return render_many(_records(count), TEMPLATE)
+
+
+def _render_many_processes(count: int):
+    with ProcessPoolExecutor() as executor:
+        yield from render_many(_records(count), TEMPLATE, executor=executor)
+
+
+def _consume(heads) -> int:
+    rendered = 0
+    for _ in heads:
+        rendered += 1
+    return rendered
+
+
+def main() -> None:
+    print(f"{os.cpu_count()} CPU(s)")
+    print(f"{'records':>8}  {'render':<24}{'records/s':>12}{'peak (KB)':>12}")
+    for size in SIZES:
+        for name, render in (
+            ("Head per record", _heads),
+            ("render_many", _render_many),
+            ("render_many (processes)", _render_many_processes),
+        ):
+            start = time.perf_counter()
+            assert _consume(render(size)) == size
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            try:
+                _consume(render(size))
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            print(f"{size:>8}  {name:<24}{size / elapsed:>12.0f}{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Rendering heads that differ only in title, description, canonical URL and
+image, per request:
+
+- head: building the elements and a ``Head`` and compiling it.
+- copy_extend: extending a shared base head with the per-page elements.
+- template: ``HeadTemplate.render()`` with the per-page values.
+
+Run with::
+
+    python benchmarks/bench_template.py
+"""
+
+import timeit
+
+from pyhead import Head, HeadTemplate, Slot
+from pyhead import elements as e
+
+NUMBER = 5_000
+
+PAGES = [
+    {
+        "title": f"Product {n} & more",
+        "description": f"Everything about product {n}",
+        "url": f"https://example.com/products/{n}?ref=home&lang=en",
+        "image": f"https://cdn.example.com/products/{n}.png",
+    }
+    for n in range(100)
+]
+
+COMMON = [
+    e.Robots("index, follow"),
+    e.ThemeColor("#ffffff"),
+    e.Favicon(
+        ico_icon_href="/favicon.ico",
+        png_icon_16_href="/favicon-16x16.png",
+        png_icon_32_href="/favicon-32x32.png",
+    ),
+    e.Stylesheet("https://cdn.example.com/main.css"),
+    e.Script("https://cdn.example.com/app.js", defer=True),
+]
+
+
+def _page(title, description, url, image) -> list:
+    return [
+        e.Page(title=title, description=description),
+        e.Link(rel="canonical", href=url),
+        e.SocialMediaCard(
+            title=title,
+            site_name="Shop",
+            description=description,
+            url=url,
+            image=image,
+        ),
+    ]
+
+
+def main() -> None:
+    base = Head(COMMON)
+    template = HeadTemplate(
+        COMMON + _page(Slot("title"), Slot("description"), Slot("url"), Slot("image"))
+    )
+
+    renders = {
+        "head": lambda page: Head(COMMON + _page(**page)).compile(),
+        "copy_extend": lambda page: base.copy_extend(_page(**page)).compile(),
+        "template": lambda page: template.render(**page),
+    }
+
+    expected = [renders["head"](page) for page in PAGES]
+    print(f"{'render':<14}{'per page (us)':>16}")
+    for name, render in renders.items():
+        assert [render(page) for page in PAGES] == expected
+
+        def run(render=render) -> None:
+            for page in PAGES:
+                render(page)
+
+        elapsed = timeit.timeit(run, number=NUMBER // len(PAGES))
+        print(f"{name:<14}{elapsed / NUMBER * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,46 @@
+import asyncio
+import contextvars
+import os
+import re
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from copy import deepcopy
+from functools import partial
 from glob import escape
-from typing import Optional, TypeAlias
+from itertools import islice
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    Optional,
+    TextIO,
+    TypeAlias,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from markupsafe import Markup
 
 from .__version__ import __version__
+from ._base import (
+    BaseElement,
+    Memo,
+    Tag,
+    _resolved,
+    _revision_lock,
+    escape_attribute,
+    resolve,
+    revision,
+)
+from ._cache import CacheInfo, LRUCache, cache_key_for, register_dependency
+from ._intern import intern
+from ._store import INDEXED_FIELDS, ElementStore
 from .elements import (
+    Alternates,
     ApplicationName,
     Base,
     Charset,
@@ -17,7 +52,9 @@ from .elements import (
     Google,
     Keywords,
     Link,
+    LinkBatch,
     Meta,
+    MetaBatch,
     OpenGraphWebsite,
     Page,
     Rating,
@@ -33,9 +70,14 @@ from .elements import (
     Verification,
     Viewport,
 )
+from .protocols import AsyncCompileDelayed, CompileMany
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
 
 HeadElement: TypeAlias = (
-    ApplicationName
+    Alternates
+    | ApplicationName
     | Base
     | Charset
     | ContentSecurityPolicy
@@ -46,7 +88,9 @@ HeadElement: TypeAlias = (
     | Google
     | Keywords
     | Link
+    | LinkBatch
     | Meta
+    | MetaBatch
     | OpenGraphWebsite
     | Page
     | Rating
@@ -63,14 +107,79 @@ HeadElement: TypeAlias = (
     | Viewport
 )
 
+_S = TypeVar("_S")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="pyhead")
+        return _executor
+
+
+class _Plan(NamedTuple):
+    """
+    A compiled plan (see Head._plan) and what it was compiled from.
+
+    ``runs`` maps slices of ``items`` to their output: ``(start, stop,
+    part)`` where part is the joined output of a run of static elements
+    (None if they render nothing) or a single element to compile on every
+    render. Plans for similar items are built from these runs.
+
+    ``memos`` holds the elements the plan was compiled from, and those
+    nested in them, with the memo each had. The plan is current at
+    ``revision``; after elements anywhere have changed, it is current as
+    long as its own elements still have those memos.
+
+    A layer's plan is spliced from the parts of its parent's plan (``base``)
+    instead; it has no runs, and its memos only hold the layer's own
+    elements. ``layout`` is filled in when a layer is planned on top of
+    this plan (see LayeredHead._layout).
+    """
+
+    revision: int
+    items: tuple[tuple[str, Any], ...]
+    parts: list[Any]
+    keyable: bool
+    runs: Optional[list[tuple[int, int, Any]]]
+    memos: tuple[tuple[BaseElement, Memo], ...]
+    layout: dict[str, tuple[int, int, int]]
+    base: Optional[list[Any]] = None
+
+    def is_current(self, current: int) -> bool:
+        if self.revision == current:
+            return True
+        for element, memo in self.memos:
+            if element._memo is not memo:
+                return False
+        return True
+
+
+class HeadCacheInfo(NamedTuple):
+    values: CacheInfo
+    outputs: CacheInfo
+
 
 class Head:
-    e: dict  # Element ID: Element Class
+    e: ElementStore  # Element ID: Element Class
 
     render_head_tag: bool = True
     render_title_tag: Optional[str] = None
 
-    _elements: list[HeadElement]
+    executor: Optional[Executor] = None
+
+    value_cache_size: int = 256
+    output_cache_size: int = 64
+
+    intern_elements: bool = False
+
+    _plans: dict[tuple[bool, bool], "_Plan"]
+    _values: LRUCache
+    _outputs: LRUCache
 
     def __init__(self, elements_: list[HeadElement]) -> None:
         """
@@ -90,9 +199,11 @@ class Head:
             A list of head elements. See ``HeadElement`` for the accepted types.
         :type elements_: list[HeadElement]
         """
-        self.e = {}
+        self.e = ElementStore()
 
-        self._elements = elements_
+        self._plans = {}
+        self._values = LRUCache(self.value_cache_size)
+        self._outputs = LRUCache(self.output_cache_size)
         self._loop_elements(elements_)
 
     def _loop_elements(self, elements_: list[HeadElement]) -> None:
@@ -103,49 +214,59 @@ class Head:
         :return: None
         :rtype: None
         """
+        e = self.e
+        put = self._put_interned if self.intern_elements else e.__setitem__
+
         for element in elements_:
             if isinstance(element, Page):
-                if self.e.get("title"):
-                    del self.e["title"]
+                if "title" in e:
+                    del e["title"]
 
-                if self.e.get("description"):
-                    del self.e["description"]
+                if "description" in e:
+                    del e["description"]
 
-                if self.e.get("keywords"):
-                    del self.e["keywords"]
+                if "keywords" in e:
+                    del e["keywords"]
 
-                if self.e.get("subject"):
-                    del self.e["subject"]
+                if "subject" in e:
+                    del e["subject"]
 
-                if self.e.get("rating"):
-                    del self.e["rating"]
+                if "rating" in e:
+                    del e["rating"]
 
                 for key, value in element.e.items():
-                    self.e[key] = value
+                    put(key, value)
                 continue
 
             if isinstance(element, SocialMediaCard):
-                if self.e.get("twitter_card"):
-                    del self.e["twitter_card"]
+                if "twitter_card" in e:
+                    del e["twitter_card"]
 
-                if self.e.get("open_graph_website"):
-                    del self.e["open_graph_website"]
+                if "open_graph_website" in e:
+                    del e["open_graph_website"]
 
                 for key, value in element.e.items():
-                    self.e[key] = value
+                    put(key, value)
                 continue
 
             key = getattr(element, "key", None)
             if key:
-                self.e[str(key)] = element
+                put(str(key), element)
             else:
-                fallback = str(len(self.e))
-                while fallback in self.e:
-                    fallback = str(int(fallback) + 1)
-                self.e[fallback] = element
+                put(e.fallback_key(), element)
 
-        if self.e.get("title"):
-            self.render_title_tag = self.e["title"].title_
+        if "title" in e:
+            self.render_title_tag = e.peek("title").title_
+
+    def _put_interned(self, key: str, element: Any) -> None:
+        """
+        A private method that stores the canonical instance of an element
+        (see ``intern``), to be copied before it is changed through head.e.
+
+        :return: None
+        :rtype: None
+        """
+        self.e.set_shared(key, intern(element))
 
     def extend(self, elements_: list[HeadElement]) -> "Head":
         """
@@ -162,27 +283,97 @@ class Head:
             head.extend([Description("This is my website.")])
 
 
-        See head.copy if you want to create a deep copy to then extend.
+        See head.copy if you want to create a copy to then extend.
 
         :param elements_:
         :return: The extended Head object.
         :rtype: Head
         """
-        self._elements = [*self._elements, *elements_]
         self._loop_elements(elements_)
         return self
 
     def copy(self) -> "Head":
         """
-        Creates and returns a deep copy of the current Head.
+        Creates and returns a copy of the current Head.
+
+        The copy is copy-on-write: it shares element instances with the
+        original, and an element is only duplicated when it is read through
+        head.e on either head (see ``ElementStore``). Changes made through
+        head.e on the copy do not affect the original and vice versa, while
+        a copy that is only extended and rendered costs a dict copy. The
+        original's compiled plans are reused until the copy changes.
+
+        Elements that can still be changed through a reference kept outside
+        head.e, such as the element passed to ``Head()``, are copied once
+        and the copy is shared instead, so changing them later only shows
+        up in the original:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            title = Title("Original")
+            head = Head([title])
+            copy = head.copy()
 
-        Element instances are duplicated so that mutations on the copy do not
-        affect the original.
+            title.title_ = "Changed"  # only head renders "Changed"
 
         :return: A new Head whose elements are independent of the original's.
         :rtype: Head
         """
-        return Head(deepcopy(self._elements))
+        head = Head.__new__(Head)
+        head.e = self.e.share(detach=True)
+
+        # The copy's elements are equal to the original's, so the plans
+        # compiled for those hold for the copy once they list its own.
+        items = tuple(self.e.peek_items())
+        copied = tuple(head.e.peek_items())
+        current = revision()
+        head._plans = {}
+        for flags, plan in self._plans.items():
+            if (
+                plan.runs is not None
+                and plan.items == items
+                and plan.is_current(current)
+            ):
+                plan = plan._replace(items=copied)
+            head._plans[flags] = plan
+
+        head._values, head._outputs = self._values, self._outputs
+        if "render_title_tag" in vars(self):
+            head.render_title_tag = self.render_title_tag
+        if self.intern_elements:
+            head.intern_elements = True
+        return head
+
+    def layer(self, elements_: list[HeadElement]) -> "LayeredHead":
+        """
+        Creates a head that renders this head with more elements on top.
+
+        Layers are meant for heads built in stages, for example a site-wide
+        head, a head per section and one per page:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from pyhead import Head
+            from pyhead.elements import Page, Stylesheet
+
+            site = Head([Page(title="My Website"), Stylesheet("/main.css")])
+            blog = site.layer([Stylesheet("/blog.css")])
+            post = blog.layer([Page(title="A post")])
+
+        The elements of a layer override and extend the ones below it the
+        same way extend() would, but this head is left untouched and keeps
+        being shared: changes made to it later show up in every layer the
+        next time the layer is used. Elements that were already rendered by
+        a lower layer are reused as they are, so rendering a layer only
+        compiles its own elements.
+
+        :param elements_:
+        :return: A LayeredHead on top of this head.
+        :rtype: LayeredHead
+        """
+        return LayeredHead(self, elements_)
 
     def copy_extend(self, elements_: list[HeadElement]) -> "Head":
         """
@@ -198,21 +389,22 @@ class Head:
 
             head = head.copy_extend([Description("This is my website.")])
 
+        This head is left unchanged, so deriving heads from a shared head
+        on every request costs the same however many requests came before.
+
         :param elements_:
         :return: The copied and extended Head object.
         :rtype: Head
         """
-        self._elements = [*self._elements, *elements_]
-        return Head(deepcopy(self._elements))
+        head = self.copy()
+        head._loop_elements(deepcopy(elements_))
+        return head
 
     def cp(self) -> "Head":
         """
         Shortcut for copy.
 
-        Creates and returns a deep copy of the current Head.
-
-        Element instances are duplicated so that mutations on the copy do not
-        affect the original.
+        Creates and returns a copy-on-write copy of the current Head.
 
         :return: A new Head whose elements are independent of the original's.
         :rtype: Head
@@ -241,8 +433,234 @@ class Head:
         """
         return self.copy_extend(elements_)
 
+    def find_all(
+        self,
+        type_: Optional[type] = None,
+        *,
+        rel: Any = None,
+        name: Any = None,
+        property_: Any = None,
+        id_: Any = None,
+    ) -> list[Any]:
+        """
+        Returns the elements that match every given filter, including the
+        ones nested in other elements (the ``og:image`` ``Meta`` of an
+        ``OpenGraphWebsite``, for example).
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from pyhead import Head
+            from pyhead.elements import Link, Meta
+
+            head = Head([...])
+
+            alternates = head.find_all(Link, rel="alternate")
+            og_image = head.find(Meta, property_="og:image")
+
+        Elements are found through the indexes of head.e (see
+        ``ElementStore.lookup``), so the cost depends on the number of
+        matches rather than on the size of the head.
+
+        :param type_: The exact type of the elements.
+        :param rel: The rel of the elements.
+        :param name: The name of the elements.
+        :param property_: The property of the elements.
+        :param id_: The id of the elements.
+        :return: The matching elements, in the order they were added.
+        :rtype: list
+        """
+        query = {
+            field: value
+            for field, value in (
+                ("type", type_),
+                ("rel", rel),
+                ("name", name),
+                ("property", property_),
+                ("id", id_),
+            )
+            if value is not None
+        }
+        if not query:
+            raise TypeError("find_all() needs at least one filter.")
+
+        keys: Optional[list[str]] = None
+        for field, value in query.items():
+            found = self.e.lookup(field, value)
+            if keys is None:
+                keys = found
+            else:
+                found_keys = set(found)
+                keys = [key for key in keys if key in found_keys]
+        assert keys is not None
+
+        matches = []
+        for key in keys:
+            paths = [
+                path
+                for path, element in self._nested(self.e.peek(key))
+                if all(INDEXED_FIELDS[f](element) == v for f, v in query.items())
+            ]
+            if not paths:
+                continue
+
+            # Read through head.e, so that a shared element is copied before
+            # it is handed out to be changed.
+            element = self.e[key]
+            for path in paths:
+                nested = element
+                for attribute in path:
+                    nested = getattr(nested, attribute)
+                matches.append(nested)
+
+        return matches
+
+    def find(
+        self,
+        type_: Optional[type] = None,
+        *,
+        rel: Any = None,
+        name: Any = None,
+        property_: Any = None,
+        id_: Any = None,
+    ) -> Optional[Any]:
+        """
+        Returns the first element that matches every given filter, or None.
+
+        See find_all for the filters.
+
+        :return: The first matching element, or None.
+        """
+        matches = self.find_all(type_, rel=rel, name=name, property_=property_, id_=id_)
+        return matches[0] if matches else None
+
+    def replace(self, old: Any, new: Any) -> "Head":
+        """
+        Replaces an element of the head, usually one returned by find, with
+        another element.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from pyhead.elements import Link
+
+            canonical = head.find(rel="canonical")
+            head.replace(canonical, Link(rel="canonical", href=url))
+
+        The new element takes the place of the old one. If it has a key of
+        its own, or replaces the title without being one, it is stored under
+        its own key, still in the old one's position. An element nested in another one is replaced in a copy of
+        its parent, leaving the parent unchanged for any head that shares
+        it. Only the replaced element is compiled on the next render.
+
+        :param old: The element to replace.
+        :param new: The element to put in its place.
+        :raises ValueError: If old is not in the head, or if another element
+            of the head is stored under the key of new.
+        :return: The Head object.
+        :rtype: Head
+        """
+        key, path = self._locate(old)
+        if path:
+            self.e[key] = self._rebuild(self.e[key], path, new)
+            return self
+
+        new_key = getattr(new, "key", None)
+        if new_key:
+            new_key = str(new_key)
+        elif key == "title" and not isinstance(new, Title):
+            # Whatever is stored under "title" is left out with
+            # render_title_tag=False.
+            new_key = self.e.fallback_key()
+        else:
+            new_key = key
+
+        if new_key == key:
+            self.e[key] = new
+        elif new_key in self.e:
+            raise ValueError(
+                f"{new!r} can't replace {old!r}: another element of this "
+                f"head has the key {new_key!r}."
+            )
+        else:
+            self.e.rename(key, new_key, new)
+
+        if "title" in (key, new_key):
+            self._update_title()
+        return self
+
+    def remove(self, old: Any) -> "Head":
+        """
+        Removes an element from the head, usually one returned by find.
+
+        An element nested in another one is removed from a copy of its
+        parent, leaving the parent unchanged for any head that shares it.
+        Removing the title sets render_title_tag back to its default.
+
+        :param old: The element to remove.
+        :raises ValueError: If old is not in the head.
+        :return: The Head object.
+        :rtype: Head
+        """
+        key, path = self._locate(old)
+        if path:
+            self.e[key] = self._rebuild(self.e[key], path, None)
+        else:
+            del self.e[key]
+            if key == "title":
+                self._update_title()
+        return self
+
+    def _update_title(self) -> None:
+        """
+        A private method that sets render_title_tag to the title of the
+        head, or back to its default if the head has no title.
+
+        :return: None
+        :rtype: None
+        """
+        title = self.e.peek("title")
+        if title is None:
+            vars(self).pop("render_title_tag", None)
+        else:
+            self.render_title_tag = getattr(title, "title_", None)
+
+    def _locate(self, old: Any) -> tuple[str, tuple[str, ...]]:
+        """
+        A private method that returns the key of the element holding old,
+        and the attribute names leading from it to old.
+
+        :raises ValueError: If old is not in the head.
+        """
+        for key in self.e.lookup("type", type(old)):
+            for path, element in self._nested(self.e.peek(key)):
+                if element is old:
+                    return key, path
+        raise ValueError(f"{old!r} is not in this head.")
+
+    @staticmethod
+    def _nested(element: Any) -> Iterator[tuple[tuple[str, ...], Any]]:
+        if isinstance(element, BaseElement):
+            return element._walk()
+        return iter([((), element)])
+
+    @staticmethod
+    def _rebuild(element: BaseElement, path: tuple[str, ...], new: Any) -> Any:
+        """
+        A private method that returns a copy of element with the element at
+        the end of path replaced by new.
+        """
+        name, *rest = path
+        if rest:
+            new = Head._rebuild(getattr(element, name), tuple(rest), new)
+        return element._with(name, new)
+
     def compile(
-        self, render_head_tag: bool = True, render_title_tag: bool = True
+        self,
+        render_head_tag: bool = True,
+        render_title_tag: bool = True,
+        *,
+        threaded: bool = False,
     ) -> Markup:
         """
         Used to compile the elements in head.e dict.
@@ -266,26 +684,711 @@ class Head:
                 {{ head.compile(render_head_tag = False, render_title_tag = False) }}
             </head>
 
+        ``CompileDelayed`` values whose class provides ``compile_many`` (such
+        as ``FlaskUrlFor``) are gathered from the whole head and resolved with
+        one call per class.
+
+        ``CompileDelayed`` values that set ``blocking = True`` (for example
+        ones that query a database) are resolved one after another by
+        default. With threaded=True they are collected from every element
+        first and resolved concurrently on ``Head.executor`` (a shared
+        ``ThreadPoolExecutor`` unless one is assigned), each in a copy of
+        the caller's context so Flask and Django request state is still
+        visible. The output is assembled in the original order.
+
+        Values that declare what they depend on (see ``CompileDelayed``
+        ``cache_key()`` and ``varies_on()``) are cached per head and shared
+        with its copies and layers. When every value in the head is
+        cacheable, the whole output is cached as well, keyed on the plan and
+        the values' keys. See cache_info().
+
+        :param render_head_tag: If False, the head tag will not be rendered.
+        :param render_title_tag: If False, the title tag will not be rendered.
+        :param threaded: If True, resolve blocking values in a thread pool.
+        :return:
+        """
+        plan = self._plan(render_head_tag, render_title_tag)
+
+        values = self._delayed_values(plan)
+        if not values:
+            return self._render(plan)
+
+        keys = self._cache_keys(values)
+        _, output_cache = self._caches()
+
+        output_key = self._output_key(values, keys, render_head_tag, render_title_tag)
+        if output_key is not None:
+            found: Optional[tuple[list[Any], Markup]] = output_cache.get(output_key)
+            if found is not None:
+                return found[1]
+
+        output = self._render(plan, self._resolve_values(values, keys, threaded))
+
+        if output_key is not None:
+            output_cache.set(output_key, (plan, output), self.output_cache_size)
+
+        return output
+
+    def _output_key(
+        self,
+        values: dict[int, Any],
+        keys: dict[int, Hashable],
+        render_head_tag: bool,
+        render_title_tag: bool,
+    ) -> Optional[tuple[Any, ...]]:
+        """
+        A private method that returns the key the whole output is cached
+        under, or None when it can't be cached.
+
+        The output cache is shared with the head's copies and layers, so
+        the key names the plan the output was rendered from by id(). The
+        cached entry keeps the plan alive, so the id can't be reused while
+        the entry exists.
+
+        :param values: The delayed values of the plan, keyed by id().
+        :param keys: Their cache keys, keyed by id().
+        :param render_head_tag:
+        :param render_title_tag:
+        :return: The output cache key, or None.
+        :rtype: tuple
+        """
+        plan = self._plans[(render_head_tag, render_title_tag)]
+        if len(keys) == len(values) and plan.keyable:
+            return (id(plan.parts), tuple(keys.values()))
+        return None
+
+    def _resolve_values(
+        self, values: dict[int, Any], keys: dict[int, Hashable], threaded: bool
+    ) -> dict[int, str]:
+        """
+        A private method that resolves delayed values ahead of rendering:
+        from the value cache, in batches, and (with threaded) concurrently.
+        Values that can't be resolved ahead are left to the render.
+
+        :param values: The delayed values of the plan, keyed by id().
+        :param keys: Their cache keys, keyed by id().
+        :param threaded: If True, resolve blocking values in a thread pool.
+        :return: The resolved values keyed by id().
+        :rtype: dict
+        """
+        value_cache, _ = self._caches()
+
+        resolved = {}
+        for value_id, key in keys.items():
+            found = value_cache.get(key)
+            if found is not None:
+                resolved[value_id] = found[1]
+
+        pending = {k: v for k, v in values.items() if k not in resolved}
+        resolved.update(self._resolve_batched(pending))
+
+        if threaded:
+            blocking = [
+                value
+                for key, value in pending.items()
+                if key not in resolved
+                and hasattr(value, "compile")
+                and getattr(value, "blocking", False)
+            ]
+
+            if len(blocking) > 1:
+                executor = self.executor or _shared_executor()
+                futures = [
+                    executor.submit(contextvars.copy_context().run, value.compile)
+                    for value in blocking
+                ]
+                for value, future in zip(blocking, futures):
+                    resolved[id(value)] = future.result()
+
+        for value_id, key in keys.items():
+            if value_id in pending:
+                if value_id not in resolved:
+                    resolved[value_id] = resolve(values[value_id])
+                # The value is kept with its output: keys built from
+                # varies_on() hold its id(), which can't be reused while
+                # the entry keeps it alive.
+                value_cache.set(
+                    key, (values[value_id], resolved[value_id]), self.value_cache_size
+                )
+
+        return resolved
+
+    def cache_info(self) -> HeadCacheInfo:
+        """
+        Hit and miss counters of the caches used by compile().
+
+        ``values`` counts lookups of resolved delayed values and ``outputs``
+        lookups of whole compiled outputs. Both caches, and their counters,
+        are shared with the head's copies and layers (see copy() and
+        layer()), so heads derived from a shared head on every request
+        reuse what it resolved.
+
+        :return: The counters and sizes of both caches.
+        :rtype: HeadCacheInfo
+        """
+        value_cache, output_cache = self._caches()
+        return HeadCacheInfo(value_cache.info(), output_cache.info())
+
+    def _caches(self) -> tuple[LRUCache, LRUCache]:
+        """
+        A private method that returns the value and output caches, which
+        are shared with copies of the head.
+
+        :return: The value cache and the output cache.
+        :rtype: tuple
+        """
+        return self._values, self._outputs
+
+    @staticmethod
+    def _cache_keys(values: dict[int, Any]) -> dict[int, Hashable]:
+        """
+        A private method that returns the cache keys of the delayed values
+        that declare one.
+
+        :param values: Delayed values keyed by id().
+        :return: The cache keys keyed by id().
+        :rtype: dict
+        """
+        keys = {}
+        for value_id, value in values.items():
+            key = cache_key_for(value)
+            if key is not None:
+                keys[value_id] = key
+        return keys
+
+    async def compile_async(
+        self,
+        render_head_tag: bool = True,
+        render_title_tag: bool = True,
+        *,
+        timeout: Optional[float] = None,
+        fallback: str = "",
+    ) -> Markup:
+        """
+        Used to compile the elements in head.e dict, awaiting any
+        ``AsyncCompileDelayed`` values concurrently first.
+
+        Every async value in the head (in ``Meta``, ``Link``, ``Script``,
+        ``Base``, ``Stylesheet``, ``Favicon``, ...) is awaited with
+        ``asyncio.gather``. Each one is given ``timeout`` seconds on its own;
+        a value that times out is rendered as ``fallback``. Synchronous
+        ``CompileDelayed`` values are resolved as they are by compile().
+
+        In a Jinja2 environment created with ``enable_async=True`` the
+        coroutine is awaited automatically:
+
+        .. code-block::
+
+            <html>
+            {{ head.compile_async() }}
+            <body>
+            ...
+            </body>
+            </html>
+
         :param render_head_tag: If False, the head tag will not be rendered.
         :param render_title_tag: If False, the title tag will not be rendered.
+        :param timeout: Seconds to wait for each async value, or None to wait.
+        :param fallback: Rendered in place of a value that timed out.
         :return:
         """
-        render = ["<head>" if render_head_tag else ""]
+        plan = self._plan(render_head_tag, render_title_tag)
+
+        pending = {
+            key: value
+            for key, value in self._delayed_values(plan).items()
+            if hasattr(value, "compile_async")
+        }
+
+        if not pending:
+            return self._render(plan)
+
+        async def _await(value: AsyncCompileDelayed) -> str:
+            try:
+                return await asyncio.wait_for(value.compile_async(), timeout)
+            except asyncio.TimeoutError:
+                return fallback
+
+        results = await asyncio.gather(*(_await(v) for v in pending.values()))
+
+        return self._render(plan, dict(zip(pending, results)))
+
+    @staticmethod
+    def _delayed_values(plan: list[Any]) -> dict[int, Any]:
+        """
+        A private method that collects the delayed values held by the holes
+        of a compiled plan, keyed by id() so shared values appear once.
+
+        :param plan:
+        :return: The delayed values in the order they are rendered.
+        :rtype: dict
+        """
+        values = {}
+        for part in plan:
+            if isinstance(part, BaseElement):
+                for value in part._delayed_values():
+                    values[id(value)] = value
+        return values
+
+    @staticmethod
+    def _resolve_batched(values: dict[int, Any]) -> dict[int, str]:
+        """
+        A private method that resolves delayed values whose class provides a
+        ``compile_many`` classmethod, one call per class.
+
+        :param values: Delayed values keyed by id().
+        :return: The resolved values keyed by id().
+        :rtype: dict
+        """
+        batches: dict[CompileMany, list[Any]] = {}
+        for value in values.values():
+            cls = type(value)
+            if hasattr(cls, "compile_many"):
+                batches.setdefault(cast(CompileMany, cls), []).append(value)
+
+        resolved = {}
+        for compiler, batch in batches.items():
+            for value, result in zip(batch, compiler.compile_many(batch)):
+                resolved[id(value)] = result
+        return resolved
+
+    @staticmethod
+    def _render(plan: list[Any], resolved: Optional[dict[int, str]] = None) -> Markup:
+        """
+        A private method that joins a compiled plan, compiling its holes.
+
+        :param plan:
+        :param resolved: Delayed values resolved ahead of time, keyed by id().
+        :return: The rendered head.
+        :rtype: Markup
+        """
+        if resolved:
+            token = _resolved.set({**(_resolved.get() or {}), **resolved})
+            try:
+                return Head._render(plan)
+            finally:
+                _resolved.reset(token)
+
+        if len(plan) == 1:
+            return Markup(plan[0])
+
+        return Markup(
+            "\n".join([part if isinstance(part, str) else str(part) for part in plan])
+        )
 
-        for key, element in self.e.items():
-            if key == "title" and not render_title_tag:
+    def iter_compile(
+        self, render_head_tag: bool = True, render_title_tag: bool = True
+    ) -> Iterator[Markup]:
+        """
+        Used to compile the elements in head.e dict as a stream of chunks.
+
+        Joining the chunks gives the same output as compile(). Runs of
+        static elements are yielded as one chunk, and each element holding
+        ``CompileDelayed`` values is only resolved when the generator reaches
+        it, so the start of the head can be sent before slow values further
+        down are resolved.
+
+        With Flask, wrap the generator in ``stream_with_context`` so that
+        ``FlaskUrlFor`` values can still see the request:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from flask import Response, stream_with_context
+
+            @app.get("/")
+            def index():
+                return Response(stream_with_context(head.iter_compile()))
+
+        With Django, pass it to ``StreamingHttpResponse``:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from django.http import StreamingHttpResponse
+
+            def index(request):
+                return StreamingHttpResponse(head.iter_compile())
+
+        :param render_head_tag: If False, the head tag will not be rendered.
+        :param render_title_tag: If False, the title tag will not be rendered.
+        :return: A generator of compiled chunks.
+        """
+        plan = self._plan(render_head_tag, render_title_tag)
+
+        for index, part in enumerate(plan):
+            if not isinstance(part, str):
+                part = str(part)
+            yield Markup(part) if index == 0 else Markup("\n" + part)
+
+    def render_into(
+        self,
+        buffer: Union[list[str], TextIO],
+        render_head_tag: bool = True,
+        render_title_tag: bool = True,
+        *,
+        threaded: bool = False,
+    ) -> None:
+        """
+        Used to render the elements in head.e into a list of strings or a
+        text stream (such as ``io.StringIO``) shared with the rest of the
+        page, instead of returning a ``Markup`` of the head.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            buffer = ["<!DOCTYPE html>\n<html>\n"]
+            head.render_into(buffer)
+            buffer.append("\n<body>...</body>\n</html>")
+            page = "".join(buffer)
+
+        The output is the same as compile(). Runs of static elements are
+        appended as they are and elements holding ``CompileDelayed`` values
+        append their tags piece by piece. Delayed values are resolved and
+        cached as by compile(); an output cached by compile() is appended as
+        it is, but render_into() does not add outputs to that cache.
+
+        :param buffer: A list to append to, or a stream to write to.
+        :param render_head_tag: If False, the head tag will not be rendered.
+        :param render_title_tag: If False, the title tag will not be rendered.
+        :param threaded: If True, resolve blocking values in a thread pool.
+        :return:
+        """
+        write = buffer.append if isinstance(buffer, list) else buffer.write
+        plan = self._plan(render_head_tag, render_title_tag)
+
+        values = self._delayed_values(plan)
+        if not values:
+            self._write(plan, write)
+            return
+
+        keys = self._cache_keys(values)
+        output_key = self._output_key(values, keys, render_head_tag, render_title_tag)
+        if output_key is not None:
+            _, output_cache = self._caches()
+            found = output_cache.get(output_key)
+            if found is not None:
+                write(found[1])
+                return
+
+        self._write(plan, write, self._resolve_values(values, keys, threaded))
+
+    @staticmethod
+    def _write(
+        plan: list[Any],
+        write: Callable[[str], Any],
+        resolved: Optional[dict[int, str]] = None,
+    ) -> None:
+        """
+        A private method that passes a compiled plan to write, as _render()
+        joins it.
+
+        :param plan:
+        :param write: Takes each piece of the output.
+        :param resolved: Delayed values resolved ahead of time, keyed by id().
+        :return:
+        """
+        if resolved:
+            token = _resolved.set({**(_resolved.get() or {}), **resolved})
+            try:
+                Head._write(plan, write)
+            finally:
+                _resolved.reset(token)
+            return
+
+        for index, part in enumerate(plan):
+            if index:
+                write("\n")
+            if isinstance(part, str):
+                write(part)
+            elif isinstance(part, BaseElement):
+                part._write(write)
+            else:
+                write(str(part))
+
+    def tags(self, render_title_tag: bool = True) -> list[Union[Tag, str]]:
+        """
+        Used to get the tags of the elements in head.e, in the order they
+        render, as ``Tag`` records (see ``pyhead.serializers``).
+
+        :param render_title_tag: If False, the title tag is left out.
+        :return: The tags of the head, without the head tag itself.
+        :rtype: list
+        """
+        tags: list[Union[Tag, str]] = []
+        for key, element in self.e.peek_items():
+            if key != "title" or render_title_tag:
+                tags.extend(element.tags())
+        return tags
+
+    def serialize(
+        self,
+        serializer: Callable[[list[Union[Tag, str]]], _S],
+        render_title_tag: bool = True,
+    ) -> _S:
+        """
+        Used to render the elements in head.e in another format, with one of
+        the serializers in ``pyhead.serializers`` or any callable that takes
+        a list of tags.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from pyhead.serializers import json, link_header, xhtml
+
+            head.serialize(xhtml)
+            head.serialize(link_header, render_title_tag=False)
+
+        ``CompileDelayed`` values whose class provides ``compile_many`` are
+        resolved with one call per class, as by compile(); the output is not
+        cached.
+
+        :param serializer: Turns the tags of the head into the output.
+        :param render_title_tag: If False, the title tag is left out.
+        :return: The output of the serializer.
+        """
+        values = {}
+        for _, element in self.e.peek_items():
+            for value in element._delayed_values():
+                values[id(value)] = value
+
+        resolved = self._resolve_batched(values)
+        if not resolved:
+            return serializer(self.tags(render_title_tag))
+
+        token = _resolved.set({**(_resolved.get() or {}), **resolved})
+        try:
+            return serializer(self.tags(render_title_tag))
+        finally:
+            _resolved.reset(token)
+
+    def _plan(self, render_head_tag: bool, render_title_tag: bool) -> list[Any]:
+        """
+        A private method that returns the compiled plan for the given flags.
+
+        The plan is a list of frozen string chunks (runs of static elements,
+        already compiled and joined) and "holes" — elements that contain
+        ``CompileDelayed`` values or other non-plain state and so must be
+        compiled on every render. Joining the plan with newlines produces
+        the same output as compiling every element in head.e.
+
+        Plans are cached per flag combination and rebuilt when head.e changes
+        (for example through extend) or when one of its elements, or an
+        element nested in one, is mutated (see ``BaseElement``
+        memoization). Changes to elements of other heads only cost a check
+        of this head's elements. Outputs cached for an old plan are not
+        reused by the new one (see _output_key).
+
+        :param render_head_tag:
+        :param render_title_tag:
+        :return: The list of chunks and holes.
+        :rtype: list
+        """
+        flags = (render_head_tag, render_title_tag)
+        items = tuple(self.e.peek_items())
+        current = revision()
+
+        cached = self._plans.get(flags)
+        if cached is not None and cached.runs is None:
+            # Spliced by a layer; only valid together with its base.
+            cached = None
+
+        if cached is not None and cached.items == items:
+            if cached.revision == current:
+                return cached.parts
+
+            # Read together with the memos, so that an element changed in
+            # between is caught by the next render.
+            with _revision_lock:
+                current = revision()
+                if cached.is_current(current):
+                    self._plans[flags] = cached._replace(revision=current)
+                    return cached.parts
+
+        # The memos the plan is compiled from, taken before it is compiled
+        # so that changes made meanwhile are caught by the next render.
+        memos: list[tuple[BaseElement, Memo]] = []
+        for key, element in items:
+            if isinstance(element, BaseElement) and (
+                key != "title" or render_title_tag
+            ):
+                memo = element._memoize()
+                memos.append((element, memo))
+                memos.extend(memo[0] or ())
+
+        base = self._plan_base(flags, cached)
+        if base is not None:
+            # The output of the base can only be reused if the elements
+            # this head shares with it are unchanged.
+            taken = {id(element): memo for element, memo in memos}
+            for element, memo in base.memos:
+                if taken.get(id(element), memo) is not memo:
+                    base = None
+                    break
+
+        runs = self._runs(items, render_title_tag, base)
+
+        plan: list[Any] = []
+        static: list[Optional[str]] = ["<head>" if render_head_tag else ""]
+
+        # A run can render nothing (a title hidden by render_title_tag),
+        # and is left out rather than becoming an empty chunk.
+        for _, _, part in runs:
+            if isinstance(part, tuple):
+                static.extend(part)
                 continue
 
-            render.append(str(element))
+            if any(text is not None for text in static):
+                plan.append(self._join(static))
+            static = []
+            plan.append(part)
 
         if render_head_tag:
-            render.append("</head>")
+            static.append("</head>")
+
+        if any(text is not None for text in static):
+            plan.append(self._join(static))
+
+        self._plans[flags] = _Plan(
+            current, items, plan, self._keyable(plan), runs, tuple(memos), {}
+        )
+        return plan
+
+    @staticmethod
+    def _keyable(plan: list[Any]) -> bool:
+        return all(
+            isinstance(part, str)
+            or (isinstance(part, BaseElement) and part._is_keyable())
+            for part in plan
+        )
+
+    def _plan_base(
+        self, flags: tuple[bool, bool], cached: Optional[_Plan]
+    ) -> Optional[_Plan]:
+        """
+        A private method that returns the plan a new plan can be built from.
+
+        :param flags:
+        :param cached: The previous plan for the flags, if any.
+        :return: A plan for similar items, or None.
+        :rtype: _Plan
+        """
+        if cached is None:
+            # Runs are the same with or without the head tag.
+            cached = self._plans.get((not flags[0], flags[1]))
+        return None if cached is None or cached.runs is None else cached
+
+    @staticmethod
+    def _runs(
+        items: tuple[tuple[str, Any], ...],
+        render_title_tag: bool,
+        base: Optional[_Plan] = None,
+    ) -> list[tuple[int, int, Any]]:
+        """
+        A private method that splits items into runs of static elements,
+        as a tuple of their outputs, and single dynamic elements.
+
+        With a base plan for similar items (this head before it was
+        extended, or the head it was copied or layered from), runs whose
+        items are unchanged are reused as they are, and the output of
+        unchanged static elements is taken from the base runs, so only the
+        items that were added or replaced are compiled.
+
+        :param items: The items of head.e.
+        :param render_title_tag: If False, the title renders as None.
+        :param base: A plan whose elements shared with items are unchanged,
+            or None.
+        :return: A list of ``(start, stop, part)``.
+        :rtype: list
+        """
+        runs: list[tuple[int, int, Any]] = []
+        texts: list[Optional[str]] = []
+        start = 0
+        position = 0
+        size = len(items)
+
+        pending = [] if base is None or base.runs is None else base.runs
+        base_items = () if base is None else base.items
+
+        for base_start, base_stop, part in pending:
+            length = base_stop - base_start
+            if items[position : position + length] == base_items[base_start:base_stop]:
+                if isinstance(part, tuple):
+                    texts.extend(part)
+                else:
+                    if texts:
+                        runs.append((start, position, tuple(texts)))
+                        texts = []
+                    # Equal to the base's element, but not necessarily the
+                    # same one.
+                    runs.append((position, position + 1, items[position][1]))
+                    start = position + 1
+                position += length
+                continue
+
+            for offset, base_item in enumerate(base_items[base_start:base_stop]):
+                if position == size or items[position][0] != base_item[0]:
+                    continue
+
+                if isinstance(part, tuple) and items[position][1] is base_item[1]:
+                    texts.append(part[offset])
+                else:
+                    output = Head._compile_item(items[position], render_title_tag)
+                    if output is None or isinstance(output, str):
+                        texts.append(output)
+                    else:
+                        if texts:
+                            runs.append((start, position, tuple(texts)))
+                            texts = []
+                        runs.append((position, position + 1, output))
+                        start = position + 1
+                position += 1
+
+        for item in items[position:]:
+            output = Head._compile_item(item, render_title_tag)
+            if output is None or isinstance(output, str):
+                texts.append(output)
+            else:
+                if texts:
+                    runs.append((start, position, tuple(texts)))
+                    texts = []
+                runs.append((position, position + 1, output))
+                start = position + 1
+            position += 1
+
+        if texts:
+            runs.append((start, position, tuple(texts)))
+
+        return runs
 
-        return Markup("\n".join(render))
+    @staticmethod
+    def _compile_item(item: tuple[str, Any], render_title_tag: bool) -> Any:
+        """
+        A private method that returns the output of a static element (None
+        for a title that is not rendered), or the element itself if it has
+        to be compiled on every render.
+        """
+        key, element = item
+        if key == "title" and not render_title_tag:
+            return None
+
+        # Elements rendered since their last change (for example the ones
+        # shared with the head this one was copied or layered from) are
+        # classified by their memo without walking their attributes.
+        if isinstance(element, BaseElement):
+            output = element._memoize()[1]
+            if isinstance(output, str):
+                return output
+
+        return element
+
+    @staticmethod
+    def _join(texts: list[Optional[str]]) -> str:
+        return "\n".join([text for text in texts if text is not None])
 
     def title(self) -> str:
-        if self.e.get("title"):
-            return escape(self.e["title"].title_)
+        if "title" in self.e:
+            return escape(self.e.peek("title").title_)
         return ""
 
     def __str__(self) -> Markup:
@@ -295,9 +1398,356 @@ class Head:
         return self.compile()
 
 
+class LayeredHead(Head):
+    """
+    A head made of a parent head with more elements layered on top.
+
+    Created by Head.layer(). head.e holds the merged elements and is rebuilt
+    whenever the elements of the parent head change. Changes made to the
+    layer (with extend(), replace(), remove() or through head.e) are kept
+    in the rebuilt elements.
+    """
+
+    _parent: Head
+    _layer: list[HeadElement]
+    _synced: tuple[int, int]
+    _e: ElementStore
+
+    # The store last merged from the parent's; while head.e is still this
+    # store, its changes() are the layer's own elements.
+    _shared: Optional[ElementStore]
+
+    # The parent's elements and the merged ones, as they were when last
+    # merged; the layer's own changes are told apart from them.
+    _below: dict[str, Any]
+    _merged: dict[str, Any]
+
+    def __init__(self, parent: Head, elements_: list[HeadElement]) -> None:
+        """
+        :param parent: The head to layer the elements on.
+        :param elements_: A list of head elements.
+        """
+        self._parent = parent
+        self._layer = list(elements_)
+        self._synced = (-1, -1)
+        self._e = ElementStore()
+        self._below = {}
+        self._merged = {}
+        self._shared = None
+
+        self._plans = {}
+        self._values, self._outputs = parent._values, parent._outputs
+        self._sync()
+
+    @property
+    def e(self) -> ElementStore:
+        self._sync()
+        return self._e
+
+    @e.setter
+    def e(self, value: ElementStore) -> None:
+        self._e = value
+
+    def _sync(self) -> None:
+        """
+        A private method that rebuilds the merged elements when the parent
+        head has changed since they were last merged, keeping the changes
+        made to the layer since.
+
+        :return: None
+        :rtype: None
+        """
+        below = self._parent.e
+        synced = (below.version, below.copies)
+        if synced == self._synced:
+            return
+
+        if below.version == self._synced[0]:
+            self._synced = synced
+            self._follow_copies(below)
+            return
+
+        self._synced = synced
+        changed = self._e
+        merged = self._merged
+
+        self._below = dict.copy(below)
+        self._e = self._shared = below.share()
+        self._loop_elements(self._layer)
+        self._merged = dict.copy(self._e)
+
+        e = self._e
+        for key, element in merged.items():
+            if key not in changed:
+                if key in e:
+                    del e[key]
+            elif changed.peek(key) is not element:
+                e[key] = changed.peek(key)
+
+        for key, element in changed.peek_items():
+            if key not in merged:
+                e[key] = element
+
+        if "title" in e:
+            self.render_title_tag = e.peek("title").title_
+
+    def _follow_copies(self, below: ElementStore) -> None:
+        """
+        A private method that swaps in the private copies the parent head
+        took of elements it shares with this layer, so that changes made to
+        them through the parent's head.e show up here.
+
+        :return: None
+        :rtype: None
+        """
+        for key, element in self._below.items():
+            copy = below.peek(key)
+            if copy is not element and self._e.peek(key) is element:
+                self._e.swap_shared(key, copy)
+                self._merged[key] = copy
+            self._below[key] = copy
+
+    def extend(self, elements_: list[HeadElement]) -> "Head":
+        self._layer = [*self._layer, *elements_]
+
+        # Without a change log any key can change; with one, only the keys
+        # in it, as the others still hold the parent's elements.
+        e = self.e
+        changes = e.changes() if e is self._shared else None
+        keys = e.keys() if changes is None else changes.keys()
+        below = {} if changes is None else self._below
+        before = {key: e.peek(key) for key in keys if key in e}
+        super().extend(elements_)
+
+        # Merged again from _layer when the parent head changes, so not a
+        # change to keep.
+        for key in before:
+            if key not in self._e:
+                self._merged.pop(key, None)
+        for key in keys:
+            element = self._e.peek(key)
+            if element is not None and before.get(key, below.get(key)) is not element:
+                self._merged[key] = element
+        return self
+
+    def _plan(self, render_head_tag: bool, render_title_tag: bool) -> list[Any]:
+        """
+        A private method that returns the compiled plan for the given flags
+        (see Head._plan).
+
+        The parent's plan is reused as it is, and only the layer's own
+        elements are compiled: the ones that replace or remove one of the
+        parent's are spliced into its chunks, and the ones added after
+        them are appended. Planning a layer therefore costs about the same
+        however many elements the parent head has.
+
+        :param render_head_tag:
+        :param render_title_tag:
+        :return: The list of chunks and holes.
+        :rtype: list
+        """
+        e = self.e
+        changes = e.changes()
+        if e is not self._shared or changes is None:
+            return super()._plan(render_head_tag, render_title_tag)
+
+        flags = (render_head_tag, render_title_tag)
+        parts = self._parent._plan(False, render_title_tag)
+        base = self._parent._plans[(False, render_title_tag)]
+        items = tuple(e.peek_items())
+        current = revision()
+
+        cached = self._plans.get(flags)
+        if cached is not None and cached.base is parts and cached.items == items:
+            if cached.revision == current:
+                return cached.parts
+
+            with _revision_lock:
+                current = revision()
+                if cached.is_current(current):
+                    self._plans[flags] = cached._replace(revision=current)
+                    return cached.parts
+
+        memos: list[tuple[BaseElement, Memo]] = []
+
+        def compile_item(item: tuple[str, Any]) -> list[Any]:
+            key, element = item
+            if isinstance(element, BaseElement) and (
+                key != "title" or render_title_tag
+            ):
+                memo = element._memoize()
+                memos.append((element, memo))
+                memos.extend(memo[0] or ())
+            output = self._compile_item(item, render_title_tag)
+            return [] if output is None else [output]
+
+        # The parent's parts to change, as (start, stop, output) within
+        # each: the span of a replaced or removed element's text (the
+        # whole part for a hole), and what takes its place.
+        layout = self._layout(base, render_title_tag)
+        edits: dict[int, list[tuple[int, int, list[Any]]]] = {}
+        removed = added = 0
+        for key, deleted in changes.items():
+            present = key in e
+            where = layout.get(key)
+            if where is None:
+                added += present
+                continue
+
+            if deleted or not present:
+                removed += 1
+                added += present
+                output = []
+            else:
+                output = compile_item((key, e.peek(key)))
+
+            index, start, stop = where
+            if index >= 0:
+                edits.setdefault(index, []).append((start, stop, output))
+
+        if len(base.items) - removed + added != len(items):
+            return super()._plan(render_head_tag, render_title_tag)
+
+        pieces: list[Any] = []
+        for index, part in enumerate(parts):
+            if index not in edits:
+                pieces.append(part)
+                continue
+
+            if not isinstance(part, str):
+                pieces.extend(edits[index][0][2])
+                continue
+
+            # Texts are joined by newlines, so the text before a span ends
+            # one character before it, and the text after it starts one
+            # after. The first chunk starts with an empty text in place of
+            # the head tag.
+            position = 0
+            for start, stop, output in sorted(edits[index], key=itemgetter(0)):
+                if start > position:
+                    pieces.append(part[position : start - 1])
+                pieces.extend(output)
+                position = stop + 1
+            if position <= len(part):
+                pieces.append(part[position:])
+
+        for item in items[len(items) - added :]:
+            pieces.extend(compile_item(item))
+
+        if render_head_tag:
+            pieces[0] = "<head>" + pieces[0]
+            pieces.append("</head>")
+
+        plan: list[Any] = []
+        static: list[str] = []
+        for piece in pieces:
+            if isinstance(piece, str):
+                static.append(piece)
+                continue
+            if static:
+                plan.append("\n".join(static))
+                static = []
+            plan.append(piece)
+        if static:
+            plan.append("\n".join(static))
+
+        self._plans[flags] = _Plan(
+            current, items, plan, self._keyable(plan), None, tuple(memos), {}, parts
+        )
+        return plan
+
+    @staticmethod
+    def _layout(plan: _Plan, render_title_tag: bool) -> dict[str, tuple[int, int, int]]:
+        """
+        A private method that maps the keys of a headless plan to where
+        their output is: ``(index, start, stop)``, the part and the span of
+        the element's text within it, with start and stop -1 for a hole
+        and index -1 for an element that renders nothing. Worked out once
+        per plan, and stored in it whole so that layers planned meanwhile
+        never see part of it.
+
+        :param plan: A plan for render_head_tag=False.
+        :param render_title_tag: The flag the plan was compiled with.
+        :return: The layout, stored in plan.layout.
+        :rtype: dict
+        """
+        if plan.layout or not plan.items:
+            return plan.layout
+
+        layout: dict[str, tuple[int, int, int]] = {}
+        runs = plan.runs
+        if runs is None:
+            runs = Head._runs(plan.items, render_title_tag)
+
+        # The first chunk starts with the empty text of the missing head
+        # tag.
+        index = position = 0
+        has_text = True
+        for start, stop, part in runs:
+            if not isinstance(part, tuple):
+                if has_text:
+                    index += 1
+                layout[plan.items[start][0]] = (index, -1, -1)
+                index += 1
+                position = 0
+                has_text = False
+                continue
+
+            for (key, _), text in zip(plan.items[start:stop], part):
+                if text is None:
+                    layout[key] = (-1, -1, -1)
+                    continue
+                if has_text:
+                    position += 1
+                layout[key] = (index, position, position + len(text))
+                position += len(text)
+                has_text = True
+
+        plan.layout.update(layout)
+        return layout
+
+    def _plan_base(
+        self, flags: tuple[bool, bool], cached: Optional[_Plan]
+    ) -> Optional[_Plan]:
+        if cached is not None and cached.is_current(revision()):
+            return cached
+
+        self._parent._plan(*flags)
+        base = self._parent._plans[flags]
+        return None if base.runs is None else base
+
+
 class HeadClass:
+    """
+    A head defined by a class, for heads that are the same on every request.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        from pyhead import HeadClass
+        from pyhead.elements import Page, Stylesheet
+
+        class SiteHead(HeadClass):
+            elements = [Page(title="My Website"), Stylesheet("/main.css")]
+
+        class BlogHead(SiteHead):
+            elements = [Stylesheet("/blog.css")]
+
+        head = BlogHead()
+
+    Instantiating a subclass returns a copy-on-write copy (see Head.copy) of
+    a Head that is built, and its static elements compiled, once per class
+    on first use. The ``elements`` of a subclass of another HeadClass extend
+    the parent's head the same way extend() would. The head is built again
+    when ``elements`` is reassigned or changed in place.
+    """
+
     elements: list[HeadElement]
 
+    # (elements, parent head, head) of the head built for the class, with
+    # the elements as they were when it was built.
+    _built: tuple[tuple[HeadElement, ...], Optional[Head], Head]
+
     def __new__(cls):
         if cls is HeadClass:
             raise TypeError(
@@ -309,14 +1759,366 @@ class HeadClass:
                 f"{cls.__name__} must define an `elements` class attribute "
                 f"(a list of head elements)."
             )
-        return Head(cls.elements)
+        return cls._head().copy()
+
+    @classmethod
+    def _head(cls) -> Head:
+        """
+        A private method that returns the head built for the class, building
+        it if the class (or a parent's) elements changed since it was built.
+
+        :return: The shared head of the class.
+        :rtype: Head
+        """
+        parent = cls._parent()
+        parent_head = parent._head() if parent is not None else None
+        if parent_head is not None and "elements" not in vars(cls):
+            return parent_head
+
+        elements = cls.elements
+        built: Optional[tuple[tuple[HeadElement, ...], Optional[Head], Head]]
+        built = cls.__dict__.get("_built", None)
+        if (
+            built is not None
+            and built[1] is parent_head
+            and len(built[0]) == len(elements)
+            and all(a is b for a, b in zip(built[0], elements))
+        ):
+            return built[2]
+
+        if parent_head is None:
+            head = Head(elements)
+        else:
+            head = parent_head.copy().extend(elements)
+        head._plan(True, True)
+
+        # Two threads may both build the head on first use; either result
+        # is correct.
+        cls._built = (tuple(elements), parent_head, head)
+        return head
+
+    @classmethod
+    def _parent(cls) -> Optional[type["HeadClass"]]:
+        """
+        A private method that returns the nearest parent HeadClass with
+        elements, or None.
+        """
+        for base in cls.__mro__[1:]:
+            if (
+                base is not HeadClass
+                and issubclass(base, HeadClass)
+                and hasattr(base, "elements")
+            ):
+                return base
+        return None
+
+
+class Slot(str):
+    """
+    A value left open in a ``HeadTemplate``, to be filled in when the
+    template is rendered.
+
+    A slot can be passed to elements wherever they take a string,
+    including the strings Keywords splits and the values of Alternates,
+    MetaBatch and LinkBatch, and the same slot can be used in several
+    places:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        HeadTemplate(
+            [
+                Page(title=Slot("title"), description=Slot("description")),
+                SocialMediaCard(title=Slot("title"), image=Slot("image")),
+            ]
+        )
+    """
+
+    name: str
+
+    def __new__(cls, name: str) -> "Self":
+        slot = super().__new__(cls, f"\x00{name}\x00")
+        slot.name = name
+        return slot
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r})"
+
+
+# The form slots take in compiled output.
+_SLOT_MARKER = re.compile("\x00([^\x00]*)\x00")
+
+
+def _slot_field(fields: Mapping[str, str], match: "re.Match[str]") -> str:
+    """
+    The replacement of a slot found in compiled output.
+
+    :raises TypeError: If the slot was not in the template when it was
+        created.
+    """
+    try:
+        return fields[match[1]]
+    except KeyError:
+        raise TypeError(
+            f"Slot {match[1]!r} was added to the elements of the HeadTemplate "
+            f"after it was created."
+        ) from None
+
+
+class HeadTemplate:
+    """
+    A head compiled once, with the values marked as ``Slot`` left open.
+
+    render() only escapes the slot values and inserts them into the output
+    compiled ahead, so heads that differ in a few values (title,
+    description, canonical URL, image) are rendered without building
+    elements per request:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        template = HeadTemplate(
+            [
+                Page(title=Slot("title"), description=Slot("description")),
+                Link(rel="canonical", href=Slot("url")),
+                SocialMediaCard(
+                    title=Slot("title"),
+                    description=Slot("description"),
+                    url=Slot("url"),
+                    image=Slot("image"),
+                ),
+            ]
+        )
+
+        template.render(title="Home", description="...", url="/", image="/og.png")
+
+    Elements holding ``CompileDelayed`` values are still compiled on every
+    render. Slot values are inserted as they are, so an empty value renders
+    an empty attribute.
+    """
+
+    _head: Head
+
+    # (render_head_tag, render_title_tag): (plan, format string, dynamic
+    # elements); compiled again when the plan of the head is rebuilt.
+    _compiled: dict[tuple[bool, bool], tuple[list[Any], str, list[BaseElement]]]
+
+    def __init__(self, elements_: Union[Head, list[HeadElement]]) -> None:
+        """
+        :param elements_: The elements of the head, or a head to copy.
+        """
+        self._head = (
+            elements_.copy() if isinstance(elements_, Head) else Head(elements_)
+        )
+        self._compiled = {}
+
+        # Slots are found in the compiled output, which also holds the ones
+        # elements split or escape into plain strings. Elements compiled on
+        # every render are not compiled here; their strings are searched.
+        names: dict[str, None] = {}
+        for part in self._head._plan(True, True):
+            if isinstance(part, str):
+                texts = [part]
+            else:
+                texts = [
+                    text
+                    for _, nested in part._walk()
+                    for value in nested._attribute_values()
+                    for text in (value if isinstance(value, list) else (value,))
+                    if isinstance(text, str)
+                ]
+            for text in texts:
+                names.update(dict.fromkeys(_SLOT_MARKER.findall(text)))
+        self._slots = tuple(names)
+
+    @property
+    def slots(self) -> tuple[str, ...]:
+        """
+        The names of the slots in the template.
+        """
+        return self._slots
+
+    def render(
+        self, render_head_tag: bool = True, render_title_tag: bool = True, **values: Any
+    ) -> Markup:
+        """
+        Used to render the template with a value for each slot.
+
+        Values are escaped; ``CompileDelayed`` values are resolved first.
+
+        :param render_head_tag: If False, the head tag will not be rendered.
+        :param render_title_tag: If False, the title tag will not be rendered.
+        :param values: The value of each slot, by name.
+        :raises TypeError: If a slot has no value or a value has no slot.
+        :return: The rendered head.
+        """
+        filled = self._fill(self._slots, values)
+
+        compiled, dynamic = self._compile(render_head_tag, render_title_tag)
+        if dynamic:
+            by_name = dict(zip(self._slots, filled))
+            filled.extend(
+                _SLOT_MARKER.sub(partial(_slot_field, by_name), str(element))
+                for element in dynamic
+            )
+
+        return Markup(compiled.format(*filled))
+
+    @staticmethod
+    def _fill(slots: tuple[str, ...], values: Mapping[str, Any]) -> list[str]:
+        """
+        A private method that returns the escaped values of the slots, in
+        order.
+
+        :param slots: The names of the slots.
+        :param values: The value of each slot, by name.
+        :raises TypeError: If a slot has no value or a value has no slot.
+        :return: The escaped values.
+        :rtype: list
+        """
+        try:
+            filled = [escape_attribute(resolve(values[name])) for name in slots]
+        except KeyError:
+            missing = [name for name in slots if name not in values]
+            raise TypeError(
+                f"HeadTemplate.render() is missing values for slots {missing!r}."
+            ) from None
+
+        if len(values) != len(slots):
+            unknown = [name for name in values if name not in slots]
+            raise TypeError(
+                f"HeadTemplate.render() got values for unknown slots {unknown!r}."
+            )
+
+        return filled
+
+    def _compile(
+        self, render_head_tag: bool, render_title_tag: bool
+    ) -> tuple[str, list[BaseElement]]:
+        """
+        A private method that returns the head compiled to a format string,
+        with a positional field for each slot and then for each element
+        compiled on every render, and those elements.
+
+        :param render_head_tag:
+        :param render_title_tag:
+        :return: The format string and the dynamic elements.
+        :rtype: tuple
+        """
+        flags = (render_head_tag, render_title_tag)
+        plan = self._head._plan(render_head_tag, render_title_tag)
+        compiled = self._compiled.get(flags)
+        if compiled is not None and compiled[0] is plan:
+            return compiled[1], compiled[2]
+
+        fields = {name: f"{{{index}}}" for index, name in enumerate(self._slots)}
+
+        chunks = []
+        dynamic: list[BaseElement] = []
+        for part in plan:
+            if isinstance(part, str):
+                text = part.replace("{", "{{").replace("}", "}}")
+                chunks.append(_SLOT_MARKER.sub(partial(_slot_field, fields), text))
+            else:
+                chunks.append(f"{{{len(self._slots) + len(dynamic)}}}")
+                dynamic.append(part)
+
+        text = "\n".join(chunks)
+        self._compiled[flags] = (plan, text, dynamic)
+        return text, dynamic
+
+
+def render_many(
+    records: Iterable[Mapping[str, Any]],
+    template: HeadTemplate,
+    *,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 1000,
+    render_head_tag: bool = True,
+    render_title_tag: bool = True,
+) -> Iterator[Markup]:
+    """
+    Used to render a template for every record of a large set, such as the
+    pages of a static build, as a stream of heads in the order of the
+    records. Each record maps the slot names of the template to values.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        rows = ({"title": p.name, "url": p.url} for p in products)
+        for product, head in zip(products, render_many(rows, template)):
+            write_page(product, head)
+
+    The template is compiled once, when iteration starts, and records are
+    read as the heads are consumed, so memory use doesn't grow with the
+    number of records. With an executor (for example a
+    ``ProcessPoolExecutor``), records are sent to it in chunks of
+    chunk_size, with a bounded number of chunks in flight; the records and
+    their values must then be picklable.
+
+    :param records: The slot values for each head.
+    :param template: The template to render.
+    :param executor: Renders chunks of records, or None to render them here.
+    :param chunk_size: The number of records sent to the executor at once.
+    :param render_head_tag: If False, the head tag will not be rendered.
+    :param render_title_tag: If False, the title tag will not be rendered.
+    :raises ValueError: If an executor is given for a template with
+        elements that are compiled on every render.
+    :return: A generator of rendered heads.
+    """
+    compiled, dynamic = template._compile(render_head_tag, render_title_tag)
+
+    if dynamic:
+        if executor is not None:
+            raise ValueError(
+                "Templates with elements that are compiled on every render "
+                "(such as ones holding CompileDelayed values) can't be "
+                "rendered by an executor."
+            )
+        for record in records:
+            yield template.render(render_head_tag, render_title_tag, **record)
+        return
+
+    slots = template.slots
+    if executor is None:
+        fill = HeadTemplate._fill
+        for record in records:
+            yield Markup(compiled.format(*fill(slots, record)))
+        return
+
+    pending: deque[Future[list[str]]] = deque()
+    limit = 2 * (os.cpu_count() or 1)
+    iterator = iter(records)
+
+    while chunk := list(islice(iterator, chunk_size)):
+        pending.append(executor.submit(_render_chunk, compiled, slots, chunk))
+        if len(pending) >= limit:
+            yield from map(Markup, pending.popleft().result())
+
+    while pending:
+        yield from map(Markup, pending.popleft().result())
+
+
+def _render_chunk(
+    compiled: str, slots: tuple[str, ...], records: list[Mapping[str, Any]]
+) -> list[str]:
+    """
+    Render a chunk of records for render_many(), in a worker.
+    """
+    fill = HeadTemplate._fill
+    return [compiled.format(*fill(slots, record)) for record in records]
 
 
 __all__ = [
     "__version__",
     "Head",
+    "HeadCacheInfo",
     "HeadClass",
     "HeadElement",
+    "HeadTemplate",
+    "LayeredHead",
+    "Slot",
+    "Alternates",
     "ApplicationName",
     "Base",
     "Charset",
@@ -328,7 +2130,9 @@ __all__ = [
     "Google",
     "Keywords",
     "Link",
+    "LinkBatch",
     "Meta",
+    "MetaBatch",
     "OpenGraphWebsite",
     "Page",
     "Rating",
@@ -343,4 +2147,7 @@ __all__ = [
     "TwitterCard",
     "Verification",
     "Viewport",
+    "intern",
+    "register_dependency",
+    "render_many",
 ]
@@ -1,28 +1,538 @@
-from typing import Optional
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import ContextVar
+from copy import deepcopy
+from functools import lru_cache
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Union,
+    cast,
+)
 
-from markupsafe import Markup
+from markupsafe import Markup, escape
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+# Bumped whenever an element that has a memo is changed. Renders that ran
+# while it changed don't keep their output, and plans compiled before it
+# check their own elements for changes (see Head._plan).
+_revision = 0
+_revision_lock = threading.Lock()
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+_UNSET = object()
+
+
+# Values resolved ahead of rendering (for example awaited by
+# Head.compile_async), keyed by id() of the delayed value.
+_resolved: ContextVar[Optional[dict[int, str]]] = ContextVar(
+    "pyhead_resolved", default=None
+)
+
+
+def revision() -> int:
+    return _revision
+
+
+# The memo of a rendered element: the elements nested in it, each with the
+# memo it had when this one was rendered, and the output. The output is the
+# compiled HTML of static elements, the tags of elements holding delayed
+# values and None for other dynamic elements. Memos whose nested elements
+# are None are never current.
+Memo = tuple[
+    Optional[tuple[tuple["BaseElement", Any], ...]],
+    Optional[Union[Markup, tuple[Any, ...]]],
+]
+
+
+def is_current(memo: Memo) -> bool:
+    """
+    True when no element nested in the memoized element has changed since
+    it was rendered.
+    """
+    nested = memo[0]
+    if nested is None:
+        return False
+    for element, kept in nested:
+        if element._memo is not kept:
+            return False
+    return True
+
+
+def resolve(value: Any) -> Any:
+    """
+    Return the final form of a value that may be ``CompileDelayed``.
+
+    Plain values are returned as-is. Delayed values are looked up in the
+    values resolved ahead of this render first, then compiled.
+
+    :raises TypeError: If the value is ``AsyncCompileDelayed`` only and was
+        not resolved ahead of time.
+    """
+    if value is None or isinstance(value, str):
+        return value
+
+    resolved = _resolved.get()
+    if resolved is not None:
+        found = resolved.get(id(value))
+        if found is not None:
+            return found
+
+    # Attribute checks give the same answer as isinstance() against the
+    # runtime-checkable protocols, at a fraction of the cost.
+    compile = getattr(value, "compile", None)
+    if compile is not None:
+        return compile()
+
+    if hasattr(value, "compile_async"):
+        raise TypeError(
+            f"{value!r} can only be resolved asynchronously. "
+            "Render the head with Head.compile_async() instead."
+        )
+
+    return value
+
+
+def is_delayed(value: Any) -> bool:
+    """
+    True for ``CompileDelayed`` and ``AsyncCompileDelayed`` values.
+    """
+    return hasattr(value, "compile") or hasattr(value, "compile_async")
+
+
+class Tag(NamedTuple):
+    """
+    A single tag, as elements lower to it (see ``BaseElement.tags``).
+
+    ``attributes`` are ``(name, value)`` pairs in the order they render.
+    Values are plain strings, ``Markup`` that is already escaped, or
+    delayed values that are resolved when the tag is serialized; attributes
+    whose value is None are left out. ``text`` is the content of tags that
+    are not void, such as ``<title>``.
+    """
+
+    name: str
+    attributes: tuple[tuple[str, Any], ...] = ()
+    text: Optional[str] = None
+
+
+# Tags without content or an end tag.
+VOID_TAGS = frozenset(
+    (
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    )
+)
+
+
+def escape_attribute(value: Any) -> str:
+    """
+    Escape an attribute value or tag text as ``markupsafe.escape`` does.
+
+    Most values (names, URLs, tokens) contain nothing to escape and are
+    returned as they are, without allocating a ``Markup``. Strings that do
+    need escaping are escaped once and cached, as they tend to repeat from
+    render to render. ``Markup`` and other objects go through
+    ``markupsafe.escape``.
+    """
+    if type(value) is str:
+        if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+            return _escape_special(value)
+        return value
+    return escape(value)
+
+
+@lru_cache(maxsize=1024)
+def _escape_special(value: str) -> str:
+    return str(escape(value))
+
+
+def render_tags(tags: Iterable[Union[Tag, str]], void_end: str = ">") -> str:
+    """
+    Serialize tags to HTML, one tag per line.
+
+    Strings are HTML rendered by elements that only implement ``compile()``
+    and are kept as they are.
+
+    :param tags: The tags to serialize.
+    :param void_end: Closes void tags; ``" />"`` gives XHTML.
+    """
+    buffer: list[str] = []
+    write_tags(tags, buffer.append, void_end)
+    return "".join(buffer)
+
+
+def write_tags(
+    tags: Iterable[Union[Tag, str]],
+    write: Callable[[str], Any],
+    void_end: str = ">",
+) -> None:
+    """
+    Serialize tags to HTML as render_tags() does, passing the output to
+    write (``list.append`` or ``StringIO.write``) one tag at a time instead
+    of joining it.
+    """
+    first = True
+    for tag in tags:
+        if first:
+            first = False
+        else:
+            write("\n")
+
+        if isinstance(tag, str):
+            write(tag)
+            continue
+
+        name, attributes, text = tag
+        html = "<" + name
+        for attribute, value in attributes:
+            if value is not None:
+                if not isinstance(value, str):
+                    value = resolve(value)
+                html += f' {attribute}="{escape_attribute(value)}"'
+
+        if name in VOID_TAGS:
+            write(html + void_end)
+        else:
+            content = "" if text is None else escape_attribute(text)
+            write(f"{html}>{content}</{name}>")
 
 
 class BaseElement:
     """
     Shared behaviour for simple (leaf) head elements.
 
-    Subclasses must implement ``compile()`` returning a string of HTML. The
+    Subclasses implement ``tags()``, lowering the element to the ``Tag``
+    records it renders, which ``compile()`` serializes to HTML (subclasses
+    may implement ``compile()`` returning a string of HTML instead). The
     mixin provides the boilerplate ``__str__`` and ``__call__`` wrappers that
     every element needs — both return a ``Markup`` of the compiled output so
     the result is usable directly inside a Jinja template.
 
     Subclasses may set a ``key`` attribute to opt into deduplication /
     ordering inside ``Head.e``.
+
+    The output of elements whose attributes are all plain values (or tuples
+    of them) is memoized on first render. Reassigning any attribute of a
+    rendered element drops its memo; the memo of a composite element
+    records the memos of the elements nested in it, and a ``Head`` plan
+    those of its elements, so they notice when an element they baked in
+    has changed. Elements that also hold delayed values keep their tags
+    instead, so later renders only resolve and serialize them.
+
+    The elements of pyhead store their attributes in ``__slots__`` to keep
+    them small. Subclasses that don't declare ``__slots__`` get a regular
+    ``__dict__`` and work the same way.
     """
 
+    __slots__ = ("_memo",)
+
     key: Optional[str] = None
 
+    # The slots of the class and its bases, except the memo; set per class.
+    _fields: tuple[str, ...] = ()
+
+    # Reads the values of _fields as a tuple; set per class.
+    _read_fields: Callable[[Any], tuple[Any, ...]] = staticmethod(lambda element: ())
+
+    # (nested, output) once rendered; see Memo.
+    _memo: Optional[Memo]
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Self":
+        element = object.__new__(cls)
+        object.__setattr__(element, "_memo", None)
+        return element
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in vars(klass).get("__slots__", ())
+            if name not in ("_memo", "__dict__", "__weakref__")
+        )
+        fields = cls._fields
+        if len(fields) > 1:
+            cls._read_fields = attrgetter(*fields)
+        elif fields:
+            read = attrgetter(fields[0])
+            cls._read_fields = staticmethod(lambda element: (read(element),))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if self._memo is not None:
+            global _revision
+            with _revision_lock:
+                _revision += 1
+                object.__setattr__(self, "_memo", None)
+
+    def _state(self) -> Iterator[tuple[str, Any]]:
+        """
+        Yield the name and value of every attribute set on this element,
+        except the memo: its slots, and the ``__dict__`` of subclasses that
+        do not define ``__slots__``.
+        """
+        try:
+            yield from zip(self._fields, self._read_fields(self))
+        except AttributeError:
+            # Some slots are unset.
+            for name in self._fields:
+                value = getattr(self, name, _UNSET)
+                if value is not _UNSET:
+                    yield name, value
+
+        state = getattr(self, "__dict__", None)
+        if state is not None:
+            yield from state.items()
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Elements are equal when they are of the same type and their
+        attributes are equal, so equal elements render the same output.
+        """
+        if other is self:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        assert isinstance(other, BaseElement)
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        """
+        Hashes the attributes, so don't change an element while it is used
+        as a dict key. Raises TypeError if an attribute is unhashable.
+        """
+        return hash((type(self), self._values()))
+
+    def _values(self) -> tuple[Any, ...]:
+        """
+        The attributes compared and hashed by ``__eq__`` and ``__hash__``.
+        """
+        try:
+            values = self._read_fields(self)
+        except AttributeError:
+            # Some slots are unset.
+            return tuple(self._state())
+
+        if type(self).__dictoffset__:
+            return (*values, *vars(self).items())
+        return values
+
+    def _attribute_values(self) -> Iterator[Any]:
+        """
+        Yield the attribute values the output depends on, with the items of
+        tuples yielded one by one.
+        """
+        for _, value in self._state():
+            if type(value) is tuple:
+                yield from value
+            else:
+                yield value
+
+    def _is_static(self) -> bool:
+        """
+        True when the compiled output depends only on plain values.
+
+        Attributes holding nested elements are checked recursively, as are
+        the items of tuples; anything else (``CompileDelayed`` values, lists,
+        arbitrary objects) makes the element dynamic, and it will be
+        compiled on every render.
+        """
+        for value in self._attribute_values():
+            if isinstance(value, BaseElement):
+                if not value._is_static():
+                    return False
+            elif not isinstance(value, _PLAIN_TYPES):
+                return False
+        return True
+
+    def _is_keyable(self) -> bool:
+        """
+        True when the compiled output depends only on plain values and
+        delayed values, so it can be cached by the delayed values' keys.
+        """
+        for value in self._attribute_values():
+            if isinstance(value, BaseElement):
+                if not value._is_keyable():
+                    return False
+            elif not isinstance(value, _PLAIN_TYPES) and not is_delayed(value):
+                return False
+        return True
+
+    def _delayed_values(self) -> Iterator[Any]:
+        """
+        Yield every delayed value held by this element or nested elements.
+        """
+        for value in self._attribute_values():
+            if isinstance(value, _PLAIN_TYPES):
+                continue
+            if isinstance(value, BaseElement):
+                yield from value._delayed_values()
+            elif is_delayed(value):
+                yield value
+
+    def _walk(
+        self, path: tuple[str, ...] = ()
+    ) -> Iterator[tuple[tuple[str, ...], "BaseElement"]]:
+        """
+        Yield this element and every element nested in it, each with the
+        attribute names leading to it from this element.
+        """
+        yield path, self
+        for name, value in self._state():
+            if isinstance(value, BaseElement):
+                yield from value._walk((*path, name))
+
+    def _with(self, name: str, value: Any) -> "BaseElement":
+        """
+        Return a shallow copy of this element with one attribute replaced.
+        This element is left as it is; the copy starts without a memo.
+        """
+        clone = BaseElement.__new__(type(self))
+        for field, current in self._state():
+            object.__setattr__(clone, field, current)
+        object.__setattr__(clone, name, value)
+        return clone
+
+    def _memoize(self) -> Memo:
+        """
+        Return the current memo, rendering the element into a new one when
+        it has none or it is stale.
+        """
+        memo = self._memo
+        if memo is not None and is_current(memo):
+            return memo
+
+        # Set before the attributes are read, so that changing them during
+        # the render bumps the revision.
+        object.__setattr__(self, "_memo", (None, None))
+        start = _revision
+        nested = self._track_nested()
+
+        output: Optional[Union[Markup, tuple[Any, ...]]] = None
+        if self._is_static():
+            output = Markup(self.compile())
+        elif self._is_keyable() and type(self).compile is BaseElement.compile:
+            output = self.tags()
+
+        memo = (nested, output)
+        with _revision_lock:
+            # Kept only if nothing changed while it was rendered.
+            if _revision == start:
+                object.__setattr__(self, "_memo", memo)
+        return memo
+
+    def _compiled(self) -> Markup:
+        """
+        The compiled output, served from the memo when it is still current.
+        """
+        memo = self._memo
+        if memo is None or not is_current(memo):
+            memo = self._memoize()
+
+        kept = memo[1]
+        if isinstance(kept, str):
+            return kept
+        if kept is None:
+            return Markup(self.compile())
+        return Markup(render_tags(kept))
+
+    def render_into(self, buffer: Union[list[str], TextIO]) -> None:
+        """
+        Append the compiled output to a list of strings (join it with
+        ``"".join(buffer)``) or write it to a text stream such as
+        ``io.StringIO``, without creating a ``Markup`` for the element.
+        """
+        self._write(buffer.append if isinstance(buffer, list) else buffer.write)
+
+    def _write(self, write: Callable[[str], Any]) -> None:
+        """
+        Pass the compiled output to write, in pieces when it isn't memoized.
+        """
+        memo = self._memo
+        if memo is None or not is_current(memo):
+            # Rendered for the first time since the last change.
+            write(self._compiled())
+            return
+
+        kept = memo[1]
+        if isinstance(kept, str):
+            write(kept)
+        elif kept is not None:
+            write_tags(kept, write)
+        elif type(self).compile is BaseElement.compile:
+            write_tags(self.tags(), write)
+        else:
+            write(self.compile())
+
+    def _track_nested(self) -> tuple[tuple["BaseElement", Memo], ...]:
+        """
+        Return the elements nested in this element with their memos. Nested
+        elements that were never rendered are given a memo that is never
+        current, so that changing them drops it.
+        """
+        nested = []
+        for path, element in self._walk():
+            if path:
+                memo = element._memo
+                if memo is None:
+                    # A new tuple, so that it differs from the memo the
+                    # element is given when it is tracked again.
+                    memo = cast(Memo, tuple([None, None]))  # noqa: C409
+                    object.__setattr__(element, "_memo", memo)
+                nested.append((element, memo))
+        return tuple(nested)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "BaseElement":
+        # Plain values and the memo are immutable and shared with the copy;
+        # only nested elements and other objects are copied. Kept tags hold
+        # this element's delayed values and the memo of a composite refers
+        # to the nested elements of this element, so the copy starts
+        # without those.
+        clone = object.__new__(type(self))
+        memo[id(self)] = clone
+        kept = self._memo
+        if kept is not None and (kept[0] != () or isinstance(kept[1], tuple)):
+            kept = None
+        object.__setattr__(clone, "_memo", kept)
+        for name, value in self._state():
+            if not isinstance(value, _PLAIN_TYPES):
+                value = deepcopy(value, memo)
+            object.__setattr__(clone, name, value)
+        return clone
+
+    def tags(self) -> tuple[Union[Tag, str], ...]:
+        """
+        The tags this element renders, in order. Elements that implement
+        ``compile()`` instead return their compiled HTML as a string.
+        """
+        if type(self).compile is BaseElement.compile:
+            raise NotImplementedError
+        return (self.compile(),)
+
     def compile(self) -> str:
-        raise NotImplementedError
+        return render_tags(self.tags())
 
     def __str__(self) -> Markup:
-        return Markup(self.compile())
+        return self._compiled()
 
     def __call__(self) -> Markup:
-        return Markup(self.compile())
+        return self._compiled()
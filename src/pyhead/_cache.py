@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    A small thread-safe least-recently-used cache.
+
+    Used for the process-wide caches behind the framework helpers (built
+    URLs, reversed URLs, static paths). ``get`` returns None on a miss, so
+    None itself cannot be cached.
+
+    Copying or pickling a cache gives an empty cache of the same size.
+    """
+
+    maxsize: int
+    hits: int
+    misses: int
+
+    _data: "OrderedDict[Hashable, Any]"
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        LRUCache.__init__(self, state["maxsize"])
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, maxsize: Optional[int] = None) -> None:
+        limit = self.maxsize if maxsize is None else maxsize
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > limit:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def keys(self) -> list[Hashable]:
+        with self._lock:
+            return list(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+# Providers for the dependency names a delayed value can list in varies_on().
+_dependencies: dict[str, Callable[[], Hashable]] = {}
+
+
+def register_dependency(name: str, provider: Callable[[], Hashable]) -> None:
+    """
+    Register the provider of a dependency named in ``varies_on()``.
+
+    The provider is called on every render and must return a hashable value
+    describing the current state of the dependency, for example the request
+    host or the active locale:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        from flask import request
+        from pyhead import register_dependency
+
+        register_dependency("host", lambda: request.host)
+    """
+    _dependencies[name] = provider
+
+
+def cache_key_for(value: Any) -> Optional[Hashable]:
+    """
+    The cache key of a delayed value, or None if it cannot be cached.
+
+    ``cache_key()`` wins when the value has it. Otherwise the key is built
+    from the value's identity and the current state of each dependency its
+    ``varies_on()`` lists; a dependency without a registered provider makes
+    the value uncacheable.
+    """
+    cache_key = getattr(value, "cache_key", None)
+    if cache_key is not None:
+        key = cache_key()
+        return None if key is None else (type(value), key)
+
+    varies_on = getattr(value, "varies_on", None)
+    if varies_on is None:
+        return None
+
+    try:
+        state = tuple((name, _dependencies[name]()) for name in varies_on())
+    except KeyError:
+        return None
+
+    return (id(value), state)
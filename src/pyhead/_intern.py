@@ -0,0 +1,50 @@
+from copy import deepcopy
+from typing import Optional, TypeVar
+
+from ._base import BaseElement
+from ._cache import LRUCache
+
+_E = TypeVar("_E")
+
+# Process-wide LRU of canonical elements, keyed by the elements themselves
+# (elements hash and compare by value).
+_interned = LRUCache(maxsize=4096)
+
+
+def intern(element: _E) -> _E:
+    """
+    Return the canonical instance of an element: a private copy of the
+    first element equal to it that was interned. The element passed in is
+    left as it is, so changing it later does not change the canonical
+    instance.
+
+    Elements nested in the canonical instance are interned too, so
+    composites built from common parts (the ``og:type`` ``Meta`` of every
+    ``OpenGraphWebsite``, for example) share those parts even when the
+    composites differ. Equal elements render the same output, so sharing
+    one instance means it is compiled once.
+
+    Interned elements are shared by everything that interned an equal
+    element and must not be changed; heads with ``intern_elements`` set
+    copy them when they are read through head.e. Elements that hold
+    unhashable values are returned as they are.
+
+    :param element: A head element.
+    :return: The canonical element equal to it.
+    """
+    if not isinstance(element, BaseElement):
+        return element
+
+    try:
+        canonical: Optional[_E] = _interned.get(element)
+    except TypeError:
+        return element
+
+    if canonical is None:
+        canonical = deepcopy(element)
+        for name, value in canonical._state():
+            if isinstance(value, BaseElement):
+                # Equal, so the output and any memo stay valid.
+                object.__setattr__(canonical, name, intern(value))
+        _interned.set(canonical, canonical)
+    return canonical
@@ -0,0 +1,467 @@
+import itertools
+import weakref
+from collections.abc import Callable, Iterable
+from copy import deepcopy
+from typing import Any, Optional
+
+from ._base import BaseElement, Memo, is_current, revision
+
+# Stamps every change to any ElementStore with a process-wide unique number.
+_versions = itertools.count()
+
+# The fields ElementStore indexes, and how to read them from an element.
+INDEXED_FIELDS: dict[str, Callable[[Any], Any]] = {
+    "type": type,
+    "rel": lambda element: getattr(element, "_rel", None),
+    "name": lambda element: getattr(element, "_name", None),
+    "property": lambda element: getattr(element, "_property", None),
+    "id": lambda element: getattr(element, "_id", None),
+}
+
+
+def _indexed_values(element: Any) -> set[tuple[str, Any]]:
+    """
+    The ``(field, value)`` pairs an element is indexed under: its own and
+    those of the elements nested in it.
+    """
+    if isinstance(element, BaseElement):
+        elements = [nested for _, nested in element._walk()]
+    else:
+        elements = [element]
+
+    return {
+        (name, value)
+        for nested in elements
+        for name, read in INDEXED_FIELDS.items()
+        if (value := read(nested)) is not None
+    }
+
+
+class ElementStore(dict[str, Any]):
+    """
+    The ``Head.e`` mapping of element ID to element.
+
+    After ``Head.copy()`` the original and the copy share their element
+    instances. A shared element is replaced by a private deep copy the first
+    time it is read through the mapping (indexing, ``get``, ``values``,
+    ``items``, ...), so an element changed through one head never shows up
+    in another. Elements that are only rendered are never copied.
+
+    Elements that may still be changed through a reference held elsewhere
+    (the ones stored from outside, or handed out when read) are not shared
+    with a copy as they are: the copy gets a private deep copy of them,
+    made once and handed to every copy until the element changes.
+
+    ``version`` changes whenever the mapping changes, which lets layered
+    heads notice that the head below them changed. Taking a private copy
+    leaves the content unchanged, so it leaves ``version`` as it is and
+    bumps ``copies`` instead.
+
+    Elements without a key are stored under a numbered key from
+    ``fallback_key()``. The store can be searched by element type and by
+    the ``rel``, ``name``, ``property`` and ``id`` of its elements with
+    ``lookup()``; the indexes behind it are built on the first lookup and
+    kept up to date from then on. An element is found by its own fields and
+    by those of the elements nested in it (the ``og:image`` ``Meta`` of an
+    ``OpenGraphWebsite``, for example). The indexes reflect the attributes
+    an element had when it was stored. A store made by ``share()`` shares
+    the indexes too, and copies the parts it changes. If the original had
+    no indexes yet, they are built on it by the first lookup on either
+    store, as long as neither changed since.
+    """
+
+    version: int
+    copies: int
+
+    _shared: set[str]
+    _fallback: int
+    _indexes: Optional[dict[str, dict[Any, dict[str, None]]]]
+
+    # Whether _indexes is shared with another store, and the index entries
+    # (field, value) this store has copied and may change in place.
+    _indexes_shared: bool
+    _owned_entries: set[tuple[str, Any]]
+
+    # The store this one was shared from before it had indexes, and the
+    # versions both had then.
+    _source: Optional[tuple["weakref.ref[ElementStore]", int, int]]
+
+    # See changes().
+    _changes: Optional[dict[str, bool]]
+
+    # The keys of elements no reference outside the stores can reach: the
+    # private copies made by share(detach=True) and not read since.
+    _private: set[str]
+
+    # The private copies made by share(detach=True), as (element, memo the
+    # element had, copy) per key, and the elements last handed to a copy
+    # with the version, copies and revision they were made at.
+    _snapshots: dict[str, tuple[Any, Optional[Memo], Any]]
+    _detached: Optional[tuple[int, int, int, dict[str, Any]]]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+        self.copies = 0
+        self._shared = set()
+        self._fallback = 0
+        self._indexes = None
+        self._indexes_shared = False
+        self._owned_entries = set()
+        self._source = None
+        self._changes = None
+        self._private = set()
+        self._snapshots = {}
+        self._detached = None
+
+    def share(self, detach: bool = False) -> "ElementStore":
+        """
+        Return a copy of the mapping that shares every element, and the
+        indexes, with this one.
+
+        With detach, elements that may still be changed through a
+        reference held elsewhere are replaced in the copy by private copies
+        of them, so that changing them later does not show up in the copy.
+        """
+        elements = self._detached_elements() if detach else self
+        self._shared = set(self)
+        store = ElementStore(elements)
+        store._shared = self._shared.copy()
+        store._private = set(store) if detach else self._private.copy()
+        store._fallback = self._fallback
+        store._changes = {}
+        if self._indexes is not None:
+            store._indexes = self._indexes
+            store._indexes_shared = self._indexes_shared = True
+        else:
+            store._source = (weakref.ref(self), self.version, store.version)
+        return store
+
+    def _detached_elements(self) -> dict[str, Any]:
+        """
+        The elements to hand to a detached copy: the private ones as they
+        are and private copies of the others, reused while the element has
+        the memo it had when it was copied.
+        """
+        current = revision()
+        detached = self._detached
+        if detached is not None and detached[:3] == (
+            self.version,
+            self.copies,
+            current,
+        ):
+            return detached[3]
+
+        elements: dict[str, Any] = {}
+        snapshots = {}
+        for key, element in dict.items(self):
+            if key in self._private:
+                elements[key] = element
+                continue
+
+            kept = self._snapshots.get(key)
+            if (
+                kept is None
+                or kept[0] is not element
+                or kept[1] is None
+                or element._memo is not kept[1]
+                or not is_current(kept[1])
+            ):
+                kept = self._snapshot(element)
+            elements[key] = kept[2]
+            snapshots[key] = kept
+
+        self._snapshots = snapshots
+        self._detached = (self.version, self.copies, current, elements)
+        return elements
+
+    @staticmethod
+    def _snapshot(element: Any) -> tuple[Any, Optional[Memo], Any]:
+        """
+        Return a private copy of an element with the memo the element has.
+        Delayed values are shared with the copy: the value cache and
+        compiled plans tell them apart by identity.
+        """
+        if not isinstance(element, BaseElement):
+            return element, None, deepcopy(element)
+
+        # Memoized first, so that changing the element drops the memo and
+        # the copy is made again.
+        memo = element._memoize()
+        shared = {id(value): value for value in element._delayed_values()}
+        return element, memo, deepcopy(element, shared)
+
+    def set_shared(self, key: str, element: Any) -> None:
+        """
+        Store an element that is shared with other heads (an interned
+        element, for example). Like the elements shared by ``share()``, it
+        is replaced by a private copy the first time it is read through the
+        mapping.
+        """
+        self[key] = element
+        self._shared.add(key)
+        self._private.add(key)
+
+    def changes(self) -> Optional[dict[str, bool]]:
+        """
+        The keys changed (stored, deleted or read) since this store was made
+        by ``share()``, each mapped to whether it was deleted meanwhile; a
+        deleted key that is stored again comes after the other keys. None
+        if the store was not made by share() or was cleared since.
+        """
+        return self._changes
+
+    def swap_shared(self, key: str, element: Any) -> None:
+        """
+        Replace a shared element by another instance with the same content,
+        for example the private copy another store took of it. The element
+        stays shared and ``version`` is left unchanged.
+        """
+        self._store(key, element, changed=False)
+        self._shared.add(key)
+        self._private.discard(key)
+        self.copies += 1
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """
+        Return the element without taking a private copy. The element must
+        not be changed.
+        """
+        return dict.get(self, key, default)
+
+    def peek_items(self) -> Iterable[tuple[str, Any]]:
+        """
+        The items, without taking private copies. The elements must not be
+        changed.
+        """
+        return dict.items(self)
+
+    def fallback_key(self) -> str:
+        """
+        Return an unused numbered key for an element that has no key.
+
+        Numbering starts at the number of stored elements and only moves
+        forward, so finding a free key takes constant time however many
+        elements were stored before.
+        """
+        number = max(len(self), self._fallback)
+        while str(number) in self:
+            number += 1
+        self._fallback = number + 1
+        return str(number)
+
+    def lookup(self, field: str, value: Any) -> list[str]:
+        """
+        Return the keys of the elements whose ``field`` (one of
+        ``INDEXED_FIELDS``), or that of an element nested in them, equals
+        ``value``, in the order they were stored.
+        """
+        if self._indexes is None:
+            source = self._unchanged_source()
+            if source is not None:
+                keys = source.lookup(field, value)
+                self._indexes = source._indexes
+                self._indexes_shared = source._indexes_shared = True
+                self._source = None
+                return keys
+
+            self._indexes = {name: {} for name in INDEXED_FIELDS}
+            self._owned_entries = set()
+            self._source = None
+            for key, element in dict.items(self):
+                self._index(key, element)
+        return list(self._indexes[field].get(value, ()))
+
+    def _unchanged_source(self) -> Optional["ElementStore"]:
+        """
+        The store this one was shared from, if neither changed since.
+        """
+        if self._source is None:
+            return None
+        ref, source_version, version = self._source
+        source = ref()
+        if (
+            source is None
+            or source.version != source_version
+            or self.version != version
+        ):
+            return None
+        return source
+
+    def _entry(self, name: str, value: Any) -> dict[str, None]:
+        """
+        Return the index entry of a field value to change in place, copying
+        it (and the indexes holding it) first if it is shared with another
+        store.
+        """
+        assert self._indexes is not None
+        if self._indexes_shared:
+            self._indexes = {
+                field: dict(entries) for field, entries in self._indexes.items()
+            }
+            self._indexes_shared = False
+            self._owned_entries = set()
+
+        entries = self._indexes[name]
+        keys = entries.get(value)
+        if keys is None or (name, value) not in self._owned_entries:
+            keys = entries[value] = dict(keys or ())
+            self._owned_entries.add((name, value))
+        return keys
+
+    def _index(self, key: str, element: Any) -> None:
+        for name, value in _indexed_values(element):
+            self._entry(name, value)[key] = None
+
+    def _unindex(self, key: str, element: Any, keep: Any = None) -> None:
+        """
+        Drop the index entries of an element, except the ones it shares
+        with ``keep`` (the element replacing it), which stay in place.
+        """
+        assert self._indexes is not None
+        values = _indexed_values(element)
+        if keep is not None:
+            values -= _indexed_values(keep)
+
+        for name, value in values:
+            if key not in self._indexes[name].get(value, ()):
+                continue
+            keys = self._entry(name, value)
+            del keys[key]
+            if not keys:
+                del self._indexes[name][value]
+                self._owned_entries.discard((name, value))
+
+    def _store(self, key: str, element: Any, changed: bool = True) -> None:
+        """
+        Store an element. With changed=False the element must have the same
+        content as the one it replaces, which keeps its index entries.
+        """
+        if not changed:
+            dict.__setitem__(self, key, element)
+            return
+
+        if self._changes is not None:
+            self._changes.setdefault(key, False)
+        self._private.discard(key)
+
+        if self._indexes is not None:
+            old = dict.get(self, key)
+            if old is not None:
+                self._unindex(key, old, keep=element)
+            self._index(key, element)
+        dict.__setitem__(self, key, element)
+        self.version = next(_versions)
+
+    def _own(self, key: str) -> None:
+        """
+        Replace a shared element by a private deep copy.
+        """
+        if key in self._shared:
+            self._shared.discard(key)
+            self._private.discard(key)
+            self._store(key, deepcopy(dict.__getitem__(self, key)), changed=False)
+            self.copies += 1
+            if self._changes is not None:
+                self._changes.setdefault(key, False)
+
+    def _own_all(self) -> None:
+        for key in list(self._shared):
+            self._own(key)
+
+    def __getitem__(self, key: str) -> Any:
+        if self._shared:
+            self._own(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._shared.discard(key)
+        self._store(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._shared.discard(key)
+        if self._indexes is not None and key in self:
+            self._unindex(key, dict.__getitem__(self, key))
+        dict.__delitem__(self, key)
+        self._private.discard(key)
+        self.version = next(_versions)
+        if self._changes is not None:
+            self._changes[key] = True
+
+    def rename(self, key: str, new_key: str, element: Any) -> None:
+        """
+        Store an element under ``new_key`` in the place of the element under
+        ``key``, which is removed. The elements after it are stored again
+        after the new one, and stay shared if they were.
+        """
+        keys = list(dict.keys(self))
+        later = [
+            (later_key, dict.__getitem__(self, later_key))
+            for later_key in keys[keys.index(key) + 1 :]
+        ]
+        shared = self._shared.intersection(keys)
+        private = self._private.intersection(keys)
+
+        del self[key]
+        for later_key, _ in later:
+            del self[later_key]
+
+        self[new_key] = element
+        for later_key, later_element in later:
+            self[later_key] = later_element
+            if later_key in shared:
+                self._shared.add(later_key)
+            if later_key in private:
+                self._private.add(later_key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            return dict.pop(self, key, *default)
+        element = self[key]
+        del self[key]
+        return element
+
+    def popitem(self) -> tuple[str, Any]:
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        self._shared.clear()
+        dict.clear(self)
+        self._indexes = None
+        self._indexes_shared = False
+        self._source = None
+        self._changes = None
+        self._private.clear()
+        self.version = next(_versions)
+
+    def values(self) -> Any:
+        self._own_all()
+        return dict.values(self)
+
+    def items(self) -> Any:
+        self._own_all()
+        return dict.items(self)
+
+    def copy(self) -> "ElementStore":
+        self._own_all()
+        return ElementStore(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return ElementStore, (dict(self),)
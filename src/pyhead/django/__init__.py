@@ -1,4 +1,159 @@
-from typing import Any
+import itertools
+import os
+import threading
+import time
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any, Optional
+
+from .._cache import LRUCache
+
+if TYPE_CHECKING:
+    from .. import Head
+
+# Process-wide LRU of reversed URLs. Cleared whenever a Django setting
+# changes; keys include the active urlconf, script prefix and language.
+_reverse_cache = LRUCache()
+
+# Bumped by _clear_caches, so cache_key() never matches a key made under
+# other settings.
+_generation = 0
+
+# Numbers every set of static URLs, including each reload of a manifest.
+_static_generations = itertools.count()
+
+_signals_connected = False
+
+
+class _StaticUrls:
+    """
+    Resolved static URLs for one staticfiles storage.
+
+    For manifest storages, the manifest file's modification time is checked
+    at most every ``DjangoStatic.manifest_check_interval`` seconds; when it
+    changes, the storage reloads its manifest and the URLs are dropped. A
+    manifest that can't be loaded (for example one caught halfway through
+    being written) is tried again at the next check, and the URLs resolved
+    from the previous manifest are kept meanwhile.
+    """
+
+    storage: Any
+    urls: dict[str, str]
+    manifest_mtime: Optional[int]
+    checked_at: float
+    generation: int
+
+    _lock: threading.Lock
+
+    def __init__(self, storage: Any) -> None:
+        self.storage = storage
+        self.urls = {}
+        self.generation = next(_static_generations)
+        self.manifest_mtime = _manifest_mtime(storage)
+        self.checked_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def refresh(self, interval: float) -> None:
+        if time.monotonic() - self.checked_at < interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self.checked_at < interval:
+                # Checked by another thread meanwhile.
+                return
+            self.checked_at = now
+
+            mtime = _manifest_mtime(self.storage)
+            if mtime == self.manifest_mtime:
+                return
+
+            try:
+                hashed_files, manifest_hash = self.storage.load_manifest()
+            except ValueError:
+                return
+
+            self.storage.hashed_files = hashed_files
+            self.storage.manifest_hash = manifest_hash
+            self.manifest_mtime = mtime
+            self.urls = {}
+            self.generation = next(_static_generations)
+
+
+# The static URLs of the storage behind staticfiles_storage (or of
+# static() joining STATIC_URL when django.contrib.staticfiles is not
+# installed), resolved on first use and again after a setting changes.
+_static_urls: Optional[_StaticUrls] = None
+
+# Heads registered before the app registry was ready; warmed by
+# PyheadConfig.ready().
+_pending_heads: list["Head"] = []
+
+
+def _manifest_mtime(storage: Any) -> Optional[int]:
+    if storage is None or not hasattr(storage, "load_manifest"):
+        return None
+    try:
+        path = storage.manifest_storage.path(storage.manifest_name)
+        return os.stat(path).st_mtime_ns
+    except (NotImplementedError, OSError):
+        return None
+
+
+def _staticfiles_storage() -> Any:
+    """
+    The storage instance behind ``staticfiles_storage``, or None when
+    ``django.contrib.staticfiles`` is not installed.
+    """
+    from django.apps import apps
+
+    if not apps.is_installed("django.contrib.staticfiles"):
+        return None
+
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.utils.functional import empty
+
+    if staticfiles_storage._wrapped is empty:
+        staticfiles_storage._setup()
+    return staticfiles_storage._wrapped
+
+
+def _current_static_urls() -> _StaticUrls:
+    """
+    The static URLs of the current storage. Only manifest storages are
+    checked for a new manifest.
+    """
+    global _static_urls
+
+    urls = _static_urls
+    if urls is None:
+        _connect_signals()
+        urls = _static_urls = _StaticUrls(_staticfiles_storage())
+    elif urls.manifest_mtime is not None:
+        urls.refresh(DjangoStatic.manifest_check_interval)
+    return urls
+
+
+def _clear_caches(**kwargs: Any) -> None:
+    global _static_urls, _generation
+
+    _generation += 1
+    _reverse_cache.clear()
+    _static_urls = None
+
+
+def _connect_signals() -> None:
+    """
+    Clear the caches on Django's ``setting_changed`` signal. Connected on
+    first use so that importing this module never requires Django.
+    """
+    global _signals_connected
+    if _signals_connected:
+        return
+
+    from django.core.signals import setting_changed
+
+    setting_changed.connect(_clear_caches, dispatch_uid="pyhead_clear_caches")
+    _signals_connected = True
 
 
 class DjangoUrlFor:
@@ -10,6 +165,14 @@ class DjangoUrlFor:
     view name is resolved when the head is compiled, which means the current
     URL configuration is used.
 
+    Reversed URLs are kept in a process-wide LRU cache of
+    ``DjangoUrlFor.cache_size`` entries, keyed on the view name, args,
+    kwargs, urlconf and current app together with the active urlconf (as
+    switched by ``set_urlconf``), script prefix and language. The cache is
+    cleared whenever a setting changes. Pass ``_cache=False`` to reverse on
+    every render, for example when a middleware assigns per-request
+    urlconfs that the key cannot tell apart.
+
     Example::
 
         from pyhead.django import DjangoUrlFor
@@ -18,13 +181,18 @@ class DjangoUrlFor:
         Link(rel="canonical", href=DjangoUrlFor("home"))
     """
 
+    __slots__ = ("_cache", "_current_app", "_urlconf", "args", "kwargs", "view_name")
+
     view_name: str
 
     args: tuple[Any, ...]
     kwargs: dict[str, Any]
 
-    _urlconf: Any | None = None
-    _current_app: str | None = None
+    _urlconf: Any | None
+    _current_app: str | None
+    _cache: bool
+
+    cache_size: int = 1024
 
     def __init__(
         self,
@@ -32,6 +200,7 @@ class DjangoUrlFor:
         *args: Any,
         _urlconf: Any | None = None,
         _current_app: str | None = None,
+        _cache: bool = True,
         **kwargs: Any,
     ) -> None:
         self.view_name = view_name
@@ -39,6 +208,7 @@ class DjangoUrlFor:
         self.kwargs = kwargs
         self._urlconf = _urlconf
         self._current_app = _current_app
+        self._cache = _cache
 
     def compile(self) -> str:
         try:
@@ -49,7 +219,13 @@ class DjangoUrlFor:
                 "Install Django with 'pip install django'."
             ) from e
 
-        return reverse(
+        key = self._cache_key() if self._cache else None
+        if key is not None:
+            cached: Optional[str] = _reverse_cache.get(key)
+            if cached is not None:
+                return cached
+
+        url: str = reverse(
             self.view_name,
             urlconf=self._urlconf,
             args=self.args or None,
@@ -57,6 +233,57 @@ class DjangoUrlFor:
             current_app=self._current_app,
         )
 
+        if key is not None:
+            _connect_signals()
+            _reverse_cache.set(key, url, self.cache_size)
+
+        return url
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """
+        Empty the process-wide reverse cache.
+        """
+        _reverse_cache.clear()
+
+    def cache_key(self) -> Optional[Hashable]:
+        """
+        The key ``Head.compile()`` caches this URL under, or None when the
+        value is not cached.
+        """
+        if not self._cache:
+            return None
+
+        key = self._cache_key()
+        if key is None:
+            return None
+
+        _connect_signals()
+        return (_generation, key)
+
+    def _cache_key(self) -> Optional[Hashable]:
+        """
+        The cache key for this value, or None if any part is unhashable.
+        """
+        from django.urls import get_script_prefix, get_urlconf
+        from django.utils.translation import get_language
+
+        key = (
+            self.view_name,
+            self.args,
+            tuple(sorted(self.kwargs.items())),
+            self._urlconf,
+            self._current_app,
+            get_urlconf(),
+            get_script_prefix(),
+            get_language(),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
 
 class DjangoStatic:
     """
@@ -66,6 +293,12 @@ class DjangoStatic:
     ``STATIC_URL`` and any configured staticfiles storage) behind the same
     deferred-compile pattern. The path is resolved when the head is compiled.
 
+    Resolved URLs are cached per staticfiles storage instance and cleared
+    when a setting changes. With ``ManifestStaticFilesStorage`` the manifest
+    is reloaded, and the cache dropped, only when the manifest file changes
+    on disk (checked at most every ``manifest_check_interval`` seconds). Use
+    :func:`register_head` to resolve a head's paths at startup.
+
     Example::
 
         from pyhead.django import DjangoStatic
@@ -74,8 +307,12 @@ class DjangoStatic:
         Stylesheet(DjangoStatic("main.css"))
     """
 
+    __slots__ = ("path",)
+
     path: str
 
+    manifest_check_interval: float = 1.0
+
     def __init__(self, path: str) -> None:
         self.path = path
 
@@ -88,4 +325,51 @@ class DjangoStatic:
                 "Install Django with 'pip install django'."
             ) from e
 
-        return static(self.path)
+        urls = _current_static_urls().urls
+        url = urls.get(self.path)
+        if url is None:
+            url = urls[self.path] = static(self.path)
+        return url
+
+    def cache_key(self) -> Hashable:
+        """
+        The key ``Head.compile()`` caches this URL under; it changes with
+        the storage, its manifest and the settings.
+        """
+        return (_current_static_urls().generation, self.path)
+
+
+def register_head(head: "Head") -> "Head":
+    """
+    Resolve the ``DjangoStatic`` paths used by a head ahead of its first
+    render.
+
+    Heads registered before Django's app registry is ready are resolved
+    when ``pyhead.django`` is readied (it must be in ``INSTALLED_APPS``);
+    later registrations are resolved immediately. Returns the head, so it
+    can wrap a module-level definition::
+
+        head = register_head(Head([Stylesheet(DjangoStatic("main.css"))]))
+    """
+    from django.apps import apps
+
+    if apps.ready:
+        _warm(head)
+    else:
+        _pending_heads.append(head)
+    return head
+
+
+def _warm(head: "Head") -> None:
+    from .._base import BaseElement
+
+    for _, element in head.e.peek_items():
+        if isinstance(element, BaseElement):
+            for value in element._delayed_values():
+                if isinstance(value, DjangoStatic):
+                    value.compile()
+
+
+def _warm_pending() -> None:
+    while _pending_heads:
+        _warm(_pending_heads.pop())
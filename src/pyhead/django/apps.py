@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class PyheadConfig(AppConfig):
+    name = "pyhead.django"
+
+    def ready(self) -> None:
+        from . import _connect_signals, _warm_pending
+
+        _connect_signals()
+        _warm_pending()
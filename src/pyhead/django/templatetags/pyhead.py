@@ -58,7 +58,7 @@ def head_title(head_obj: Head) -> SafeString:
             {% head head render_head_tag=False render_title_tag=False %}
         </head>
     """
-    title_element = head_obj.e.get("title")
+    title_element = head_obj.e.peek("title")
     if title_element is None:
         return mark_safe("Title Not Set")
     return mark_safe(escape(title_element.title_))
@@ -1,3 +1,4 @@
+from .alternates import Alternates
 from .application_name import ApplicationName
 from .base import Base
 from .charset import Charset
@@ -9,7 +10,9 @@ from .geo_position import GeoPosition
 from .google import Google
 from .keywords import Keywords
 from .link import Link
+from .link_batch import LinkBatch
 from .meta import Meta
+from .meta_batch import MetaBatch
 from .open_graph_website import OpenGraphWebsite
 from .page import Page
 from .rating import Rating
@@ -26,6 +29,7 @@ from .verification import Verification
 from .viewport import Viewport
 
 __all__ = [
+    "Alternates",
     "ApplicationName",
     "Base",
     "Charset",
@@ -37,7 +41,9 @@ __all__ = [
     "Google",
     "Keywords",
     "Link",
+    "LinkBatch",
     "Meta",
+    "MetaBatch",
     "OpenGraphWebsite",
     "Page",
     "Rating",
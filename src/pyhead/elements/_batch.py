@@ -0,0 +1,99 @@
+from collections.abc import Sequence
+from typing import Any, Optional, Union
+
+from markupsafe import Markup
+
+from .._base import BaseElement, Tag, escape_attribute, resolve
+
+Column = Optional[Union[str, Sequence[Any]]]
+
+
+class _Batch(BaseElement):
+    """
+    Shared behaviour for elements that render many tags of one kind from
+    columns of attribute values, one value per tag.
+
+    Each column is kept as a tuple (None when the column is not used), and
+    plain values are escaped once, when the element is created. compile()
+    renders the rows in a single join instead of serializing tags().
+    """
+
+    __slots__ = ("_size",)
+
+    _tag: str
+
+    # (column attribute, HTML attribute), in the order attributes render.
+    _columns: tuple[tuple[str, str], ...]
+
+    _size: int
+
+    def _set_columns(self, **columns: Column) -> None:
+        """
+        Store the columns. A string is used for every tag; all other columns
+        must have the same length.
+
+        :raises ValueError: If the columns differ in length.
+        """
+        sizes = {
+            len(values)
+            for values in columns.values()
+            if values is not None and not isinstance(values, str)
+        }
+        if len(sizes) > 1:
+            raise ValueError(
+                f"{type(self).__name__} columns must all have the same length."
+            )
+        self._size = sizes.pop() if sizes else 1
+
+        for attribute, values in columns.items():
+            if isinstance(values, str):
+                values = (values,) * self._size
+            if values is not None:
+                values = tuple(
+                    escape_attribute(value) if isinstance(value, str) else value
+                    for value in values
+                )
+            setattr(self, attribute, values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(size={self._size!r})"
+
+    def tags(self) -> tuple[Tag, ...]:
+        columns = [
+            (name, values)
+            for attribute, name in self._columns
+            if (values := getattr(self, attribute)) is not None
+        ]
+        return tuple(
+            Tag(
+                self._tag,
+                tuple(
+                    (name, (Markup(value) if isinstance(value, str) else value) or None)
+                    for (name, _), value in zip(columns, row)
+                ),
+            )
+            for row in zip(*[values for _, values in columns])
+        )
+
+    def compile(self) -> str:
+        columns = [
+            (name, values)
+            for attribute, name in self._columns
+            if (values := getattr(self, attribute)) is not None
+        ]
+        opening = f"<{self._tag} "
+        return "\n".join(
+            [
+                opening
+                + " ".join(
+                    [
+                        f'{name}="'
+                        f'{value if isinstance(value, str) else escape_attribute(resolve(value))}"'
+                        for (name, _), value in zip(columns, row)
+                        if value
+                    ]
+                )
+                + ">"
+                for row in zip(*[values for _, values in columns])
+            ]
+        )
@@ -0,0 +1,95 @@
+from collections.abc import Iterable, Mapping
+from typing import Optional, Union
+
+from markupsafe import Markup
+
+from .._base import BaseElement, Tag, escape_attribute, resolve
+from ..protocols import DelayedValue
+
+_PREFIX = '<link rel="alternate" href="'
+
+
+class Alternates(BaseElement):
+    """
+    A block of ``<link rel="alternate" hreflang="...">`` elements.
+
+    Renders the same output as one ``Link(rel="alternate", href=...,
+    hreflang=...)`` per locale, from a single element. Either pass a mapping
+    of locale to URL, or a URL template containing ``{locale}`` and the
+    locales to fill it with:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        Alternates({"en": "https://example.com/en/", "fr": "https://example.com/fr/"})
+
+        Alternates(
+            template="https://example.com/{locale}/about",
+            locales=["en", "fr", "de"],
+            x_default="https://example.com/about",
+        )
+
+    Plain URLs and locales are escaped once, when the element is created,
+    and compile() renders every line with the same ``<link rel="alternate"``
+    prefix instead of serializing tags().
+    """
+
+    __slots__ = ("_hreflangs", "_hrefs")
+
+    key: str = "alternates"
+
+    _rel: str = "alternate"
+    _hrefs: tuple[Union[str, DelayedValue], ...]
+    _hreflangs: tuple[str, ...]
+
+    def __init__(
+        self,
+        urls: Optional[Mapping[str, Union[str, DelayedValue]]] = None,
+        *,
+        template: Optional[str] = None,
+        locales: Optional[Iterable[str]] = None,
+        x_default: Optional[Union[str, DelayedValue]] = None,
+    ) -> None:
+        if (urls is None) == (template is None):
+            raise ValueError("Alternates requires exactly one of urls or template.")
+
+        if template is not None:
+            if locales is None:
+                raise ValueError("Alternates requires locales with a template.")
+            urls = {locale: template.format(locale=locale) for locale in locales}
+
+        assert urls is not None
+        alternates = dict(urls)
+        if x_default is not None:
+            alternates["x-default"] = x_default
+
+        self._hrefs = tuple(
+            escape_attribute(href) if isinstance(href, str) else href
+            for href in alternates.values()
+        )
+        self._hreflangs = tuple(escape_attribute(locale) for locale in alternates)
+
+    def __repr__(self) -> str:
+        return f"Alternates({dict(zip(self._hreflangs, self._hrefs))!r})"
+
+    def compile(self) -> str:
+        return "\n".join(
+            [
+                f"{_PREFIX}{href if isinstance(href, str) else escape_attribute(resolve(href))}"
+                f'" hreflang="{hreflang}">'
+                for href, hreflang in zip(self._hrefs, self._hreflangs)
+            ]
+        )
+
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            Tag(
+                "link",
+                (
+                    ("rel", self._rel),
+                    ("href", Markup(href) if isinstance(href, str) else href),
+                    ("hreflang", Markup(hreflang)),
+                ),
+            )
+            for href, hreflang in zip(self._hrefs, self._hreflangs)
+        )
@@ -1,8 +1,9 @@
-from .._base import BaseElement
-from .meta import Meta
+from .._base import BaseElement, Tag
 
 
 class ApplicationName(BaseElement):
+    __slots__ = ("_content",)
+
     key: str = "application_name"
 
     _content: str
@@ -13,5 +14,10 @@ class ApplicationName(BaseElement):
     def __repr__(self) -> str:
         return f"ApplicationName(content={self._content!r})"
 
-    def compile(self) -> str:
-        return str(Meta(name="application_name", content=self._content))
+    def tags(self) -> tuple[Tag, ...]:
+        return (
+            Tag(
+                "meta",
+                (("name", "application_name"), ("content", self._content or None)),
+            ),
+        )
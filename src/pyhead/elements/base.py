@@ -1,26 +1,21 @@
 from typing import Union
 
-from markupsafe import escape
-
-from .._base import BaseElement
-from ..protocols import CompileDelayed
+from .._base import BaseElement, Tag
+from ..protocols import DelayedValue
 
 
 class Base(BaseElement):
+    __slots__ = ("_href",)
+
     key: str = "base"
 
-    _href: Union[str, CompileDelayed]
+    _href: Union[str, DelayedValue]
 
-    def __init__(self, href: Union[str, CompileDelayed]) -> None:
+    def __init__(self, href: Union[str, DelayedValue]) -> None:
         self._href = href
 
     def __repr__(self) -> str:
         return f"Base(href={self._href!r})"
 
-    def compile(self) -> str:
-        href = (
-            self._href.compile()
-            if isinstance(self._href, CompileDelayed)
-            else self._href
-        )
-        return f'<base href="{escape(href)}">'
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("base", (("href", self._href),)),)
@@ -1,9 +1,9 @@
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 
 class Charset(BaseElement):
+    __slots__ = ("_charset",)
+
     key: str = "charset"
 
     _charset: str
@@ -14,5 +14,5 @@ class Charset(BaseElement):
     def __repr__(self) -> str:
         return f"Charset(charset={self._charset!r})"
 
-    def compile(self) -> str:
-        return f'<meta charset="{escape(self._charset)}">'
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("meta", (("charset", self._charset),)),)
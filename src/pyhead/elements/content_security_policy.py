@@ -1,8 +1,9 @@
-from .._base import BaseElement
-from .meta import Meta
+from .._base import BaseElement, Tag
 
 
 class ContentSecurityPolicy(BaseElement):
+    __slots__ = ("_content",)
+
     key: str = "content_security_policy"
 
     _content: str
@@ -13,5 +14,13 @@ class ContentSecurityPolicy(BaseElement):
     def __repr__(self) -> str:
         return f"ContentSecurityPolicy(content={self._content!r})"
 
-    def compile(self) -> str:
-        return str(Meta(http_equiv="Content-Security-Policy", content=self._content))
+    def tags(self) -> tuple[Tag, ...]:
+        return (
+            Tag(
+                "meta",
+                (
+                    ("http-equiv", "Content-Security-Policy"),
+                    ("content", self._content or None),
+                ),
+            ),
+        )
@@ -1,9 +1,9 @@
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 
 class Description(BaseElement):
+    __slots__ = ("_description",)
+
     key: str = "description"
 
     _description: str
@@ -14,5 +14,5 @@ class Description(BaseElement):
     def __repr__(self) -> str:
         return f"Description(description={self._description!r})"
 
-    def compile(self) -> str:
-        return f'<meta name="description" content="{escape(self._description)}">'
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("meta", (("name", "description"), ("content", self._description))),)
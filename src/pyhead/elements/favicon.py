@@ -1,34 +1,58 @@
 from typing import Optional, Union
 
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 from .link import Link
-from ..protocols import CompileDelayed
+from ..protocols import DelayedValue
 
 
 class Favicon(BaseElement):
+    __slots__ = (
+        "_ico_icon_href",
+        "_png_apple_touch_icon_57_href",
+        "_png_apple_touch_icon_60_href",
+        "_png_apple_touch_icon_72_href",
+        "_png_apple_touch_icon_76_href",
+        "_png_apple_touch_icon_114_href",
+        "_png_apple_touch_icon_120_href",
+        "_png_apple_touch_icon_144_href",
+        "_png_apple_touch_icon_152_href",
+        "_png_apple_touch_icon_167_href",
+        "_png_apple_touch_icon_180_href",
+        "_png_icon_16_href",
+        "_png_icon_32_href",
+        "_png_icon_64_href",
+        "_png_icon_96_href",
+        "_png_icon_180_href",
+        "_png_icon_196_href",
+        "_png_mstile_70_href",
+        "_png_mstile_270_href",
+        "_png_mstile_310_href",
+        "_png_mstile_310x150_href",
+    )
+
     key: str = "favicon"
 
-    _ico_icon_href: Optional[Link] = None
-    _png_icon_16_href: Optional[Link] = None
-    _png_icon_32_href: Optional[Link] = None
-    _png_icon_64_href: Optional[Link] = None
-    _png_icon_96_href: Optional[Link] = None
-    _png_icon_180_href: Optional[Link] = None
-    _png_icon_196_href: Optional[Link] = None
-    _png_apple_touch_icon_57_href: Optional[Link] = None
-    _png_apple_touch_icon_60_href: Optional[Link] = None
-    _png_apple_touch_icon_72_href: Optional[Link] = None
-    _png_apple_touch_icon_76_href: Optional[Link] = None
-    _png_apple_touch_icon_114_href: Optional[Link] = None
-    _png_apple_touch_icon_120_href: Optional[Link] = None
-    _png_apple_touch_icon_144_href: Optional[Link] = None
-    _png_apple_touch_icon_152_href: Optional[Link] = None
-    _png_apple_touch_icon_167_href: Optional[Link] = None
-    _png_apple_touch_icon_180_href: Optional[Link] = None
-    _png_mstile_70_href: Optional[Link] = None
-    _png_mstile_270_href: Optional[Link] = None
-    _png_mstile_310x150_href: Optional[Link] = None
-    _png_mstile_310_href: Optional[Link] = None
+    _ico_icon_href: Optional[Link]
+    _png_icon_16_href: Optional[Link]
+    _png_icon_32_href: Optional[Link]
+    _png_icon_64_href: Optional[Link]
+    _png_icon_96_href: Optional[Link]
+    _png_icon_180_href: Optional[Link]
+    _png_icon_196_href: Optional[Link]
+    _png_apple_touch_icon_57_href: Optional[Link]
+    _png_apple_touch_icon_60_href: Optional[Link]
+    _png_apple_touch_icon_72_href: Optional[Link]
+    _png_apple_touch_icon_76_href: Optional[Link]
+    _png_apple_touch_icon_114_href: Optional[Link]
+    _png_apple_touch_icon_120_href: Optional[Link]
+    _png_apple_touch_icon_144_href: Optional[Link]
+    _png_apple_touch_icon_152_href: Optional[Link]
+    _png_apple_touch_icon_167_href: Optional[Link]
+    _png_apple_touch_icon_180_href: Optional[Link]
+    _png_mstile_70_href: Optional[Link]
+    _png_mstile_270_href: Optional[Link]
+    _png_mstile_310x150_href: Optional[Link]
+    _png_mstile_310_href: Optional[Link]
 
     _icon_reference: dict[str, dict[str, str]] = {
         "_ico_icon_href": {
@@ -157,27 +181,27 @@ class Favicon(BaseElement):
 
     def __init__(
         self,
-        ico_icon_href: Optional[Union[str, CompileDelayed]] = None,
-        png_icon_16_href: Optional[Union[str, CompileDelayed]] = None,
-        png_icon_32_href: Optional[Union[str, CompileDelayed]] = None,
-        png_icon_64_href: Optional[Union[str, CompileDelayed]] = None,
-        png_icon_96_href: Optional[Union[str, CompileDelayed]] = None,
-        png_icon_180_href: Optional[Union[str, CompileDelayed]] = None,
-        png_icon_196_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_57_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_60_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_72_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_76_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_114_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_120_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_144_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_152_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_167_href: Optional[Union[str, CompileDelayed]] = None,
-        png_apple_touch_icon_180_href: Optional[Union[str, CompileDelayed]] = None,
-        png_mstile_70_href: Optional[Union[str, CompileDelayed]] = None,
-        png_mstile_270_href: Optional[Union[str, CompileDelayed]] = None,
-        png_mstile_310x150_href: Optional[Union[str, CompileDelayed]] = None,
-        png_mstile_310_href: Optional[Union[str, CompileDelayed]] = None,
+        ico_icon_href: Optional[Union[str, DelayedValue]] = None,
+        png_icon_16_href: Optional[Union[str, DelayedValue]] = None,
+        png_icon_32_href: Optional[Union[str, DelayedValue]] = None,
+        png_icon_64_href: Optional[Union[str, DelayedValue]] = None,
+        png_icon_96_href: Optional[Union[str, DelayedValue]] = None,
+        png_icon_180_href: Optional[Union[str, DelayedValue]] = None,
+        png_icon_196_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_57_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_60_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_72_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_76_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_114_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_120_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_144_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_152_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_167_href: Optional[Union[str, DelayedValue]] = None,
+        png_apple_touch_icon_180_href: Optional[Union[str, DelayedValue]] = None,
+        png_mstile_70_href: Optional[Union[str, DelayedValue]] = None,
+        png_mstile_270_href: Optional[Union[str, DelayedValue]] = None,
+        png_mstile_310x150_href: Optional[Union[str, DelayedValue]] = None,
+        png_mstile_310_href: Optional[Union[str, DelayedValue]] = None,
     ) -> None:
         set_kwargs = {
             "_ico_icon_href": ico_icon_href,
@@ -204,19 +228,20 @@ class Favicon(BaseElement):
         }
 
         for name, value in set_kwargs.items():
-            if value:
-                setattr(
-                    self,
-                    name,
-                    Link(
-                        **{
-                            k: v
-                            for k, v in self._icon_reference[name].items()
-                            if k != "generated_filename"
-                        },
-                        href=value,
-                    ),
+            setattr(
+                self,
+                name,
+                Link(
+                    **{
+                        k: v
+                        for k, v in self._icon_reference[name].items()
+                        if k != "generated_filename"
+                    },
+                    href=value,
                 )
+                if value
+                else None,
+            )
 
     def __repr__(self) -> str:
         hrefs = [
@@ -226,10 +251,10 @@ class Favicon(BaseElement):
         ]
         return f"Favicon(hrefs={hrefs!r})"
 
-    def compile(self) -> str:
-        rendered = [
-            str(getattr(self, o_link))
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            tag
             for o_link in self._icon_reference
-            if getattr(self, o_link) is not None
-        ]
-        return "\n".join(rendered) if rendered else ""
+            if (element := getattr(self, o_link)) is not None
+            for tag in element.tags()
+        )
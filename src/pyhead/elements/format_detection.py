@@ -1,8 +1,9 @@
-from .._base import BaseElement
-from .meta import Meta
+from .._base import BaseElement, Tag
 
 
 class FormatDetection(BaseElement):
+    __slots__ = ("_address", "_date", "_email", "_telephone", "_url")
+
     key: str = "format_detection"
 
     _telephone: bool
@@ -31,7 +32,7 @@ class FormatDetection(BaseElement):
             f"address={self._address!r}, email={self._email!r}, url={self._url!r})"
         )
 
-    def compile(self) -> str:
+    def tags(self) -> tuple[Tag, ...]:
         __items = []
 
         if not self._telephone:
@@ -46,6 +47,7 @@ class FormatDetection(BaseElement):
             __items.append("url=no")
 
         if not __items:
-            return ""
+            return ()
 
-        return Meta(name="format-detection", content=",".join(__items)).compile()
+        content = ",".join(__items)
+        return (Tag("meta", (("name", "format-detection"), ("content", content))),)
@@ -1,16 +1,18 @@
 from typing import Optional
 
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 from .meta import Meta
 
 
 class GeoPosition(BaseElement):
+    __slots__ = ("_geo_placename", "_geo_position", "_geo_region", "_icbm")
+
     key: str = "geo_position"
 
-    _icbm: Optional[Meta] = None
-    _geo_position: Optional[Meta] = None
-    _geo_region: Optional[Meta] = None
-    _geo_placename: Optional[Meta] = None
+    _icbm: Optional[Meta]
+    _geo_position: Optional[Meta]
+    _geo_region: Optional[Meta]
+    _geo_placename: Optional[Meta]
 
     _order: list[str] = [
         "_icbm",
@@ -26,17 +28,25 @@ class GeoPosition(BaseElement):
         geo_region: Optional[str] = None,
         geo_placename: Optional[str] = None,
     ) -> None:
-        if icbm is not None:
-            self._icbm = Meta(name="ICBM", content=icbm)
+        self._icbm = Meta(name="ICBM", content=icbm) if icbm is not None else None
 
-        if geo_position is not None:
-            self._geo_position = Meta(name="geo.position", content=geo_position)
+        self._geo_position = (
+            Meta(name="geo.position", content=geo_position)
+            if geo_position is not None
+            else None
+        )
 
-        if geo_region is not None:
-            self._geo_region = Meta(name="geo.region", content=geo_region)
+        self._geo_region = (
+            Meta(name="geo.region", content=geo_region)
+            if geo_region is not None
+            else None
+        )
 
-        if geo_placename is not None:
-            self._geo_placename = Meta(name="geo.placename", content=geo_placename)
+        self._geo_placename = (
+            Meta(name="geo.placename", content=geo_placename)
+            if geo_placename is not None
+            else None
+        )
 
     def __repr__(self) -> str:
         return (
@@ -44,10 +54,10 @@ class GeoPosition(BaseElement):
             f"geo_region={self._geo_region!r}, geo_placename={self._geo_placename!r})"
         )
 
-    def compile(self) -> str:
-        rendered = [
-            str(getattr(self, o_tag))
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            tag
             for o_tag in self._order
-            if getattr(self, o_tag) is not None
-        ]
-        return "\n".join(rendered) if rendered else ""
+            if (element := getattr(self, o_tag)) is not None
+            for tag in element.tags()
+        )
@@ -1,15 +1,17 @@
 from typing import Optional
 
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 from .meta import Meta
 
 
 class Google(BaseElement):
+    __slots__ = ("_googlebot", "_no_translate", "_sitelinkssearchbox")
+
     key: str = "google"
 
-    _googlebot: Optional[Meta] = None
-    _sitelinkssearchbox: Optional[Meta] = None
-    _no_translate: Optional[Meta] = None
+    _googlebot: Optional[Meta]
+    _sitelinkssearchbox: Optional[Meta]
+    _no_translate: Optional[Meta]
 
     _order: list[str] = [
         "_googlebot",
@@ -23,16 +25,19 @@ class Google(BaseElement):
         no_sitelinks_search_box: bool = False,
         no_translate: bool = False,
     ) -> None:
-        if googlebot is not None:
-            self._googlebot = Meta(name="googlebot", content=googlebot)
+        self._googlebot = (
+            Meta(name="googlebot", content=googlebot) if googlebot is not None else None
+        )
 
-        if no_sitelinks_search_box:
-            self._sitelinkssearchbox = Meta(
-                name="google", content="nositelinkssearchbox"
-            )
+        self._sitelinkssearchbox = (
+            Meta(name="google", content="nositelinkssearchbox")
+            if no_sitelinks_search_box
+            else None
+        )
 
-        if no_translate:
-            self._no_translate = Meta(name="google", content="notranslate")
+        self._no_translate = (
+            Meta(name="google", content="notranslate") if no_translate else None
+        )
 
     def __repr__(self) -> str:
         return (
@@ -41,10 +46,10 @@ class Google(BaseElement):
             f"no_translate={self._no_translate!r})"
         )
 
-    def compile(self) -> str:
-        rendered = [
-            str(getattr(self, o_tag))
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            tag
             for o_tag in self._order
-            if getattr(self, o_tag) is not None
-        ]
-        return "\n".join(rendered) if rendered else ""
+            if (element := getattr(self, o_tag)) is not None
+            for tag in element.tags()
+        )
@@ -1,29 +1,32 @@
 from typing import Optional
 
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 
 class Keywords(BaseElement):
+    __slots__ = ("_keywords",)
+
     key: str = "keywords"
 
-    _keywords: list[str]
+    # A tuple, so that the element is hashable and its output memoized.
+    _keywords: tuple[str, ...]
 
     def __init__(
         self, from_string: Optional[str] = None, from_list: Optional[list[str]] = None
     ) -> None:
-        self._keywords = []
+        keywords: list[str] = []
 
         if from_string is not None:
-            self._keywords = from_string.split(",")
+            keywords = from_string.split(",")
 
         if from_list is not None:
-            self._keywords.extend(from_list)
+            keywords.extend(from_list)
+
+        self._keywords = tuple(keywords)
 
     def __repr__(self) -> str:
-        return f"Keywords(keywords={self._keywords!r})"
+        return f"Keywords(keywords={list(self._keywords)!r})"
 
-    def compile(self) -> str:
-        join = ", ".join(self._keywords)
-        return f'<meta name="keywords" content="{escape(join)}">'
+    def tags(self) -> tuple[Tag, ...]:
+        content = ", ".join(self._keywords)
+        return (Tag("meta", (("name", "keywords"), ("content", content))),)
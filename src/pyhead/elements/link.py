@@ -1,14 +1,23 @@
 from typing import Optional, Union, Literal
 
-from markupsafe import escape
-
-from .._base import BaseElement
-from ..protocols import CompileDelayed
+from .._base import BaseElement, Tag
+from ..protocols import DelayedValue
 
 
 class Link(BaseElement):
+    __slots__ = (
+        "_crossorigin",
+        "_href",
+        "_hreflang",
+        "_id",
+        "_rel",
+        "_sizes",
+        "_type",
+        "key",
+    )
+
     _rel: str
-    _href: Optional[Union[str, CompileDelayed]]
+    _href: Optional[Union[str, DelayedValue]]
     _sizes: Optional[str]
     _type: Optional[str]
     _hreflang: Optional[str]
@@ -18,7 +27,7 @@ class Link(BaseElement):
     def __init__(
         self,
         rel: str,
-        href: Optional[Union[str, CompileDelayed]] = None,
+        href: Optional[Union[str, DelayedValue]] = None,
         sizes: Optional[str] = None,
         type_: Optional[str] = None,
         hreflang: Optional[str] = None,
@@ -33,8 +42,7 @@ class Link(BaseElement):
         self._crossorigin = crossorigin
         self._id = id_
 
-        if self._id:
-            self.key = self._id
+        self.key = self._id or None
 
     def __repr__(self) -> str:
         parts = [f"rel={self._rel!r}"]
@@ -52,30 +60,14 @@ class Link(BaseElement):
             parts.append(f"id={self._id!r}")
         return f"Link({', '.join(parts)})"
 
-    def compile(self) -> str:
-        __items = [f'rel="{escape(self._rel)}"']
-
-        if self._href:
-            href = (
-                self._href.compile()
-                if isinstance(self._href, CompileDelayed)
-                else self._href
-            )
-            __items.append(f'href="{escape(href)}"')
-
-        if self._sizes:
-            __items.append(f'sizes="{escape(self._sizes)}"')
-
-        if self._type:
-            __items.append(f'type="{escape(self._type)}"')
-
-        if self._hreflang:
-            __items.append(f'hreflang="{escape(self._hreflang)}"')
-
-        if self._crossorigin:
-            __items.append(f'crossorigin="{escape(self._crossorigin)}"')
-
-        if self._id:
-            __items.append(f'id="{escape(self._id)}"')
-
-        return f"<link {' '.join(__items)}>"
+    def tags(self) -> tuple[Tag, ...]:
+        attributes = (
+            ("rel", self._rel),
+            ("href", self._href or None),
+            ("sizes", self._sizes or None),
+            ("type", self._type or None),
+            ("hreflang", self._hreflang or None),
+            ("crossorigin", self._crossorigin or None),
+            ("id", self._id or None),
+        )
+        return (Tag("link", attributes),)
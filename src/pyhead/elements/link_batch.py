@@ -0,0 +1,82 @@
+from collections.abc import Sequence
+from typing import Literal, Optional, Union
+
+from ..protocols import DelayedValue
+from ._batch import _Batch
+
+
+class LinkBatch(_Batch):
+    """
+    Many ``<link>`` tags from parallel columns of attribute values.
+
+    Renders the same output as one ``Link`` per row, without an object per
+    tag:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        LinkBatch(
+            rel="preload",
+            href=["/fonts/a.woff2", "/fonts/b.woff2"],
+            type_="font/woff2",
+            crossorigin="anonymous",
+        )
+
+    A string instead of a list is used for every row.
+    """
+
+    __slots__ = (
+        "_crossorigins",
+        "_hreflangs",
+        "_hrefs",
+        "_ids",
+        "_rels",
+        "_sizes",
+        "_types",
+    )
+
+    _tag = "link"
+    _columns = (
+        ("_rels", "rel"),
+        ("_hrefs", "href"),
+        ("_sizes", "sizes"),
+        ("_types", "type"),
+        ("_hreflangs", "hreflang"),
+        ("_crossorigins", "crossorigin"),
+        ("_ids", "id"),
+    )
+
+    _rels: tuple[str, ...]
+    _hrefs: Optional[tuple[Optional[Union[str, DelayedValue]], ...]]
+    _sizes: Optional[tuple[Optional[str], ...]]
+    _types: Optional[tuple[Optional[str], ...]]
+    _hreflangs: Optional[tuple[Optional[str], ...]]
+    _crossorigins: Optional[
+        tuple[Optional[Literal["anonymous", "use-credentials"]], ...]
+    ]
+    _ids: Optional[tuple[Optional[str], ...]]
+
+    def __init__(
+        self,
+        rel: Union[str, Sequence[str]],
+        href: Optional[Union[str, Sequence[Optional[Union[str, DelayedValue]]]]] = None,
+        sizes: Optional[Union[str, Sequence[Optional[str]]]] = None,
+        type_: Optional[Union[str, Sequence[Optional[str]]]] = None,
+        hreflang: Optional[Union[str, Sequence[Optional[str]]]] = None,
+        crossorigin: Optional[
+            Union[
+                Literal["anonymous", "use-credentials"],
+                Sequence[Optional[Literal["anonymous", "use-credentials"]]],
+            ]
+        ] = None,
+        id_: Optional[Union[str, Sequence[Optional[str]]]] = None,
+    ) -> None:
+        self._set_columns(
+            _rels=rel,
+            _hrefs=href,
+            _sizes=sizes,
+            _types=type_,
+            _hreflangs=hreflang,
+            _crossorigins=crossorigin,
+            _ids=id_,
+        )
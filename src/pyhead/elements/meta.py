@@ -1,16 +1,16 @@
 from typing import Optional, Union
 
-from markupsafe import escape
-
-from .._base import BaseElement
-from ..protocols import CompileDelayed
+from .._base import BaseElement, Tag
+from ..protocols import DelayedValue
 
 
 class Meta(BaseElement):
+    __slots__ = ("_content", "_http_equiv", "_id", "_name", "_property")
+
     _name: Optional[str]
     _http_equiv: Optional[str]
     _property: Optional[str]
-    _content: Optional[Union[str, CompileDelayed]]
+    _content: Optional[Union[str, DelayedValue]]
     _id: Optional[str]
 
     def __init__(
@@ -18,7 +18,7 @@ class Meta(BaseElement):
         name: Optional[str] = None,
         http_equiv: Optional[str] = None,
         property_: Optional[str] = None,
-        content: Optional[Union[str, CompileDelayed]] = None,
+        content: Optional[Union[str, DelayedValue]] = None,
         id_: Optional[str] = None,
     ) -> None:
         provided = [x for x in (name, http_equiv, property_) if x is not None]
@@ -52,25 +52,12 @@ class Meta(BaseElement):
             parts.append(f"id={self._id!r}")
         return f"Meta({', '.join(parts)})"
 
-    def compile(self) -> str:
-        __items = []
-
-        if self._name:
-            __items.append(f'name="{escape(self._name)}"')
-
-        if self._http_equiv:
-            __items.append(f'http-equiv="{escape(self._http_equiv)}"')
-
-        if self._property:
-            __items.append(f'property="{escape(self._property)}"')
-
-        if self._content:
-            if isinstance(self._content, CompileDelayed):
-                __items.append(f'content="{escape(self._content.compile())}"')
-            else:
-                __items.append(f'content="{escape(self._content)}"')
-
-        if self._id:
-            __items.append(f'id="{escape(self._id)}"')
-
-        return f"<meta {' '.join(__items)}>"
+    def tags(self) -> tuple[Tag, ...]:
+        attributes = (
+            ("name", self._name or None),
+            ("http-equiv", self._http_equiv or None),
+            ("property", self._property or None),
+            ("content", self._content or None),
+            ("id", self._id or None),
+        )
+        return (Tag("meta", attributes),)
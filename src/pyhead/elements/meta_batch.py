@@ -0,0 +1,72 @@
+from collections.abc import Sequence
+from typing import Optional, Union
+
+from ..protocols import DelayedValue
+from ._batch import _Batch
+
+
+class MetaBatch(_Batch):
+    """
+    Many ``<meta>`` tags from parallel columns of attribute values.
+
+    Renders the same output as one ``Meta`` per row, without an object per
+    tag:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        MetaBatch(
+            property_=["og:image:width", "og:image:height"],
+            content=["1200", "630"],
+        )
+
+    Every row needs exactly one of name, http_equiv or property_. A string
+    instead of a list is used for every row.
+    """
+
+    __slots__ = ("_contents", "_http_equivs", "_ids", "_names", "_properties")
+
+    _tag = "meta"
+    _columns = (
+        ("_names", "name"),
+        ("_http_equivs", "http-equiv"),
+        ("_properties", "property"),
+        ("_contents", "content"),
+        ("_ids", "id"),
+    )
+
+    _names: Optional[tuple[Optional[str], ...]]
+    _http_equivs: Optional[tuple[Optional[str], ...]]
+    _properties: Optional[tuple[Optional[str], ...]]
+    _contents: Optional[tuple[Optional[Union[str, DelayedValue]], ...]]
+    _ids: Optional[tuple[Optional[str], ...]]
+
+    def __init__(
+        self,
+        name: Optional[Union[str, Sequence[Optional[str]]]] = None,
+        http_equiv: Optional[Union[str, Sequence[Optional[str]]]] = None,
+        property_: Optional[Union[str, Sequence[Optional[str]]]] = None,
+        content: Optional[
+            Union[str, Sequence[Optional[Union[str, DelayedValue]]]]
+        ] = None,
+        id_: Optional[Union[str, Sequence[Optional[str]]]] = None,
+    ) -> None:
+        self._set_columns(
+            _names=name,
+            _http_equivs=http_equiv,
+            _properties=property_,
+            _contents=content,
+            _ids=id_,
+        )
+
+        for row in range(self._size):
+            provided = [
+                column[row]
+                for column in (self._names, self._http_equivs, self._properties)
+                if column is not None and column[row] is not None
+            ]
+            if len(provided) != 1:
+                raise ValueError(
+                    "MetaBatch requires exactly one of name, http_equiv, or "
+                    f"property_ in every row (row {row} has {len(provided)})."
+                )
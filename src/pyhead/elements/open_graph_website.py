@@ -1,21 +1,32 @@
 from typing import Optional, Union
 
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 from .meta import Meta
-from ..protocols import CompileDelayed
+from ..protocols import DelayedValue
 
 
 class OpenGraphWebsite(BaseElement):
+    __slots__ = (
+        "_description",
+        "_image",
+        "_image_alt",
+        "_locale",
+        "_site_name",
+        "_title",
+        "_type",
+        "_url",
+    )
+
     key: str = "open_graph_website"
 
     _type: Meta
-    _locale: Optional[Meta] = None
-    _title: Optional[Meta] = None
-    _url: Optional[Meta] = None
-    _image: Optional[Meta] = None
-    _image_alt: Optional[Meta] = None
-    _description: Optional[Meta] = None
-    _site_name: Optional[Meta] = None
+    _locale: Optional[Meta]
+    _title: Optional[Meta]
+    _url: Optional[Meta]
+    _image: Optional[Meta]
+    _image_alt: Optional[Meta]
+    _description: Optional[Meta]
+    _site_name: Optional[Meta]
 
     _order: list[str] = [
         "_type",
@@ -34,30 +45,40 @@ class OpenGraphWebsite(BaseElement):
         site_name: Optional[str] = None,
         title: Optional[str] = None,
         description: Optional[str] = None,
-        url: Optional[Union[str, CompileDelayed]] = None,
-        image: Optional[Union[str, CompileDelayed]] = None,
+        url: Optional[Union[str, DelayedValue]] = None,
+        image: Optional[Union[str, DelayedValue]] = None,
         image_alt: Optional[str] = None,
     ) -> None:
         self._type = Meta(property_="og:type", content="website")
         self._locale = Meta(property_="og:locale", content=locale)
 
-        if title is not None:
-            self._title = Meta(property_="og:title", content=title)
+        self._title = (
+            Meta(property_="og:title", content=title) if title is not None else None
+        )
 
-        if url is not None:
-            self._url = Meta(property_="og:url", content=url)
+        self._url = Meta(property_="og:url", content=url) if url is not None else None
 
-        if image is not None:
-            self._image = Meta(property_="og:image", content=image)
+        self._image = (
+            Meta(property_="og:image", content=image) if image is not None else None
+        )
 
-        if image_alt is not None:
-            self._image_alt = Meta(property_="og:image:alt", content=image_alt)
+        self._image_alt = (
+            Meta(property_="og:image:alt", content=image_alt)
+            if image_alt is not None
+            else None
+        )
 
-        if description is not None:
-            self._description = Meta(property_="og:description", content=description)
+        self._description = (
+            Meta(property_="og:description", content=description)
+            if description is not None
+            else None
+        )
 
-        if site_name is not None:
-            self._site_name = Meta(property_="og:site_name", content=site_name)
+        self._site_name = (
+            Meta(property_="og:site_name", content=site_name)
+            if site_name is not None
+            else None
+        )
 
     def __repr__(self) -> str:
         return (
@@ -67,10 +88,10 @@ class OpenGraphWebsite(BaseElement):
             f"site_name={self._site_name!r})"
         )
 
-    def compile(self) -> str:
-        rendered = [
-            str(getattr(self, o_tag))
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            tag
             for o_tag in self._order
-            if getattr(self, o_tag) is not None
-        ]
-        return "\n".join(rendered) if rendered else ""
+            if (element := getattr(self, o_tag)) is not None
+            for tag in element.tags()
+        )
@@ -11,6 +11,8 @@ from .viewport import Viewport
 
 
 class Page:
+    __slots__ = ("e",)
+
     e: dict
 
     _description: Optional[Meta] = None
@@ -1,9 +1,9 @@
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 
 class Rating(BaseElement):
+    __slots__ = ("_rating",)
+
     key: str = "rating"
 
     _rating: str
@@ -14,5 +14,5 @@ class Rating(BaseElement):
     def __repr__(self) -> str:
         return f"Rating(rating={self._rating!r})"
 
-    def compile(self) -> str:
-        return f'<meta name="rating" content="{escape(self._rating)}">'
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("meta", (("name", "rating"), ("content", self._rating))),)
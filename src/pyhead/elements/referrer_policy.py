@@ -1,8 +1,9 @@
-from .._base import BaseElement
-from .meta import Meta
+from .._base import BaseElement, Tag
 
 
 class ReferrerPolicy(BaseElement):
+    __slots__ = ("_content",)
+
     key: str = "referrer_policy"
 
     _content: str
@@ -13,5 +14,7 @@ class ReferrerPolicy(BaseElement):
     def __repr__(self) -> str:
         return f"ReferrerPolicy(content={self._content!r})"
 
-    def compile(self) -> str:
-        return str(Meta(name="referrer", content=self._content))
+    def tags(self) -> tuple[Tag, ...]:
+        return (
+            Tag("meta", (("name", "referrer"), ("content", self._content or None))),
+        )
@@ -1,8 +1,9 @@
-from .._base import BaseElement
-from .meta import Meta
+from .._base import BaseElement, Tag
 
 
 class Robots(BaseElement):
+    __slots__ = ("_content",)
+
     key: str = "robots"
 
     _content: str
@@ -13,5 +14,5 @@ class Robots(BaseElement):
     def __repr__(self) -> str:
         return f"Robots(content={self._content!r})"
 
-    def compile(self) -> str:
-        return str(Meta(name="robots", content=self._content))
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("meta", (("name", "robots"), ("content", self._content or None))),)
@@ -1,13 +1,24 @@
 from typing import Optional, Union
 
-from markupsafe import escape
-
-from .._base import BaseElement
-from ..protocols import CompileDelayed
+from .._base import BaseElement, Tag
+from ..protocols import DelayedValue
 
 
 class Script(BaseElement):
-    _src: Union[str, CompileDelayed]
+    __slots__ = (
+        "_async",
+        "_crossorigin",
+        "_defer",
+        "_id",
+        "_integrity",
+        "_nomodule",
+        "_referrerpolicy",
+        "_src",
+        "_type",
+        "key",
+    )
+
+    _src: Union[str, DelayedValue]
     _type: Optional[str]
     _async: bool
     _defer: bool
@@ -19,7 +30,7 @@ class Script(BaseElement):
 
     def __init__(
         self,
-        src: Union[str, CompileDelayed],
+        src: Union[str, DelayedValue],
         type_: Optional[str] = None,
         async_: bool = False,
         defer: bool = False,
@@ -39,8 +50,7 @@ class Script(BaseElement):
         self._referrerpolicy = referrerpolicy
         self._id = id_
 
-        if self._id:
-            self.key = self._id
+        self.key = self._id or None
 
     def __repr__(self) -> str:
         parts = [f"src={self._src!r}"]
@@ -62,31 +72,16 @@ class Script(BaseElement):
             parts.append(f"id={self._id!r}")
         return f"Script({', '.join(parts)})"
 
-    def compile(self) -> str:
-        __items = []
-
-        if self._src:
-            src = (
-                self._src.compile()
-                if isinstance(self._src, CompileDelayed)
-                else self._src
-            )
-            __items.append(f'src="{escape(src)}"')
-        if self._type:
-            __items.append(f'type="{escape(self._type)}"')
-        if self._async:
-            __items.append(f'async="{str(self._async).lower()}"')
-        if self._defer:
-            __items.append(f'defer="{str(self._defer).lower()}"')
-        if self._crossorigin:
-            __items.append(f'crossorigin="{escape(self._crossorigin)}"')
-        if self._integrity:
-            __items.append(f'integrity="{escape(self._integrity)}"')
-        if self._nomodule:
-            __items.append(f'nomodule="{str(self._nomodule).lower()}"')
-        if self._referrerpolicy:
-            __items.append(f'referrerpolicy="{escape(self._referrerpolicy)}"')
-        if self._id:
-            __items.append(f'id="{escape(self._id)}"')
-
-        return f"<script {' '.join(__items)}></script>"
+    def tags(self) -> tuple[Tag, ...]:
+        attributes = (
+            ("src", self._src or None),
+            ("type", self._type or None),
+            ("async", str(self._async).lower() if self._async else None),
+            ("defer", str(self._defer).lower() if self._defer else None),
+            ("crossorigin", self._crossorigin or None),
+            ("integrity", self._integrity or None),
+            ("nomodule", str(self._nomodule).lower() if self._nomodule else None),
+            ("referrerpolicy", self._referrerpolicy or None),
+            ("id", self._id or None),
+        )
+        return (Tag("script", attributes),)
@@ -2,10 +2,12 @@ from typing import Optional, Literal, Union
 
 from .open_graph_website import OpenGraphWebsite
 from .twitter_card import TwitterCard
-from ..protocols import CompileDelayed
+from ..protocols import DelayedValue
 
 
 class SocialMediaCard:
+    __slots__ = ("e",)
+
     e: dict
 
     def __init__(
@@ -13,8 +15,8 @@ class SocialMediaCard:
         card: Literal["summary", "summary_large_image"] = "summary_large_image",
         title: Optional[str] = None,
         description: Optional[str] = None,
-        url: Optional[Union[str, CompileDelayed]] = None,
-        image: Optional[Union[str, CompileDelayed]] = None,
+        url: Optional[Union[str, DelayedValue]] = None,
+        image: Optional[Union[str, DelayedValue]] = None,
         image_alt: Optional[str] = None,
         site_account: Optional[str] = None,
         creator_account: Optional[str] = None,
@@ -1,22 +1,22 @@
 from typing import Optional, Union
 
-from .._base import BaseElement
-from .link import Link
-from ..protocols import CompileDelayed
+from .._base import BaseElement, Tag
+from ..protocols import DelayedValue
 
 
 class Stylesheet(BaseElement):
-    _href: Union[str, CompileDelayed]
+    __slots__ = ("_href", "_id", "key")
+
+    _href: Union[str, DelayedValue]
     _id: Optional[str]
 
     def __init__(
-        self, href: Union[str, CompileDelayed], id_: Optional[str] = None
+        self, href: Union[str, DelayedValue], id_: Optional[str] = None
     ) -> None:
         self._href = href
         self._id = id_
 
-        if id_:
-            self.key = id_
+        self.key = id_ or None
 
     def __repr__(self) -> str:
         parts = [f"href={self._href!r}"]
@@ -24,5 +24,10 @@ class Stylesheet(BaseElement):
             parts.append(f"id={self._id!r}")
         return f"Stylesheet({', '.join(parts)})"
 
-    def compile(self) -> str:
-        return str(Link(rel="stylesheet", href=self._href, id_=self._id))
+    def tags(self) -> tuple[Tag, ...]:
+        attributes = (
+            ("rel", "stylesheet"),
+            ("href", self._href or None),
+            ("id", self._id or None),
+        )
+        return (Tag("link", attributes),)
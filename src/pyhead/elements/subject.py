@@ -1,9 +1,9 @@
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 
 class Subject(BaseElement):
+    __slots__ = ("_subject",)
+
     key: str = "subject"
 
     _subject: str
@@ -14,5 +14,5 @@ class Subject(BaseElement):
     def __repr__(self) -> str:
         return f"Subject(subject={self._subject!r})"
 
-    def compile(self) -> str:
-        return f'<meta name="subject" content="{escape(self._subject)}">'
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("meta", (("name", "subject"), ("content", self._subject))),)
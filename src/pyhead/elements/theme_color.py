@@ -1,8 +1,9 @@
-from .._base import BaseElement
-from .meta import Meta
+from .._base import BaseElement, Tag
 
 
 class ThemeColor(BaseElement):
+    __slots__ = ("_content",)
+
     key: str = "theme_color"
 
     _content: str
@@ -13,5 +14,7 @@ class ThemeColor(BaseElement):
     def __repr__(self) -> str:
         return f"ThemeColor(content={self._content!r})"
 
-    def compile(self) -> str:
-        return str(Meta(name="theme-color", content=self._content))
+    def tags(self) -> tuple[Tag, ...]:
+        return (
+            Tag("meta", (("name", "theme-color"), ("content", self._content or None))),
+        )
@@ -1,9 +1,9 @@
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 
 class Title(BaseElement):
+    __slots__ = ("title_",)
+
     key: str = "title"
 
     title_: str
@@ -14,5 +14,5 @@ class Title(BaseElement):
     def __repr__(self) -> str:
         return f"Title(title={self.title_!r})"
 
-    def compile(self) -> str:
-        return f"<title>{escape(self.title_)}</title>"
+    def tags(self) -> tuple[Tag, ...]:
+        return (Tag("title", text=self.title_),)
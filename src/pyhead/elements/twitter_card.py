@@ -1,21 +1,32 @@
 from typing import Optional, Literal, Union
 
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 from .meta import Meta
-from ..protocols import CompileDelayed
+from ..protocols import DelayedValue
 
 
 class TwitterCard(BaseElement):
+    __slots__ = (
+        "_card",
+        "_creator_account",
+        "_description",
+        "_image",
+        "_image_alt",
+        "_site_account",
+        "_title",
+        "_url",
+    )
+
     key: str = "twitter_card"
 
     _card: Meta
-    _site_account: Optional[Meta] = None
-    _creator_account: Optional[Meta] = None
-    _title: Optional[Meta] = None
-    _description: Optional[Meta] = None
-    _image: Optional[Meta] = None
-    _image_alt: Optional[Meta] = None
-    _url: Optional[Meta] = None
+    _site_account: Optional[Meta]
+    _creator_account: Optional[Meta]
+    _title: Optional[Meta]
+    _description: Optional[Meta]
+    _image: Optional[Meta]
+    _image_alt: Optional[Meta]
+    _url: Optional[Meta]
 
     _order: list[str] = [
         "_card",
@@ -33,36 +44,47 @@ class TwitterCard(BaseElement):
         card: Literal["summary", "summary_large_image"] = "summary",
         title: Optional[str] = None,
         description: Optional[str] = None,
-        url: Optional[Union[str, CompileDelayed]] = None,
-        image: Optional[Union[str, CompileDelayed]] = None,
+        url: Optional[Union[str, DelayedValue]] = None,
+        image: Optional[Union[str, DelayedValue]] = None,
         image_alt: Optional[str] = None,
         site_account: Optional[str] = None,
         creator_account: Optional[str] = None,
     ) -> None:
         self._card = Meta(name="twitter:card", content=card)
 
-        if site_account is not None:
-            self._site_account = Meta(name="twitter:site", content=site_account)
+        self._site_account = (
+            Meta(name="twitter:site", content=site_account)
+            if site_account is not None
+            else None
+        )
 
-        if creator_account is not None:
-            self._creator_account = Meta(
-                name="twitter:creator", content=creator_account
-            )
+        self._creator_account = (
+            Meta(name="twitter:creator", content=creator_account)
+            if creator_account is not None
+            else None
+        )
 
-        if title is not None:
-            self._title = Meta(name="twitter:title", content=title)
+        self._title = (
+            Meta(name="twitter:title", content=title) if title is not None else None
+        )
 
-        if description is not None:
-            self._description = Meta(name="twitter:description", content=description)
+        self._description = (
+            Meta(name="twitter:description", content=description)
+            if description is not None
+            else None
+        )
 
-        if image is not None:
-            self._image = Meta(name="twitter:image", content=image)
+        self._image = (
+            Meta(name="twitter:image", content=image) if image is not None else None
+        )
 
-        if image_alt is not None:
-            self._image_alt = Meta(name="twitter:image:alt", content=image_alt)
+        self._image_alt = (
+            Meta(name="twitter:image:alt", content=image_alt)
+            if image_alt is not None
+            else None
+        )
 
-        if url is not None:
-            self._url = Meta(name="twitter:url", content=url)
+        self._url = Meta(name="twitter:url", content=url) if url is not None else None
 
     def __repr__(self) -> str:
         return (
@@ -72,10 +94,10 @@ class TwitterCard(BaseElement):
             f"image_alt={self._image_alt!r}, url={self._url!r})"
         )
 
-    def compile(self) -> str:
-        rendered = [
-            str(getattr(self, o_tag))
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            tag
             for o_tag in self._order
-            if getattr(self, o_tag) is not None
-        ]
-        return "\n".join(rendered) if rendered else ""
+            if (element := getattr(self, o_tag)) is not None
+            for tag in element.tags()
+        )
@@ -1,17 +1,19 @@
 from typing import Optional
 
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 from .meta import Meta
 
 
 class Verification(BaseElement):
+    __slots__ = ("_bing", "_google", "_norton", "_pinterest", "_yandex")
+
     key: str = "verification"
 
-    _google: Optional[Meta] = None
-    _yandex: Optional[Meta] = None
-    _bing: Optional[Meta] = None
-    _pinterest: Optional[Meta] = None
-    _norton: Optional[Meta] = None
+    _google: Optional[Meta]
+    _yandex: Optional[Meta]
+    _bing: Optional[Meta]
+    _pinterest: Optional[Meta]
+    _norton: Optional[Meta]
 
     _order: list[str] = [
         "_google",
@@ -29,20 +31,33 @@ class Verification(BaseElement):
         pinterest: Optional[str] = None,
         norton: Optional[str] = None,
     ) -> None:
-        if google is not None:
-            self._google = Meta(name="google-site-verification", content=google)
+        self._google = (
+            Meta(name="google-site-verification", content=google)
+            if google is not None
+            else None
+        )
 
-        if yandex is not None:
-            self._yandex = Meta(name="yandex-verification", content=yandex)
+        self._yandex = (
+            Meta(name="yandex-verification", content=yandex)
+            if yandex is not None
+            else None
+        )
 
-        if bing is not None:
-            self._bing = Meta(name="msvalidate.01", content=bing)
+        self._bing = (
+            Meta(name="msvalidate.01", content=bing) if bing is not None else None
+        )
 
-        if pinterest is not None:
-            self._pinterest = Meta(name="p:domain_verify", content=pinterest)
+        self._pinterest = (
+            Meta(name="p:domain_verify", content=pinterest)
+            if pinterest is not None
+            else None
+        )
 
-        if norton is not None:
-            self._norton = Meta(name="norton-safeweb-site-verification", content=norton)
+        self._norton = (
+            Meta(name="norton-safeweb-site-verification", content=norton)
+            if norton is not None
+            else None
+        )
 
     def __repr__(self) -> str:
         return (
@@ -51,10 +66,10 @@ class Verification(BaseElement):
             f"norton={self._norton!r})"
         )
 
-    def compile(self) -> str:
-        rendered = [
-            str(getattr(self, o_tag))
+    def tags(self) -> tuple[Tag, ...]:
+        return tuple(
+            tag
             for o_tag in self._order
-            if getattr(self, o_tag) is not None
-        ]
-        return "\n".join(rendered) if rendered else ""
+            if (element := getattr(self, o_tag)) is not None
+            for tag in element.tags()
+        )
@@ -1,8 +1,6 @@
 from typing import Literal, Optional, Union
 
-from markupsafe import escape
-
-from .._base import BaseElement
+from .._base import BaseElement, Tag
 
 WidthValue = Union[int, Literal["device-width"]]
 HeightValue = Union[int, Literal["device-height"]]
@@ -35,6 +33,17 @@ class Viewport(BaseElement):
         )
     """
 
+    __slots__ = (
+        "height",
+        "initial_scale",
+        "interactive_widget",
+        "maximum_scale",
+        "minimum_scale",
+        "user_scalable",
+        "viewport_fit",
+        "width",
+    )
+
     key: str = "viewport"
 
     width: Optional[WidthValue]
@@ -114,8 +123,10 @@ class Viewport(BaseElement):
             parts.append(f"viewport-fit={self.viewport_fit}")
         return ", ".join(parts)
 
-    def compile(self) -> str:
-        return f'<meta name="viewport" content="{escape(self.content_string())}">'
+    def tags(self) -> tuple[Tag, ...]:
+        return (
+            Tag("meta", (("name", "viewport"), ("content", self.content_string()))),
+        )
 
     def __repr__(self) -> str:
         kwargs = []
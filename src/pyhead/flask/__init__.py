@@ -1,4 +1,65 @@
-from typing import Any
+import itertools
+import weakref
+from collections.abc import Hashable
+from typing import Any, Optional
+from urllib.parse import quote
+
+from .._cache import LRUCache
+
+# Process-wide LRU of built URLs for FlaskUrlFor values created with
+# _cache=True. Keys carry the app's url_map version, so a changed url_map
+# never produces a stale hit.
+_url_cache = LRUCache()
+
+# The rules of each url_map when it was last seen, their ids and the
+# version number they were given.
+_map_states: "weakref.WeakKeyDictionary[Any, tuple[list[Any], list[int], int]]" = (
+    weakref.WeakKeyDictionary()
+)
+_map_versions = itertools.count()
+
+
+def _request_context() -> Any:
+    """
+    The current request context, or None outside a request.
+
+    Flask has no public accessor for it. If the private one goes away, the
+    caller falls back to ``flask.url_for`` without caching.
+    """
+    try:
+        from flask.globals import _cv_request
+    except ImportError:
+        return None
+
+    return _cv_request.get(None)
+
+
+def _map_version(url_map: Any) -> int:
+    """
+    A number that changes whenever a rule of ``url_map`` is added, removed or
+    replaced. Numbers are never reused, across maps either.
+    """
+    rules = list(url_map.iter_rules())
+    ids = list(map(id, rules))
+    state = _map_states.get(url_map)
+    if state is None or state[1] != ids:
+        # The rules are kept alive so their ids can't be reused.
+        state = _map_states[url_map] = (rules, ids, next(_map_versions))
+    return state[2]
+
+
+def _request_cache_key(req_ctx: Any) -> tuple[Any, ...]:
+    """
+    The part of a cache key that depends on the app and the current request.
+    """
+    request = req_ctx.request
+    return (
+        _map_version(req_ctx.app.url_map),
+        request.host,
+        request.script_root,
+        request.scheme,
+        request.blueprint,
+    )
 
 
 class FlaskUrlFor:
@@ -8,17 +69,42 @@ class FlaskUrlFor:
     This will allow the use of Flask's url_for function.
 
     Flask's url_for function will be called when the head is compiled.
+
+    When a whole ``Head`` is compiled, every ``FlaskUrlFor`` in it is
+    resolved together by ``compile_many``.
+
+    URLs that only depend on the endpoint, values and the request's host
+    and script root (``static`` files, for example) can be created with
+    ``_cache=True``. They are then built once per worker and served from a
+    process-wide LRU cache of ``FlaskUrlFor.cache_size`` entries. The cache
+    key includes a version of the app's ``url_map``, so adding, removing or
+    replacing rules invalidates earlier entries. Don't cache URLs that ``url_defaults``
+    callbacks fill in per request. Cached values also provide
+    ``cache_key()``, so a ``Head`` made only of them caches its output.
     """
 
+    __slots__ = (
+        "_anchor",
+        "_cache",
+        "_external",
+        "_method",
+        "_scheme",
+        "endpoint",
+        "values",
+    )
+
     endpoint: str
 
-    _anchor: str | None = None
-    _method: str | None = None
-    _scheme: str | None = None
-    _external: bool | None = None
+    _anchor: str | None
+    _method: str | None
+    _scheme: str | None
+    _external: bool | None
+    _cache: bool
 
     values: dict[str, Any]
 
+    cache_size: int = 1024
+
     def __init__(
         self,
         endpoint: str,
@@ -27,6 +113,7 @@ class FlaskUrlFor:
         _method: str | None = None,
         _scheme: str | None = None,
         _external: bool | None = None,
+        _cache: bool = False,
         **values: Any,
     ) -> None:
         self.endpoint = endpoint
@@ -34,6 +121,7 @@ class FlaskUrlFor:
         self._method = _method
         self._scheme = _scheme
         self._external = _external
+        self._cache = _cache
         self.values = values
 
     def compile(self) -> str:
@@ -45,7 +133,16 @@ class FlaskUrlFor:
                 "Install Flask with 'pip install flask'."
             ) from e
 
-        return url_for(
+        key = None
+        if self._cache:
+            req_ctx = _request_context()
+            if req_ctx is not None:
+                key = self._cache_key(_request_cache_key(req_ctx))
+                cached = self._cache_get(key)
+                if cached is not None:
+                    return cached
+
+        url = url_for(
             self.endpoint,
             _anchor=self._anchor,
             _method=self._method,
@@ -53,3 +150,145 @@ class FlaskUrlFor:
             _external=self._external,
             **self.values,
         )
+
+        if key is not None:
+            self._cache_set(key, url)
+
+        return url
+
+    @classmethod
+    def compile_many(cls, values: list["FlaskUrlFor"]) -> list[str]:
+        """
+        Resolve several ``FlaskUrlFor`` values in one pass.
+
+        Inside a request, the app, the request's bound ``MapAdapter`` and the
+        current blueprint are looked up once, and each URL is built straight
+        from the adapter following the same rules as Flask's url_for. Outside
+        a request, if the app overrides ``url_for`` or if Flask's request
+        context internals are not available, each value falls back to
+        compile(). A value that fails to build also falls back to
+        compile(), so Flask's build error handling applies unchanged.
+        """
+        try:
+            from flask import Flask
+            from werkzeug.routing import BuildError
+        except ImportError as e:
+            raise ImportError(
+                "You are trying to use FlaskUrlFor, but Flask is not installed. "
+                "Install Flask with 'pip install flask'."
+            ) from e
+
+        req_ctx = _request_context()
+        url_adapter = getattr(req_ctx, "url_adapter", None)
+        if url_adapter is None or type(req_ctx.app).url_for is not Flask.url_for:
+            return [value.compile() for value in values]
+
+        app = req_ctx.app
+        blueprint_name = req_ctx.request.blueprint
+        request_key = None
+
+        urls = []
+        for value in values:
+            key = None
+            if value._cache:
+                if request_key is None:
+                    request_key = _request_cache_key(req_ctx)
+                key = value._cache_key(request_key)
+                cached = cls._cache_get(key)
+                if cached is not None:
+                    urls.append(cached)
+                    continue
+
+            endpoint = value.endpoint
+            if endpoint[:1] == ".":
+                if blueprint_name is not None:
+                    endpoint = f"{blueprint_name}{endpoint}"
+                else:
+                    endpoint = endpoint[1:]
+
+            external = value._external
+            if external is None:
+                external = value._scheme is not None
+
+            if value._scheme is not None and not external:
+                raise ValueError("When specifying '_scheme', '_external' must be True.")
+
+            url_values = dict(value.values)
+            app.inject_url_defaults(endpoint, url_values)
+
+            try:
+                url = url_adapter.build(
+                    endpoint,
+                    url_values,
+                    method=value._method,
+                    url_scheme=value._scheme,
+                    force_external=external,
+                )
+            except BuildError:
+                urls.append(value.compile())
+                continue
+
+            if value._anchor is not None:
+                anchor = quote(value._anchor, safe="%!#$&'()*+,/:;=?@")
+                url = f"{url}#{anchor}"
+
+            if key is not None:
+                cls._cache_set(key, url)
+
+            urls.append(url)
+
+        return urls
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """
+        Empty the process-wide URL cache.
+        """
+        _url_cache.clear()
+
+    def cache_key(self) -> Optional[Hashable]:
+        """
+        The key ``Head.compile()`` caches this URL under, or None when the
+        value is not cached or there is no request.
+        """
+        if not self._cache:
+            return None
+
+        req_ctx = _request_context()
+        if req_ctx is None:
+            return None
+
+        return self._cache_key(_request_cache_key(req_ctx))
+
+    def _cache_key(self, request_key: tuple[Any, ...]) -> Optional[Hashable]:
+        """
+        The cache key for this value, or None if its values are unhashable.
+        """
+        try:
+            values = tuple(sorted(self.values.items()))
+            hash(values)
+        except TypeError:
+            return None
+
+        return (
+            request_key,
+            self.endpoint,
+            values,
+            self._anchor,
+            self._method,
+            self._scheme,
+            self._external,
+        )
+
+    @classmethod
+    def _cache_get(cls, key: Optional[Hashable]) -> Optional[str]:
+        if key is None:
+            return None
+
+        url: Optional[str] = _url_cache.get(key)
+        return url
+
+    @classmethod
+    def _cache_set(cls, key: Optional[Hashable], url: str) -> None:
+        if key is not None:
+            _url_cache.set(key, url, cls.cache_size)
@@ -1,4 +1,4 @@
-from typing import Protocol, runtime_checkable
+from typing import Any, Protocol, Union, runtime_checkable
 
 
 @runtime_checkable
@@ -15,6 +15,57 @@ class CompileDelayed(Protocol):
     isinstance to branch should trust the duck-type contract; if you hand
     pyhead an object with a non-callable ``compile`` attribute, rendering
     will fail at compile time, not at dispatch time.
+
+    Implementations whose ``compile()`` blocks on I/O may set a ``blocking``
+    attribute to True, which lets ``Head.compile(threaded=True)`` resolve
+    them concurrently in a thread pool.
+
+    A class may also provide a ``compile_many(values)`` classmethod that
+    takes a list of its instances and returns their string forms in the
+    same order; ``Head.compile()`` then resolves all instances in a head
+    with a single call.
+
+    To let ``Head.compile()`` cache its resolved form (and the whole head
+    output), a value may declare what the result depends on:
+
+    - ``cache_key()`` returns a hashable key that is equal whenever
+      ``compile()`` would return the same string, or None to skip caching
+      for this render.
+    - ``varies_on()`` returns the names of the dependencies the result
+      depends on, such as ``("host", "locale")``, each registered with
+      ``pyhead.register_dependency``. An empty tuple means the result never
+      changes. It is only consulted when there is no ``cache_key()``.
+
+    A value that declares neither is compiled on every render.
     """
 
     def compile(self) -> str: ...
+
+
+@runtime_checkable
+class AsyncCompileDelayed(Protocol):
+    """
+    The asynchronous counterpart of ``CompileDelayed``.
+
+    The final string form is produced by awaiting ``compile_async()``, which
+    lets values that need I/O (signing a CDN URL, asking a metadata service)
+    resolve without blocking the event loop. These values are resolved by
+    ``Head.compile_async()``; a value that only implements ``compile_async``
+    cannot be rendered by the synchronous ``Head.compile()``.
+
+    The same ``@runtime_checkable`` caveat as ``CompileDelayed`` applies.
+    """
+
+    async def compile_async(self) -> str: ...
+
+
+class CompileMany(Protocol):
+    """
+    A class of ``CompileDelayed`` values that provides the optional
+    ``compile_many`` classmethod, resolving a list of its instances at once.
+    """
+
+    def compile_many(self, values: list[Any]) -> list[str]: ...
+
+
+DelayedValue = Union[CompileDelayed, AsyncCompileDelayed]
@@ -0,0 +1,112 @@
+"""
+Serializers turn the tags that elements lower to (see ``BaseElement.tags``
+and ``Head.tags``) into an output format. A serializer is any callable that
+takes an iterable of tags and returns a string; pass one to
+``Head.serialize``:
+
+.. highlight:: python
+.. code-block:: python
+
+    from pyhead.serializers import link_header
+
+    response.headers["Link"] = head.serialize(link_header)
+
+Tags are ``Tag`` records. Items that are plain strings are HTML rendered by
+elements that only implement ``compile()``: the HTML serializers keep them
+as they are, the others leave them out.
+"""
+
+from collections.abc import Iterable
+from json import dumps
+from typing import Any, Union
+
+from markupsafe import Markup
+
+from .._base import Tag, render_tags, resolve
+
+Tags = Iterable[Union[Tag, str]]
+
+
+def html(tags: Tags) -> Markup:
+    """
+    Serialize tags to HTML, one tag per line, as ``Head.compile()`` does.
+    """
+    return Markup(render_tags(tags))
+
+
+def xhtml(tags: Tags) -> Markup:
+    """
+    Serialize tags to XHTML: the same as html(), with void tags closed as
+    ``<meta ... />``.
+    """
+    return Markup(render_tags(tags, " />"))
+
+
+def link_header(tags: Tags) -> str:
+    """
+    Serialize the ``<link>`` tags to the value of an HTTP ``Link`` header,
+    for example ``</main.css>; rel="stylesheet", </app.js>; rel="preload"``.
+
+    Links without an href are left out, as is their id attribute.
+    """
+    links = []
+    for tag in tags:
+        if isinstance(tag, str) or tag.name != "link":
+            continue
+
+        href = None
+        parameters = []
+        for attribute, value in tag.attributes:
+            if value is None or attribute == "id":
+                continue
+            value = _plain(value)
+            if attribute == "href":
+                href = value
+            else:
+                quoted = value.replace("\\", "\\\\").replace('"', '\\"')
+                parameters.append(f'; {attribute}="{quoted}"')
+
+        if href is not None:
+            links.append(f"<{href}>{''.join(parameters)}")
+
+    return ", ".join(links)
+
+
+def json(tags: Tags) -> str:
+    """
+    Serialize tags to a JSON array with one object per tag, for example
+    ``{"tag": "meta", "attributes": {"name": "robots", "content": "index"}}``.
+    Tags with text, such as ``<title>``, also have a ``"text"`` key.
+    """
+    records = []
+    for tag in tags:
+        if isinstance(tag, str):
+            continue
+
+        record: dict[str, Any] = {
+            "tag": tag.name,
+            "attributes": {
+                attribute: _plain(value)
+                for attribute, value in tag.attributes
+                if value is not None
+            },
+        }
+        if tag.text is not None:
+            record["text"] = tag.text
+        records.append(record)
+
+    return dumps(records)
+
+
+def _plain(value: Any) -> str:
+    """
+    The unescaped string form of an attribute value, resolving delayed
+    values.
+    """
+    value = resolve(value)
+    if isinstance(value, Markup):
+        return value.unescape()
+    return str(value)
+
+
+__all__ = ["Tag", "html", "json", "link_header", "xhtml"]
@@ -2,7 +2,7 @@ import pytest
 
 django = pytest.importorskip("django")
 
-from django.conf import settings  # noqa: E402
+from django.conf import settings
 
 
 def _configure_django() -> None:
@@ -36,13 +36,13 @@ def _configure_django() -> None:
 _configure_django()
 
 
-from django.http import HttpResponse  # noqa: E402
-from django.template import Context, Template  # noqa: E402
-from django.urls import path  # noqa: E402
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.urls import path
 
-from pyhead import Head  # noqa: E402
-from pyhead.django import DjangoStatic, DjangoUrlFor  # noqa: E402
-from pyhead.elements import Page, Script, Stylesheet  # noqa: E402
+from pyhead import Head
+from pyhead.django import DjangoStatic, DjangoUrlFor
+from pyhead.elements import Page, Script, Stylesheet
 
 
 def _home(_request):  # pragma: no cover - only registered for reverse() to find
@@ -156,3 +156,251 @@ def test_head_via_str_does_not_get_autoescaped():
     out = _render("{{ head }}", Head([Page(title="Hi")]))
     assert "<title>Hi</title>" in out
     assert "&lt;" not in out
+
+
+# ---------- Streaming ----------
+
+
+def test_head_iter_compile_feeds_streaming_http_response():
+    from django.http import StreamingHttpResponse
+
+    head = Head([Page(title="Hi"), Stylesheet(DjangoStatic("main.css"))])
+    response = StreamingHttpResponse(head.iter_compile())
+    body = b"".join(response.streaming_content).decode()
+
+    assert body == str(head.compile())
+    assert 'href="/static/main.css"' in body
+
+
+# ---------- Reverse cache ----------
+
+
+@pytest.fixture
+def reverse_calls(monkeypatch):
+    import django.urls
+
+    DjangoUrlFor.cache_clear()
+    calls = []
+    original = django.urls.reverse
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(django.urls, "reverse", counting)
+    yield calls
+    DjangoUrlFor.cache_clear()
+
+
+def _alt_urlconf():
+    import types
+
+    module = types.ModuleType("alt_urls")
+    module.urlpatterns = [path("alt/", _home, name="home")]
+    return module
+
+
+def test_django_url_for_reverses_once(reverse_calls):
+    for _ in range(3):
+        assert DjangoUrlFor("article", pk=7).compile() == "/article/7/"
+    assert len(reverse_calls) == 1
+
+
+def test_django_url_for_cache_keys_on_arguments(reverse_calls):
+    assert DjangoUrlFor("article", pk=1).compile() == "/article/1/"
+    assert DjangoUrlFor("article", pk=2).compile() == "/article/2/"
+    assert DjangoUrlFor("article", 3).compile() == "/article/3/"
+    assert len(reverse_calls) == 3
+
+
+def test_django_url_for_cache_follows_set_urlconf(reverse_calls):
+    from django.urls import set_urlconf
+
+    assert DjangoUrlFor("home").compile() == "/"
+    set_urlconf(_alt_urlconf())
+    try:
+        assert DjangoUrlFor("home").compile() == "/alt/"
+    finally:
+        set_urlconf(None)
+    assert DjangoUrlFor("home").compile() == "/"
+    assert len(reverse_calls) == 2
+
+
+def test_django_url_for_cache_cleared_on_setting_changed(reverse_calls):
+    from django.test import override_settings
+
+    DjangoUrlFor("home").compile()
+    with override_settings(DEBUG=True):
+        DjangoUrlFor("home").compile()
+    assert len(reverse_calls) == 2
+
+
+def test_django_url_for_cache_can_be_bypassed(reverse_calls):
+    for _ in range(2):
+        assert DjangoUrlFor("home", _cache=False).compile() == "/"
+    assert len(reverse_calls) == 2
+
+
+# ---------- Static cache ----------
+
+
+@pytest.fixture
+def static_calls(monkeypatch):
+    import django.templatetags.static
+
+    from pyhead.django import _clear_caches
+
+    _clear_caches()
+    calls = []
+    original = django.templatetags.static.static
+
+    def counting(path):
+        calls.append(path)
+        return original(path)
+
+    monkeypatch.setattr(django.templatetags.static, "static", counting)
+    yield calls
+    _clear_caches()
+
+
+def test_django_static_resolves_once_per_storage(static_calls):
+    for _ in range(3):
+        assert DjangoStatic("main.css").compile() == "/static/main.css"
+    assert static_calls == ["main.css"]
+
+
+def test_django_static_cache_cleared_on_setting_changed(static_calls):
+    from django.test import override_settings
+
+    assert DjangoStatic("main.css").compile() == "/static/main.css"
+    with override_settings(STATIC_URL="/assets/"):
+        assert DjangoStatic("main.css").compile() == "/assets/main.css"
+    assert DjangoStatic("main.css").compile() == "/static/main.css"
+
+
+def test_head_output_cache_follows_settings(static_calls):
+    from django.test import override_settings
+
+    head = Head([Stylesheet(DjangoStatic("main.css")), Script(DjangoUrlFor("home"))])
+
+    assert 'href="/static/main.css"' in str(head.compile())
+    assert head.compile() == head.compile()
+    with override_settings(STATIC_URL="/assets/"):
+        assert 'href="/assets/main.css"' in str(head.compile())
+    assert 'href="/static/main.css"' in str(head.compile())
+    assert head.cache_info().outputs.hits == 2
+
+
+def test_register_head_prewarms_static_paths(static_calls):
+    from pyhead.django import register_head
+    from pyhead.elements import Favicon
+
+    head = Head(
+        [
+            Stylesheet(DjangoStatic("main.css")),
+            Favicon(ico_icon_href=DjangoStatic("favicon.ico")),
+        ]
+    )
+    assert register_head(head) is head
+    assert sorted(static_calls) == ["favicon.ico", "main.css"]
+
+    str(head.compile())
+    assert len(static_calls) == 2
+
+
+def test_register_head_before_ready_is_warmed_by_app_config(static_calls, monkeypatch):
+    from django.apps import apps
+
+    from pyhead.django import register_head
+
+    head = Head([Stylesheet(DjangoStatic("late.css"))])
+    monkeypatch.setattr(apps, "ready", False)
+    register_head(head)
+    assert static_calls == []
+
+    monkeypatch.setattr(apps, "ready", True)
+    apps.get_app_config("django").ready()
+    assert static_calls == ["late.css"]
+
+
+def test_django_static_reloads_manifest_when_file_changes(
+    static_calls, tmp_path, monkeypatch
+):
+    import json
+    import os
+
+    from django.test import override_settings
+
+    manifest = tmp_path / "staticfiles.json"
+
+    def write_manifest(hashed: str, mtime: int) -> None:
+        manifest.write_text(
+            json.dumps({"version": "1.1", "paths": {"main.css": hashed}, "hash": ""})
+        )
+        os.utime(manifest, (mtime, mtime))
+
+    write_manifest("main.aaa.css", 1_000_000)
+    monkeypatch.setattr(DjangoStatic, "manifest_check_interval", 0)
+
+    storage = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    with override_settings(
+        STATIC_ROOT=str(tmp_path),
+        STORAGES={"staticfiles": {"BACKEND": storage}},
+    ):
+        assert DjangoStatic("main.css").compile() == "/static/main.aaa.css"
+        assert DjangoStatic("main.css").compile() == "/static/main.aaa.css"
+        assert len(static_calls) == 1
+
+        write_manifest("main.bbb.css", 2_000_000)
+        assert DjangoStatic("main.css").compile() == "/static/main.bbb.css"
+        assert len(static_calls) == 2
+
+
+def test_django_static_keeps_urls_while_manifest_is_half_written(
+    static_calls, tmp_path, monkeypatch
+):
+    import json
+    import os
+
+    from django.test import override_settings
+
+    manifest = tmp_path / "staticfiles.json"
+    content = json.dumps(
+        {"version": "1.1", "paths": {"main.css": "main.aaa.css"}, "hash": ""}
+    )
+    manifest.write_text(content)
+    os.utime(manifest, (1_000_000, 1_000_000))
+    monkeypatch.setattr(DjangoStatic, "manifest_check_interval", 0)
+
+    storage = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    with override_settings(
+        STATIC_ROOT=str(tmp_path),
+        STORAGES={"staticfiles": {"BACKEND": storage}},
+    ):
+        assert DjangoStatic("main.css").compile() == "/static/main.aaa.css"
+
+        manifest.write_text(content[: len(content) // 2])
+        os.utime(manifest, (2_000_000, 2_000_000))
+        assert DjangoStatic("main.css").compile() == "/static/main.aaa.css"
+
+        manifest.write_text(content.replace("aaa", "bbb"))
+        os.utime(manifest, (3_000_000, 3_000_000))
+        assert DjangoStatic("main.css").compile() == "/static/main.bbb.css"
+
+
+def test_django_static_resolves_storage_once(static_calls, monkeypatch):
+    from django.apps import apps
+
+    calls = []
+    original = apps.is_installed
+
+    def counting(app_name):
+        calls.append(app_name)
+        return original(app_name)
+
+    DjangoStatic("main.css").compile()
+    monkeypatch.setattr(apps, "is_installed", counting)
+    for _ in range(3):
+        DjangoStatic("main.css").compile()
+        DjangoStatic("main.css").cache_key()
+    assert calls == []
@@ -1,7 +1,12 @@
+from copy import deepcopy
+
 import pytest
-from markupsafe import Markup
+from markupsafe import Markup, escape
 
+from pyhead import elements
+from pyhead._base import BaseElement, Tag, escape_attribute
 from pyhead.elements import (
+    Alternates,
     ApplicationName,
     Base,
     Charset,
@@ -13,7 +18,9 @@ from pyhead.elements import (
     Google,
     Keywords,
     Link,
+    LinkBatch,
     Meta,
+    MetaBatch,
     OpenGraphWebsite,
     Page,
     Rating,
@@ -180,6 +187,86 @@ def test_link_compile_delayed_href():
     )
 
 
+# ---------- Alternates ----------
+
+
+def test_alternates_matches_links():
+    urls = {"en": "/en/?a=1&b=2", "fr": "/fr/", "x-default": "/"}
+    links = "\n".join(
+        str(Link(rel="alternate", href=href, hreflang=locale))
+        for locale, href in urls.items()
+    )
+    assert str(Alternates(urls)) == links
+
+
+def test_alternates_from_template():
+    out = str(
+        Alternates(template="/{locale}/about", locales=["en", "fr"], x_default="/about")
+    )
+    assert out == (
+        '<link rel="alternate" href="/en/about" hreflang="en">\n'
+        '<link rel="alternate" href="/fr/about" hreflang="fr">\n'
+        '<link rel="alternate" href="/about" hreflang="x-default">'
+    )
+
+
+def test_alternates_compile_delayed_href():
+    alternates = Alternates({"en": _Delayed("/en/"), "fr": "/fr/"})
+    assert not alternates._is_static()
+    assert list(alternates._delayed_values()) == [alternates._hrefs[0]]
+    assert 'href="/en/" hreflang="en"' in str(alternates)
+
+
+def test_alternates_requires_urls_or_template():
+    with pytest.raises(ValueError):
+        Alternates()
+    with pytest.raises(ValueError):
+        Alternates({"en": "/"}, template="/{locale}/")
+    with pytest.raises(ValueError):
+        Alternates(template="/{locale}/")
+
+
+# ---------- MetaBatch / LinkBatch ----------
+
+
+def test_meta_batch_matches_metas():
+    metas = [
+        Meta(name="author", content="A & B"),
+        Meta(property_="og:image:width", content="1200", id_="w"),
+        Meta(http_equiv="refresh", content=_Delayed("30")),
+    ]
+    batch = MetaBatch(
+        name=["author", None, None],
+        property_=[None, "og:image:width", None],
+        http_equiv=[None, None, "refresh"],
+        content=["A & B", "1200", _Delayed("30")],
+        id_=[None, "w", None],
+    )
+    assert str(batch) == "\n".join(str(meta) for meta in metas)
+
+
+def test_link_batch_matches_links_and_repeats_strings():
+    hrefs = ["/a.woff2", "/b.woff2?x=1&y=2"]
+    links = [
+        Link(rel="preload", href=href, type_="font/woff2", crossorigin="anonymous")
+        for href in hrefs
+    ]
+    batch = LinkBatch(
+        rel="preload", href=hrefs, type_="font/woff2", crossorigin="anonymous"
+    )
+    assert str(batch) == "\n".join(str(link) for link in links)
+    assert batch._is_static()
+
+
+def test_batches_validate_columns():
+    with pytest.raises(ValueError, match="same length"):
+        LinkBatch(rel=["icon", "icon"], href=["/a.png"])
+    with pytest.raises(ValueError, match="exactly one"):
+        MetaBatch(name=["a", None], content=["1", "2"])
+    with pytest.raises(ValueError, match="exactly one"):
+        MetaBatch(name=["a"], property_=["b"], content=["1"])
+
+
 # ---------- Script ----------
 
 
@@ -363,6 +450,174 @@ def test_call_returns_markup():
     assert isinstance(Title("x")(), Markup)
 
 
+# ---------- Tags ----------
+
+
+def test_elements_lower_to_tags():
+    assert Meta(name="a", content="b", id_="").tags() == (
+        Tag(
+            "meta",
+            (
+                ("name", "a"),
+                ("http-equiv", None),
+                ("property", None),
+                ("content", "b"),
+                ("id", None),
+            ),
+        ),
+    )
+    assert Title("x & y").tags() == (Tag("title", text="x & y"),)
+
+    card = TwitterCard(title="T")
+    assert [tag.name for tag in card.tags()] == ["meta", "meta"]
+    assert card.compile() == "\n".join(str(tag) for tag in (card._card, card._title))
+
+
+def test_escape_attribute_matches_markupsafe():
+    for value in (
+        "description",
+        "https://example.com/?a=1&b=2",
+        "<script>",
+        'Don\'t "quote"',
+        "",
+        Markup("&amp; kept"),
+        42,
+    ):
+        for _ in range(2):
+            assert escape_attribute(value) == escape(value)
+
+    clean = "https://example.com/app.js"
+    assert escape_attribute(clean) is clean
+
+
+def test_element_with_delayed_value_keeps_its_tags():
+    delayed = _Delayed("/a.css")
+    s = Stylesheet(delayed)
+    str(s)
+    assert s._memo[1] == s.tags()
+    delayed._value = "/b.css"
+    assert 'href="/b.css"' in str(s)
+
+    clone = deepcopy(s)
+    clone._href._value = "/c.css"
+    assert 'href="/c.css"' in str(clone)
+
+
+def test_render_into_appends_compiled_output():
+    delayed = _Delayed("/a.css")
+    for element in (TwitterCard(title="T"), Stylesheet(delayed), Keywords("a")):
+        for _ in range(2):
+            out: list[str] = []
+            element.render_into(out)
+            assert "".join(out) == str(element)
+
+
+def test_compile_only_subclass_lowers_to_its_html():
+    class _Custom(BaseElement):
+        __slots__ = ()
+
+        def compile(self) -> str:
+            return "<!-- custom -->"
+
+    assert _Custom().tags() == ("<!-- custom -->",)
+
+    with pytest.raises(NotImplementedError):
+        BaseElement().tags()
+
+
+# ---------- Slots ----------
+
+
+def test_elements_have_no_instance_dict():
+    for element in (
+        Meta(name="a", content="b"),
+        Link(rel="canonical", href="/"),
+        Favicon(ico_icon_href="/favicon.ico"),
+        TwitterCard(title="T"),
+    ):
+        assert not hasattr(element, "__dict__")
+        with pytest.raises(AttributeError):
+            element.unknown = 1
+
+
+def test_unslotted_subclass_still_memoizes_and_copies():
+    class _Custom(BaseElement):
+        def __init__(self, meta: Meta) -> None:
+            self.meta = meta
+
+        def compile(self) -> str:
+            return f"<!-- -->{self.meta}"
+
+    custom = _Custom(Meta(name="a", content="b"))
+    assert custom._is_static()
+    assert str(custom) == '<!-- --><meta name="a" content="b">'
+
+    clone = deepcopy(custom)
+    assert clone.meta is not custom.meta
+    assert str(clone) == str(custom)
+
+
+# ---------- Value semantics ----------
+
+
+def test_elements_compare_and_hash_by_value():
+    assert Meta(name="a", content="b") == Meta(name="a", content="b")
+    assert hash(Meta(name="a", content="b")) == hash(Meta(name="a", content="b"))
+    assert Meta(name="a", content="b") != Meta(name="a", content="c")
+    assert Description("a") != Subject("a")
+    assert TwitterCard(title="T") == TwitterCard(title="T")
+    assert TwitterCard(title="T") != TwitterCard(title="U")
+    assert len({Charset(), Charset(), Charset("latin-1")}) == 2
+
+
+def test_every_element_class_is_hashable():
+    instances = [
+        Alternates({"en": "/en", "fr": "/fr"}, x_default="/"),
+        ApplicationName("App"),
+        Base("/"),
+        Charset(),
+        ContentSecurityPolicy(),
+        Description("a"),
+        Favicon(ico_icon_href="/favicon.ico"),
+        FormatDetection(telephone=False),
+        GeoPosition(icbm="1, 2"),
+        Google(googlebot="index"),
+        Keywords("a, b"),
+        Link(rel="canonical", href="/"),
+        LinkBatch(rel="preload", href=["/a.css", "/b.css"]),
+        Meta(name="a", content="b"),
+        MetaBatch(name=["a", "b"], content=["1", "2"]),
+        OpenGraphWebsite(title="T", url="/"),
+        Rating("general"),
+        ReferrerPolicy("no-referrer"),
+        Robots("index"),
+        Script("/a.js", defer=True),
+        Stylesheet("/a.css"),
+        Subject("a"),
+        ThemeColor("#fff"),
+        Title("T"),
+        TwitterCard(title="T"),
+        Verification(google="g"),
+        Viewport(),
+    ]
+    element_classes = {
+        cls
+        for cls in vars(elements).values()
+        if isinstance(cls, type) and issubclass(cls, BaseElement)
+    }
+    assert {type(element) for element in instances} == element_classes
+
+    for element in instances:
+        assert hash(element) == hash(deepcopy(element))
+    assert len(set(instances)) == len(instances)
+
+
+def test_delayed_values_compare_by_identity():
+    delayed = _Delayed("/a")
+    assert Link(rel="icon", href=delayed) == Link(rel="icon", href=delayed)
+    assert Link(rel="icon", href=delayed) != Link(rel="icon", href=_Delayed("/a"))
+
+
 # ---------- Viewport ----------
 
 
@@ -569,3 +824,86 @@ def test_page_accepts_rating_instance():
     page = Page(title="Hi", rating=r)
     assert page.e["rating"] is r
     assert 'content="General"' in str(page.e["rating"])
+
+
+# ---------- Compiled output memoization ----------
+
+
+def test_static_element_output_is_memoized():
+    m = Meta(name="foo", content="bar")
+    s = str(m)
+    assert str(m) is s
+
+
+def test_memoized_element_recompiles_after_mutation():
+    m = Meta(name="foo", content="bar")
+    assert str(m) == '<meta name="foo" content="bar">'
+    m._content = "baz"
+    assert str(m) == '<meta name="foo" content="baz">'
+
+
+def test_composite_recompiles_after_nested_mutation():
+    g = GeoPosition(icbm="1, 2")
+    assert 'content="1, 2"' in str(g)
+    g._icbm._content = "3, 4"
+    assert 'content="3, 4"' in str(g)
+
+
+def test_change_during_render_is_not_memoized():
+    class _Custom(BaseElement):
+        __slots__ = ("value",)
+
+        def __init__(self, value: str) -> None:
+            self.value = value
+
+        def compile(self) -> str:
+            output = f"<!-- {self.value} -->"
+            # Changed by another thread once the value has been read.
+            self.value = "after"
+            return output
+
+    custom = _Custom("before")
+    assert str(custom) == "<!-- before -->"
+    assert custom._memo is None
+    assert str(custom) == "<!-- after -->"
+
+
+def test_composite_without_nested_elements_is_memoized():
+    r = Robots("index, follow")
+    s = str(r)
+    assert str(r) is s
+    r._content = "noindex"
+    assert str(r) == '<meta name="robots" content="noindex">'
+
+
+def test_delayed_element_is_not_memoized():
+    delayed = _Delayed("/a.css")
+    s = Stylesheet(delayed)
+    assert 'href="/a.css"' in str(s)
+    delayed._value = "/b.css"
+    assert 'href="/b.css"' in str(s)
+
+
+def test_element_with_list_attribute_is_not_memoized():
+    class _Custom(BaseElement):
+        __slots__ = ("values",)
+
+        def __init__(self, values: list[str]) -> None:
+            self.values = values
+
+        def compile(self) -> str:
+            return f"<!-- {', '.join(self.values)} -->"
+
+    custom = _Custom(["a"])
+    assert str(custom) == "<!-- a -->"
+    custom.values.append("b")
+    assert str(custom) == "<!-- a, b -->"
+
+
+def test_keywords_are_memoized():
+    k = Keywords(from_list=["a"])
+    s = str(k)
+    assert str(k) is s
+    k._keywords = (*k._keywords, "b")
+    assert 'content="a, b"' in str(k)
+    assert hash(k) == hash(Keywords(from_list=["a", "b"]))
@@ -2,10 +2,11 @@ import pytest
 
 flask = pytest.importorskip("flask")
 
-from flask import Flask  # noqa: E402
+from flask import Flask
 
-from pyhead.elements import Script, Stylesheet  # noqa: E402
-from pyhead.flask import FlaskUrlFor  # noqa: E402
+from pyhead import Head
+from pyhead.elements import Script, Stylesheet
+from pyhead.flask import FlaskUrlFor
 
 
 @pytest.fixture
@@ -88,7 +89,6 @@ def test_script_uses_flask_url_for_at_compile_time(app):
 
 
 def test_head_renders_inside_flask_route(app):
-    from pyhead import Head
     from pyhead.elements import Page
 
     head = Head(
@@ -107,3 +107,292 @@ def test_head_renders_inside_flask_route(app):
 
     assert "<title>Hi</title>" in body
     assert 'href="/static/main.css"' in body
+
+
+def test_head_iter_compile_streams_inside_flask_route(app):
+    from flask import Response, stream_with_context
+
+    from pyhead.elements import Page
+
+    head = Head(
+        [
+            Page(title="Hi"),
+            Stylesheet(FlaskUrlFor("static", filename="main.css")),
+        ]
+    )
+
+    @app.route("/stream")
+    def stream():
+        return Response(stream_with_context(head.iter_compile()))
+
+    body = app.test_client().get("/stream").get_data(as_text=True)
+
+    assert "<title>Hi</title>" in body
+    assert 'href="/static/main.css"' in body
+
+
+def test_threaded_compile_sees_flask_request_context(app):
+    from flask import url_for
+
+    class _BlockingUrlFor:
+        blocking = True
+
+        def __init__(self, filename: str) -> None:
+            self.filename = filename
+
+        def compile(self) -> str:
+            return url_for("static", filename=self.filename)
+
+    head = Head(
+        [Stylesheet(_BlockingUrlFor("a.css")), Stylesheet(_BlockingUrlFor("b.css"))]
+    )
+
+    with app.test_request_context():
+        out = str(head.compile(threaded=True))
+
+    assert 'href="/static/a.css"' in out
+    assert 'href="/static/b.css"' in out
+
+
+# ---------- Batched resolution ----------
+
+
+def _batch_values():
+    return [
+        FlaskUrlFor("static", filename="main.css"),
+        FlaskUrlFor("home"),
+        FlaskUrlFor("article", pk=42),
+        FlaskUrlFor("home", _anchor="a section"),
+        FlaskUrlFor("home", _external=True, _scheme="https"),
+        FlaskUrlFor("home", q="x y"),
+    ]
+
+
+def test_compile_many_matches_compile(app):
+    with app.test_request_context():
+        values = _batch_values()
+        assert FlaskUrlFor.compile_many(values) == [v.compile() for v in values]
+
+
+def test_compile_many_resolves_blueprint_relative_endpoints(app):
+    from flask import Blueprint
+
+    bp = Blueprint("shop", __name__)
+
+    @bp.route("/shop/", endpoint="index")
+    def index():
+        return "ok"
+
+    app.register_blueprint(bp)
+
+    with app.test_request_context("/shop/"):
+        values = [FlaskUrlFor(".index"), FlaskUrlFor("home")]
+        assert FlaskUrlFor.compile_many(values) == ["/shop/", "/"]
+
+
+def test_compile_many_applies_url_defaults(app):
+    @app.url_defaults
+    def add_lang(endpoint, values):
+        if endpoint == "home":
+            values.setdefault("lang", "en")
+
+    with app.test_request_context():
+        values = [FlaskUrlFor("home")]
+        assert FlaskUrlFor.compile_many(values) == ["/?lang=en"]
+
+
+def test_compile_many_falls_back_to_build_error_handler(app):
+    def handler(error, endpoint, values):
+        return "/missing"
+
+    app.url_build_error_handlers.append(handler)
+
+    with app.test_request_context():
+        assert FlaskUrlFor.compile_many([FlaskUrlFor("nope")]) == ["/missing"]
+
+
+def test_compile_many_outside_request_uses_url_for(app):
+    app.config["SERVER_NAME"] = "example.com"
+    with app.app_context():
+        values = [FlaskUrlFor("home")]
+        assert FlaskUrlFor.compile_many(values) == ["http://example.com/"]
+
+
+def test_compile_many_without_private_request_context_uses_url_for(app, monkeypatch):
+    import flask.globals
+
+    monkeypatch.delattr(flask.globals, "_cv_request")
+    cached = FlaskUrlFor("static", filename="main.css", _cache=True)
+
+    with app.test_request_context():
+        values = [*_batch_values(), cached]
+        assert FlaskUrlFor.compile_many(values) == [value.compile() for value in values]
+        assert cached.cache_key() is None
+
+
+def test_head_compile_resolves_flask_url_for_in_one_batch(app, monkeypatch):
+    from pyhead.elements import Favicon, Page
+
+    calls = []
+    original = FlaskUrlFor.compile_many.__func__
+
+    def counting(cls, values):
+        calls.append(len(values))
+        return original(cls, values)
+
+    monkeypatch.setattr(FlaskUrlFor, "compile_many", classmethod(counting))
+
+    head = Head(
+        [
+            Page(title="Hi"),
+            Stylesheet(FlaskUrlFor("static", filename="main.css")),
+            Script(FlaskUrlFor("static", filename="example.js")),
+            Favicon(
+                ico_icon_href=FlaskUrlFor("static", filename="favicon.ico"),
+                png_icon_16_href=FlaskUrlFor("static", filename="favicon-16x16.png"),
+            ),
+        ]
+    )
+
+    with app.test_request_context():
+        out = str(head.compile())
+
+    assert calls == [4]
+    assert 'href="/static/main.css"' in out
+    assert 'src="/static/example.js"' in out
+    assert 'href="/static/favicon-16x16.png"' in out
+
+
+# ---------- Cross-request URL cache ----------
+
+
+@pytest.fixture
+def url_cache():
+    FlaskUrlFor.cache_clear()
+    yield
+    FlaskUrlFor.cache_clear()
+
+
+def test_cached_url_is_built_once_across_requests(app, url_cache, monkeypatch):
+    calls = []
+    original = flask.url_for
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(flask, "url_for", counting)
+
+    u = FlaskUrlFor("static", filename="main.css", _cache=True)
+    for _ in range(3):
+        with app.test_request_context():
+            assert u.compile() == "/static/main.css"
+
+    assert len(calls) == 1
+
+
+def test_cached_url_shared_between_compile_and_compile_many(app, url_cache):
+    from pyhead.flask import _url_cache
+
+    with app.test_request_context():
+        FlaskUrlFor("article", pk=1, _cache=True).compile()
+
+    (key,) = _url_cache.keys()
+    _url_cache.set(key, "/sentinel/")
+
+    with app.test_request_context():
+        values = [FlaskUrlFor("article", pk=1, _cache=True)]
+        assert FlaskUrlFor.compile_many(values) == ["/sentinel/"]
+
+
+def test_cached_url_varies_on_host_and_script_root(app, url_cache):
+    u = FlaskUrlFor("home", _external=True, _cache=True)
+
+    with app.test_request_context(base_url="http://a.example"):
+        assert u.compile() == "http://a.example/"
+    with app.test_request_context(base_url="http://b.example"):
+        assert u.compile() == "http://b.example/"
+    with app.test_request_context(base_url="http://a.example/root"):
+        assert FlaskUrlFor.compile_many([u]) == ["http://a.example/root/"]
+
+
+def test_cached_url_invalidated_when_url_map_changes(app, url_cache):
+    app.url_build_error_handlers.append(lambda error, endpoint, values: "/missing")
+    u = FlaskUrlFor("about", _cache=True)
+
+    with app.test_request_context():
+        assert u.compile() == "/missing"
+
+    app.add_url_rule("/about/", endpoint="about")
+
+    with app.test_request_context():
+        assert u.compile() == "/about/"
+
+
+def test_cached_url_invalidated_when_a_rule_is_replaced(app, url_cache):
+    from werkzeug.routing import Rule
+
+    app.add_url_rule("/about/", endpoint="about")
+    u = FlaskUrlFor("about", _cache=True)
+
+    with app.test_request_context():
+        assert u.compile() == "/about/"
+
+    # Swap the rule in place, so the map keeps the same number of rules.
+    url_map = app.url_map
+    old = next(iter(url_map.iter_rules("about")))
+    new = Rule("/about-us/", endpoint="about")
+    new.bind(url_map)
+    url_map._rules[url_map._rules.index(old)] = new
+    url_map._rules_by_endpoint["about"] = [new]
+    url_map._remap = True
+
+    with app.test_request_context():
+        assert u.compile() == "/about-us/"
+        assert FlaskUrlFor.compile_many([u]) == ["/about-us/"]
+
+
+def test_url_cache_evicts_least_recently_used(app, url_cache, monkeypatch):
+    from pyhead.flask import _url_cache
+
+    monkeypatch.setattr(FlaskUrlFor, "cache_size", 2)
+
+    with app.test_request_context():
+        for name in ("a.css", "b.css", "a.css", "c.css"):
+            FlaskUrlFor("static", filename=name, _cache=True).compile()
+
+    keys = _url_cache.keys()
+    cached = {key[2] for key in keys}
+    assert cached == {(("filename", "a.css"),), (("filename", "c.css"),)}
+
+
+def test_uncached_url_is_not_stored(app, url_cache):
+    from pyhead.flask import _url_cache
+
+    with app.test_request_context():
+        FlaskUrlFor("static", filename="main.css").compile()
+        FlaskUrlFor.compile_many([FlaskUrlFor("home")])
+
+    assert len(_url_cache) == 0
+
+
+def test_cached_url_with_unhashable_values_is_built_every_time(app, url_cache):
+    from pyhead.flask import _url_cache
+
+    with app.test_request_context():
+        assert FlaskUrlFor("home", q=["a"], _cache=True).compile() == "/?q=a"
+
+    assert len(_url_cache) == 0
+
+
+def test_head_output_cached_across_requests(app, url_cache):
+    head = Head([Stylesheet(FlaskUrlFor("static", filename="main.css", _cache=True))])
+
+    for _ in range(2):
+        with app.test_request_context():
+            assert 'href="/static/main.css"' in str(head.compile())
+    with app.test_request_context(base_url="http://a.example/root"):
+        assert 'href="/root/static/main.css"' in str(head.compile())
+
+    info = head.cache_info().outputs
+    assert (info.hits, info.misses) == (1, 2)
@@ -1,9 +1,49 @@
+import asyncio
+import contextvars
+import gc
+import io
+import json
+import pickle
+import threading
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from copy import deepcopy
+from typing import ClassVar
+
 import pytest
 from markupsafe import Markup
 
-from pyhead import Head, HeadClass
-from pyhead.elements import Description, Page, Script, Stylesheet, Title
-
+from pyhead import (
+    Head,
+    HeadClass,
+    HeadElement,
+    HeadTemplate,
+    Slot,
+    intern,
+    register_dependency,
+    render_many,
+    serializers,
+)
+from pyhead._base import BaseElement
+from pyhead.elements import (
+    Alternates,
+    Base,
+    Charset,
+    Description,
+    Favicon,
+    GeoPosition,
+    Keywords,
+    Link,
+    LinkBatch,
+    Meta,
+    MetaBatch,
+    OpenGraphWebsite,
+    Page,
+    Script,
+    SocialMediaCard,
+    Stylesheet,
+    Title,
+)
 
 # ---------- Head basic wiring ----------
 
@@ -79,7 +119,7 @@ def test_extend_updates_tracked_elements_for_copy():
     assert "<title>Orig</title>" in out
 
 
-# ---------- copy is deep ----------
+# ---------- copy is copy-on-write ----------
 
 
 def test_copy_is_deep():
@@ -90,6 +130,74 @@ def test_copy_is_deep():
     assert "mutated" not in str(h2.compile())
 
 
+def test_copy_does_not_see_later_changes_to_original():
+    h1 = Head([Description("orig"), Script("/a.js")])
+    h2 = h1.copy()
+    h2.e["description"]._description = "on copy"
+    for element in h1.e.values():
+        if isinstance(element, Description):
+            element._description = "on original"
+
+    assert "on copy" in str(h2.compile())
+    assert "on original" in str(h1.compile())
+
+
+def test_copy_shares_elements_until_read():
+    h1 = Head([Description("orig")])
+    h2, h3 = h1.copy(), h1.copy()
+    assert h2.e.peek("description") is h3.e.peek("description")
+    assert h2.e.peek("description") is not h1.e.peek("description")
+    assert h2.copy().e.peek("description") is h2.e.peek("description")
+
+    h2.e["description"]
+    assert h2.e.peek("description") is not h3.e.peek("description")
+
+
+def test_copy_ignores_elements_changed_outside_e():
+    title = Title("orig")
+    card = OpenGraphWebsite(title="Card")
+    h1 = Head([title, card])
+    str(h1)
+    h2 = h1.copy()
+
+    title.title_ = "changed"
+    card._title._content = "Changed card"
+    assert "<title>changed</title>" in str(h1.compile())
+    assert 'content="Changed card"' in str(h1.compile())
+    assert "<title>orig</title>" in str(h2.compile())
+    assert 'content="Card"' in str(h2.compile())
+
+    h3 = h1.copy()
+    assert "<title>changed</title>" in str(h3.compile())
+    assert "<title>orig</title>" in str(h2.compile())
+
+
+def test_copy_ignores_elements_read_through_e_before():
+    h1 = Head([Page(title="orig")])
+    title = h1.e["title"]
+    h2 = h1.copy()
+
+    title.title_ = "changed"
+    assert "<title>changed</title>" in str(h1.compile())
+    assert "<title>orig</title>" in str(h2.compile())
+
+
+def test_copy_reuses_compiled_plan():
+    h1 = Head([Page(title="T"), Script("/a.js")])
+    out = h1.compile()
+    h2 = h1.copy()
+    assert h2._plans == h1._plans
+    assert h2.compile() == out
+
+
+def test_copy_extend_copies_passed_elements():
+    description = Description("orig")
+    h1 = Head([Page(title="T")])
+    h2 = h1.copy_extend([description])
+    description._description = "mutated"
+    assert "orig" in str(h2.compile())
+
+
 def test_copy_and_extend_does_not_mutate_original():
     h1 = Head([Page(title="Original")])
     h2 = h1.copy().extend([Description("Only on h2")])
@@ -97,6 +205,40 @@ def test_copy_and_extend_does_not_mutate_original():
     assert "Only on h2" in str(h2.compile())
 
 
+def test_copy_extend_does_not_grow_source_head():
+    h1 = Head([Page(title="T")])
+    before = dict(vars(h1))
+    h1.copy_extend([Description("x")])
+    assert vars(h1).keys() == before.keys()
+    assert list(h1.e) == ["charset", "title", "viewport"]
+
+
+@pytest.mark.slow
+def test_derived_heads_do_not_leak():
+    head = Head([Page(title="T", description="D"), Stylesheet("/a.css")])
+    str(head.compile())
+
+    def derive() -> None:
+        head.copy_extend([Script("/page.js")])
+
+    for _ in range(1_000):
+        derive()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(100_000):
+            derive()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A leak of a single pointer per derived head would retain 800 KB.
+    assert retained - baseline < 64 * 1024
+
+
 # ---------- Page replaces earlier Page fields ----------
 
 
@@ -124,13 +266,74 @@ def test_headclass_subclass_without_elements_raises():
 
 def test_headclass_subclass_returns_head_instance():
     class _MyHead(HeadClass):
-        elements = [Title("Sub")]
+        elements: ClassVar[list[HeadElement]] = [Title("Sub")]
 
     instance = _MyHead()
     assert isinstance(instance, Head)
     assert "<title>Sub</title>" in str(instance.compile())
 
 
+def test_headclass_builds_head_once_and_hands_out_copies(monkeypatch):
+    class _SiteHead(HeadClass):
+        elements: ClassVar[list[HeadElement]] = [
+            Page(title="Site"),
+            Stylesheet("/main.css"),
+        ]
+
+    first = _SiteHead()
+    loops = []
+    monkeypatch.setattr(
+        Head, "_loop_elements", lambda self, elements_: loops.append(elements_)
+    )
+    second = _SiteHead()
+    assert loops == []
+    assert first is not second
+    assert second.e.peek("title") is first.e.peek("title")
+
+    second.e["title"].title_ = "Changed"
+    assert "<title>Site</title>" in str(_SiteHead())
+
+
+def test_headclass_subclass_extends_parent_elements():
+    class _SiteHead(HeadClass):
+        elements: ClassVar[list[HeadElement]] = [
+            Page(title="Site"),
+            Stylesheet("/main.css"),
+        ]
+
+    class _BlogHead(_SiteHead):
+        elements: ClassVar[list[HeadElement]] = [Page(title="Blog"), Script("/blog.js")]
+
+    class _PostHead(_BlogHead):
+        pass
+
+    blog = str(_BlogHead())
+    assert "<title>Blog</title>" in blog
+    assert "/main.css" in blog and "/blog.js" in blog
+    assert "/blog.js" not in str(_SiteHead())
+    assert str(_PostHead()) == blog
+    assert _PostHead._head() is _BlogHead._head()
+
+    _SiteHead.elements = [Page(title="Site"), Stylesheet("/new.css")]
+    assert "/new.css" in str(_BlogHead())
+
+
+def test_headclass_sees_elements_changed_in_place():
+    class _SiteHead(HeadClass):
+        elements: ClassVar[list[HeadElement]] = [Page(title="Site")]
+
+    class _BlogHead(_SiteHead):
+        elements: ClassVar[list[HeadElement]] = [Script("/blog.js")]
+
+    assert "/main.css" not in str(_BlogHead())
+
+    _SiteHead.elements.append(Stylesheet("/main.css"))
+    _BlogHead.elements[0] = Script("/new.js")
+    out = str(_BlogHead())
+    assert "/main.css" in out
+    assert "/new.js" in out and "/blog.js" not in out
+
+
 # ---------- Keyed vs index-fallback keying ----------
 
 
@@ -141,6 +344,1117 @@ def test_explicit_id_wins_over_fallback():
     assert "1" not in h.e
 
 
+def test_fallback_keys_skip_taken_keys_without_reuse():
+    h = Head([Script("a.js"), Script("b.js"), Script("c.js")])
+    del h.e["0"]
+    h.e["3"] = Script("user.js")
+    h.extend([Script("d.js"), Script("e.js")])
+    assert list(h.e) == ["1", "2", "3", "4", "5"]
+
+
 def test_stylesheet_id_is_rendered():
     out = str(Stylesheet("/s.css", id_="main"))
     assert 'id="main"' in out
+
+
+def test_lookup_by_type_and_attributes():
+    h = Head(
+        [
+            Link(rel="canonical", href="/"),
+            Meta(name="author", content="A"),
+            Meta(property_="og:image", content="/a.png"),
+            Link(rel="alternate", href="/fr", hreflang="fr"),
+            Link(rel="alternate", href="/de", hreflang="de"),
+        ]
+    )
+    assert h.e.lookup("rel", "alternate") == ["3", "4"]
+    assert h.e.lookup("name", "author") == ["1"]
+    assert h.e.lookup("property", "og:image") == ["2"]
+    assert h.e.lookup("type", Link) == ["0", "3", "4"]
+    assert h.e.lookup("rel", "missing") == []
+
+
+def test_lookup_follows_changes():
+    h = Head([Link(rel="alternate", href="/fr"), Link(rel="alternate", href="/de")])
+    assert h.e.lookup("rel", "alternate") == ["0", "1"]
+
+    h.e["0"] = Link(rel="alternate", href="/es")
+    h.e["1"] = Link(rel="canonical", href="/")
+    h.extend([Link(rel="alternate", href="/it")])
+    del h.e["0"]
+    h.extend([Link(rel="alternate", href="/pt")])
+
+    assert h.e.lookup("rel", "alternate") == ["2", "3"]
+    assert h.e.lookup("rel", "canonical") == ["1"]
+
+
+def test_copies_share_indexes_until_changed():
+    site = Head([Link(rel="alternate", href="/fr"), Link(rel="canonical", href="/")])
+    site.e.lookup("rel", "alternate")
+
+    page = site.copy()
+    assert page.e._indexes is site.e._indexes
+
+    page.extend([Link(rel="alternate", href="/de")])
+    del page.e["1"]
+    site.e["0"] = Link(rel="next", href="/2")
+
+    assert page.e.lookup("rel", "alternate") == ["0", "2"]
+    assert page.e.lookup("rel", "canonical") == []
+    assert site.e.lookup("rel", "alternate") == []
+    assert site.e.lookup("rel", "canonical") == ["1"]
+    assert site.e.lookup("rel", "next") == ["0"]
+
+
+def test_copies_build_indexes_on_unchanged_original():
+    site = Head([Link(rel="alternate", href="/fr"), Link(rel="canonical", href="/")])
+
+    assert site.copy().find(rel="canonical") is not None
+    assert site.e._indexes is not None
+    assert site.copy().e._indexes is site.e._indexes
+
+    page = site.copy().extend([Link(rel="alternate", href="/de")])
+    assert page.e.lookup("rel", "alternate") == ["0", "2"]
+    assert page.e._indexes is not site.e._indexes
+
+
+# ---------- MetaBatch / LinkBatch ----------
+
+
+def test_batches_are_head_elements():
+    h = Head(
+        [
+            MetaBatch(name=["author", "generator"], content=["A", "pyhead"]),
+            LinkBatch(rel="alternate", href=["/fr", "/de"], hreflang=["fr", "de"]),
+        ]
+    )
+    assert list(h.e) == ["0", "1"]
+    assert h.find(MetaBatch) is h.e["0"]
+    assert str(h) == _uncached(h)
+    assert str(h).count("<link") == 2
+
+
+# ---------- intern ----------
+
+
+def test_intern_returns_canonical_elements():
+    charset = intern(Charset())
+    assert intern(Charset()) is charset
+    assert intern(Charset("latin-1")) is not charset
+
+    first = intern(OpenGraphWebsite(title="A"))
+    second = intern(OpenGraphWebsite(title="B"))
+    assert first is not second
+    assert first._type is second._type
+    assert first._locale is second._locale
+
+    class _Unhashable(BaseElement):
+        __slots__ = ("values",)
+
+        def __init__(self, values: list[str]) -> None:
+            self.values = values
+
+    unhashable = _Unhashable(["a"])
+    assert intern(unhashable) is unhashable
+
+
+def test_intern_keeps_a_private_copy():
+    charset = Charset("koi8-r")
+    canonical = intern(charset)
+    assert canonical is not charset
+    assert canonical == charset
+
+    charset._charset = "changed"
+    assert intern(Charset("koi8-r")) is canonical
+    assert 'charset="koi8-r"' in str(canonical)
+
+
+class _InternedHead(Head):
+    intern_elements = True
+
+
+def test_interned_heads_share_elements_until_changed():
+    h1 = _InternedHead([Page(title="One"), Stylesheet("/main.css")])
+    h2 = _InternedHead([Page(title="Two"), Stylesheet("/main.css")])
+    assert h1.e.peek("charset") is h2.e.peek("charset")
+    assert h1.e.peek("0") is h2.e.peek("0")
+
+    out = str(h2)
+    h1.e["charset"]._charset = "latin-1"
+    assert 'charset="latin-1"' in str(h1)
+    assert str(h2) == out
+    assert h1.copy().intern_elements
+
+
+# ---------- find / replace ----------
+
+
+def _query_head() -> Head:
+    return Head(
+        [
+            Link(rel="canonical", href="/"),
+            Link(rel="alternate", href="/fr", hreflang="fr"),
+            Script("app.js", id_="app"),
+            SocialMediaCard(title="T", image="/og.png"),
+            Link(rel="alternate", href="/de", hreflang="de"),
+        ]
+    )
+
+
+def test_find_and_find_all():
+    h = _query_head()
+    assert h.find(rel="canonical")._href == "/"
+    assert [link._hreflang for link in h.find_all(Link, rel="alternate")] == [
+        "fr",
+        "de",
+    ]
+    assert h.find(id_="app") is h.e["app"]
+    assert h.find(Meta, property_="og:image")._content == "/og.png"
+    assert h.find(Script, rel="canonical") is None
+    with pytest.raises(TypeError):
+        h.find_all()
+
+
+def test_replace_and_remove():
+    h = _query_head()
+    h.replace(h.find(rel="canonical"), Link(rel="canonical", href="/new"))
+    h.replace(
+        h.find(property_="og:image"), Meta(property_="og:image", content="/b.png")
+    )
+    h.remove(h.find_all(rel="alternate")[0])
+    h.replace(h.find(id_="app"), Script("other.js", id_="other"))
+
+    out = str(h)
+    assert 'href="/new"' in out and 'href="/"' not in out
+    assert 'property="og:image" content="/b.png"' in out
+    assert 'property="og:image" content="/og.png"' not in out
+    assert "/fr" not in out and "/de" in out
+    assert "other.js" in out and "app" not in h.e
+    assert str(h) == _uncached(h)
+
+    h.remove(h.find(property_="og:image"))
+    assert 'property="og:image"' not in str(h)
+    with pytest.raises(ValueError):
+        h.remove(Link(rel="canonical", href="/new"))
+
+
+def test_replace_keeps_the_position_of_a_keyed_element():
+    h = _query_head()
+    keys = list(h.e)
+    h.replace(h.find(id_="app"), Script("other.js", id_="other"))
+    assert list(h.e) == [key if key != "app" else "other" for key in keys]
+    assert str(h) == _uncached(h)
+
+    page = h.copy()
+    page.replace(page.find(id_="other"), Script("page.js", id_="page"))
+    page.find(property_="og:title")._content = "Changed"
+    assert "Changed" not in str(h) and "Changed" in str(page)
+    assert str(page).index("page.js") < str(page).index("og:title")
+
+    layer = h.layer([])
+    layer.replace(layer.find(id_="other"), Script("layer.js", id_="layer"))
+    assert str(layer) == _uncached(layer)
+    assert str(layer).index("layer.js") < str(layer).index("og:title")
+
+
+def test_replace_raises_when_the_new_key_is_taken():
+    h = Head([Script("a.js", id_="a"), Script("b.js", id_="b")])
+    before = str(h)
+    with pytest.raises(ValueError):
+        h.replace(h.find(id_="a"), Script("c.js", id_="b"))
+    assert str(h) == before and h.e["b"]._src == "b.js"
+
+
+def test_replace_and_remove_update_the_title():
+    h = Head([Title("Old"), Description("Text")])
+    h.replace(h.find(Title), Title("New"))
+    assert h.render_title_tag == "New"
+
+    h.remove(h.find(Title))
+    assert h.render_title_tag is None
+    assert "<title>" not in str(h)
+
+    h.extend([Title("Again")])
+    h.replace(h.find(Title), Meta(name="author", content="Me"))
+    assert h.render_title_tag is None and "title" not in h.e
+    assert 'name="author"' in h.compile(render_title_tag=False)
+
+
+def test_replace_leaves_shared_heads_alone():
+    site = _query_head()
+    before = str(site)
+    page = site.copy()
+    page.replace(
+        page.find(property_="og:image"), Meta(property_="og:image", content="/p.png")
+    )
+    page.find(property_="og:title")._content = "Changed"
+
+    assert str(site) == before
+    assert 'content="/p.png"' in str(page) and "Changed" in str(page)
+
+
+def test_replace_only_compiles_the_replaced_element(monkeypatch):
+    h = _query_head()
+    str(h)
+
+    compiled = []
+    compile_link = Link.compile
+    monkeypatch.setattr(
+        Link, "compile", lambda self: compiled.append(self) or compile_link(self)
+    )
+    new = Link(rel="canonical", href="/new")
+    h.replace(h.find(rel="canonical"), new)
+    str(h)
+    assert compiled == [new]
+
+
+# ---------- Static/dynamic compile plan ----------
+
+
+class _Counting:
+    """CompileDelayed stand-in that records how often it is resolved."""
+
+    def __init__(self, value: str) -> None:
+        self.value = value
+        self.calls = 0
+
+    def compile(self) -> str:
+        self.calls += 1
+        return self.value
+
+
+def _uncached(head: Head, **kwargs) -> str:
+    render = ["<head>" if kwargs.get("render_head_tag", True) else ""]
+    for key, element in head.e.items():
+        if key == "title" and not kwargs.get("render_title_tag", True):
+            continue
+        render.append(str(element))
+    if kwargs.get("render_head_tag", True):
+        render.append("</head>")
+    return "\n".join(render)
+
+
+@pytest.mark.parametrize("render_head_tag", [True, False])
+@pytest.mark.parametrize("render_title_tag", [True, False])
+@pytest.mark.parametrize(
+    "elements",
+    [
+        lambda: [
+            Page(title="T", description="D", keywords="a, b"),
+            Stylesheet(_Counting("/a.css")),
+            Script(_Counting("/a.js")),
+            Script("/b.js"),
+        ],
+        lambda: [
+            Link(rel="x", href=_Counting("/x")),
+            Title("T"),
+            Link(rel="y", href=_Counting("/y")),
+        ],
+        lambda: [Link(rel="x", href=_Counting("/x")), Title("T")],
+        lambda: [Title("T"), Link(rel="x", href=_Counting("/x"))],
+    ],
+    ids=["page", "title-between-dynamic", "title-last", "title-first"],
+)
+def test_plan_matches_uncached_output(render_head_tag, render_title_tag, elements):
+    h = Head(elements())
+    kwargs = {"render_head_tag": render_head_tag, "render_title_tag": render_title_tag}
+    assert str(h.compile(**kwargs)) == _uncached(h, **kwargs)
+    assert str(h.compile(**kwargs)) == _uncached(h, **kwargs)
+    assert "".join(h.iter_compile(**kwargs)) == _uncached(h, **kwargs)
+
+    buffer: list[str] = []
+    h.render_into(buffer, **kwargs)
+    assert "".join(buffer) == _uncached(h, **kwargs)
+
+
+def test_plan_resolves_delayed_values_on_every_compile():
+    delayed = _Counting("/first.css")
+    h = Head([Page(title="T"), Stylesheet(delayed)])
+    assert 'href="/first.css"' in str(h.compile())
+    delayed.value = "/second.css"
+    assert 'href="/second.css"' in str(h.compile())
+    assert delayed.calls == 2
+
+
+def test_plan_invalidated_by_extend():
+    h = Head([Page(title="T")])
+    str(h.compile())
+    h.extend([Description("Added")])
+    assert 'content="Added"' in str(h.compile())
+
+
+def test_plan_invalidated_by_element_mutation():
+    h = Head([Description("before")])
+    assert "before" in str(h.compile())
+    h.e["description"]._description = "after"
+    out = str(h.compile())
+    assert "after" in out
+    assert "before" not in out
+
+
+def test_plan_invalidated_by_direct_e_assignment():
+    h = Head([Page(title="T")])
+    str(h.compile())
+    h.e["title"] = Title("Replaced")
+    assert "<title>Replaced</title>" in str(h.compile())
+
+
+def test_plan_invalidated_by_nested_mutation():
+    geo = GeoPosition(icbm="1, 2")
+    h = Head([geo])
+    assert 'content="1, 2"' in str(h.compile())
+    geo._icbm._content = "3, 4"
+    assert 'content="3, 4"' in str(h.compile())
+
+
+def test_plan_kept_when_other_heads_change():
+    description = Description("other")
+    other = Head([description])
+    h = Head([Page(title="T"), Stylesheet(_Counting("/a.css"))])
+    str(other.compile())
+    plan = h._plan(True, True)
+    template = HeadTemplate(h)
+    compiled = template._compile(True, True)
+
+    description._description = "changed"
+    assert h._plan(True, True) is plan
+    assert template._compile(True, True) == compiled
+    assert "changed" in str(other.compile())
+
+
+# ---------- layers ----------
+
+
+def _site_layers():
+    site = [
+        Page(title="Site", description="Site description", keywords="a, b"),
+        Stylesheet("/site.css"),
+        Script(_Counting("/site.js")),
+        SocialMediaCard(title="Site", description="Site card"),
+    ]
+    section = [Stylesheet("/section.css"), Description("Section description")]
+    page = [Page(title="Page", subject="Subject"), Script("/page.js")]
+    return site, section, page
+
+
+@pytest.mark.parametrize("render_head_tag", [True, False])
+@pytest.mark.parametrize("render_title_tag", [True, False])
+def test_layers_match_flat_head(render_head_tag, render_title_tag):
+    site, section, page = _site_layers()
+    kwargs = {"render_head_tag": render_head_tag, "render_title_tag": render_title_tag}
+
+    base = Head(site)
+    base.compile(**kwargs)
+    layered = base.layer(section).layer(page)
+
+    assert layered.compile(**kwargs) == Head([*site, *section, *page]).compile(**kwargs)
+    assert list(layered.e) == list(Head([*site, *section, *page]).e)
+
+
+def test_layer_leaves_parent_untouched():
+    site, section, _ = _site_layers()
+    base = Head(site)
+    before = base.compile()
+
+    base.layer(section).compile()
+
+    assert base.compile() == before
+    assert "section.css" not in str(before)
+
+
+def test_layer_follows_changes_to_parent():
+    base = Head([Page(title="Site")])
+    layered = base.layer([Script("/page.js")])
+    layered.extend([Script("/extra.js")])
+    str(layered.compile())
+
+    base.extend([Stylesheet("/added.css")])
+    out = str(layered.compile())
+
+    assert 'href="/added.css"' in out
+    assert 'src="/page.js"' in out
+    assert 'src="/extra.js"' in out
+
+
+def test_layer_keeps_its_changes_when_parent_changes():
+    site = Head([Page(title="Site"), Link(rel="canonical", href="/"), Script("/a.js")])
+    page = site.layer([Description("Page")])
+    page.replace(page.find(rel="canonical"), Link(rel="canonical", href="/page"))
+    page.remove(page.find(Script))
+    page.e["description"]._description = "Changed"
+
+    site.copy()
+    site.e["title"]
+    out = str(page.compile())
+    assert 'href="/page"' in out
+    assert "/a.js" not in out
+    assert 'content="Changed"' in out
+
+    site.extend([Stylesheet("/added.css")])
+    out = str(page.compile())
+    assert 'href="/added.css"' in out
+    assert 'href="/page"' in out
+    assert "/a.js" not in out
+    assert 'content="Changed"' in out
+
+
+def test_layer_follows_elements_changed_through_parent_e():
+    site = Head([Page(title="Site")])
+    page = site.layer([Description("Page")])
+    str(page.compile())
+
+    version = site.e.version
+    site.e["title"].title_ = "Renamed"
+    assert site.e.version == version
+    assert "<title>Renamed</title>" in str(page.compile())
+
+
+def test_layer_planning_does_not_grow_with_parent(monkeypatch):
+    planned = []
+    memoize = BaseElement._memoize
+    monkeypatch.setattr(
+        BaseElement, "_memoize", lambda self: planned.append(self) or memoize(self)
+    )
+
+    counts = []
+    for size in (10, 1000):
+        site = Head(
+            [
+                Page(title="Site"),
+                Link(rel="canonical", href="/"),
+                *[
+                    Link(rel="alternate", href=f"/{i}", hreflang=f"l{i}")
+                    for i in range(size)
+                ],
+                Script(_Counting("/site.js")),
+            ]
+        )
+        # The first layer plans the parent without the head tag, once.
+        str(site.layer([]))
+
+        planned.clear()
+        page = site.layer([Page(title="Page"), Script("/page.js")])
+        page.replace(page.find(rel="canonical"), Link(rel="canonical", href="/page"))
+        out = str(page.compile())
+        counts.append(len(planned))
+
+        assert out == _uncached(page)
+
+    assert counts[0] == counts[1]
+
+
+def test_layer_reuses_parent_output():
+    calls = []
+
+    class _CountingDescription(Description):
+        def compile(self) -> str:
+            calls.append(self)
+            return super().compile()
+
+    base = Head([Page(title="Site"), _CountingDescription("Shared")])
+    str(base.compile())
+
+    for title in ("One", "Two"):
+        assert "Shared" in str(base.layer([Title(title)]).compile())
+
+    assert len(calls) == 1
+
+
+# ---------- iter_compile ----------
+
+
+@pytest.mark.parametrize("render_head_tag", [True, False])
+@pytest.mark.parametrize("render_title_tag", [True, False])
+def test_iter_compile_joins_to_compile(render_head_tag, render_title_tag):
+    h = Head(
+        [
+            Page(title="T", description="D"),
+            Script(_Counting("/a.js")),
+            Script(_Counting("/b.js")),
+            Script("/c.js"),
+        ]
+    )
+    kwargs = {"render_head_tag": render_head_tag, "render_title_tag": render_title_tag}
+    assert "".join(h.iter_compile(**kwargs)) == str(h.compile(**kwargs))
+
+
+def test_iter_compile_defers_delayed_values_until_reached():
+    delayed = _Counting("/late.js")
+    chunks = Head([Page(title="T"), Script(delayed)]).iter_compile()
+
+    first = next(chunks)
+    assert first.startswith("<head>")
+    assert "<title>T</title>" in first
+    assert delayed.calls == 0
+
+    rest = "".join(chunks)
+    assert delayed.calls == 1
+    assert 'src="/late.js"' in rest
+    assert rest.endswith("</head>")
+
+
+# ---------- compile_async ----------
+
+
+class _AsyncDelayed:
+    """AsyncCompileDelayed stand-in that records when it starts resolving."""
+
+    def __init__(self, value: str, started: list, delay: float = 0.0) -> None:
+        self.value = value
+        self.started = started
+        self.delay = delay
+        self.calls = 0
+
+    async def compile_async(self) -> str:
+        self.calls += 1
+        self.started.append(self.value)
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+def test_compile_async_resolves_values_across_elements():
+    started: list = []
+    h = Head(
+        [
+            Page(title="T"),
+            Base(_AsyncDelayed("/base/", started)),
+            Meta(name="n", content=_AsyncDelayed("meta-content", started)),
+            Link(rel="canonical", href=_AsyncDelayed("/canonical", started)),
+            Script(_AsyncDelayed("/a.js", started)),
+            Stylesheet(_AsyncDelayed("/a.css", started)),
+            Favicon(ico_icon_href=_AsyncDelayed("/favicon.ico", started)),
+            Script(_Counting("/sync.js")),
+        ]
+    )
+    out = str(asyncio.run(h.compile_async()))
+    for needle in [
+        '<base href="/base/">',
+        'content="meta-content"',
+        'href="/canonical"',
+        'src="/a.js"',
+        'href="/a.css"',
+        'href="/favicon.ico"',
+        'src="/sync.js"',
+    ]:
+        assert needle in out
+
+
+def test_compile_async_awaits_values_concurrently():
+    started: list = []
+
+    class _Probe(_AsyncDelayed):
+        async def compile_async(self) -> str:
+            self.started.append(self.value)
+            await asyncio.sleep(0.01)
+            # every value has started before the first one finishes
+            return str(len(self.started))
+
+    h = Head([Script(_Probe("a", started)), Script(_Probe("b", started))])
+    out = str(asyncio.run(h.compile_async()))
+    assert out.count('src="2"') == 2
+
+
+def test_compile_async_awaits_shared_value_once():
+    image = _AsyncDelayed("/og.png", [])
+    h = Head([SocialMediaCard(title="T", image=image)])
+    out = str(asyncio.run(h.compile_async()))
+    assert image.calls == 1
+    assert 'property="og:image" content="/og.png"' in out
+    assert 'name="twitter:image" content="/og.png"' in out
+
+
+def test_compile_async_timeout_uses_fallback():
+    h = Head(
+        [
+            Script(_AsyncDelayed("/slow.js", [], delay=1)),
+            Script(_AsyncDelayed("/fast.js", [])),
+        ]
+    )
+    out = str(asyncio.run(h.compile_async(timeout=0.01, fallback="/fallback.js")))
+    assert 'src="/fallback.js"' in out
+    assert 'src="/fast.js"' in out
+
+
+def test_compile_async_matches_compile_for_sync_heads():
+    h = Head([Page(title="T"), Stylesheet(_Counting("/a.css"))])
+    assert asyncio.run(h.compile_async()) == h.compile()
+
+
+def test_sync_compile_rejects_async_only_values():
+    h = Head([Script(_AsyncDelayed("/a.js", []))])
+    with pytest.raises(TypeError, match="compile_async"):
+        h.compile()
+
+
+def test_compile_async_in_jinja_async_environment():
+    jinja2 = pytest.importorskip("jinja2")
+
+    env = jinja2.Environment(enable_async=True, autoescape=True)
+    template = env.from_string("{{ head.compile_async() }}")
+    h = Head([Page(title="T"), Script(_AsyncDelayed("/a.js", []))])
+
+    out = asyncio.run(template.render_async(head=h))
+    assert "<title>T</title>" in out
+    assert 'src="/a.js"' in out
+
+
+# ---------- threaded compile ----------
+
+
+class _Blocking:
+    """Blocking CompileDelayed stand-in that waits for its peers on a barrier."""
+
+    blocking = True
+
+    def __init__(self, value: str, barrier: threading.Barrier) -> None:
+        self.value = value
+        self.barrier = barrier
+        self.thread = None
+
+    def compile(self) -> str:
+        self.thread = threading.current_thread()
+        self.barrier.wait()
+        return self.value
+
+
+def test_threaded_compile_resolves_blocking_values_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    values = [_Blocking(f"/{n}.js", barrier) for n in "abc"]
+    h = Head([Page(title="T"), *[Script(v) for v in values]])
+
+    out = str(h.compile(threaded=True))
+
+    assert (
+        out.index('src="/a.js"') < out.index('src="/b.js"') < out.index('src="/c.js"')
+    )
+    assert all(v.thread is not threading.current_thread() for v in values)
+
+
+def test_threaded_compile_matches_compile():
+    barrier = threading.Barrier(1)
+    h = Head(
+        [
+            Page(title="T"),
+            Script(_Blocking("/a.js", barrier)),
+            Stylesheet(_Blocking("/a.css", barrier)),
+            Script(_Counting("/b.js")),
+        ]
+    )
+    assert h.compile(threaded=True) == h.compile()
+
+
+def test_threaded_compile_propagates_context():
+    request_id = contextvars.ContextVar("request_id")
+
+    class _FromContext(_Blocking):
+        def compile(self) -> str:
+            return f"/{request_id.get()}{self.value}"
+
+    barrier = threading.Barrier(1)
+    h = Head(
+        [Script(_FromContext(".js", barrier)), Script(_FromContext(".mjs", barrier))]
+    )
+
+    request_id.set("req-1")
+    out = str(h.compile(threaded=True))
+    assert 'src="/req-1.js"' in out
+    assert 'src="/req-1.mjs"' in out
+
+
+def test_threaded_compile_uses_assigned_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    barrier = threading.Barrier(2, timeout=5)
+    values = [_Blocking("/a.js", barrier), _Blocking("/b.js", barrier)]
+    h = Head([Script(v) for v in values])
+
+    with ThreadPoolExecutor(2, thread_name_prefix="custom") as executor:
+        h.executor = executor
+        h.compile(threaded=True)
+
+    assert all(v.thread.name.startswith("custom") for v in values)
+
+
+# ---------- cache keys ----------
+
+
+class _Keyed(_Counting):
+    """CompileDelayed stand-in that declares a cache key."""
+
+    def __init__(self, value: str, key: object = "k") -> None:
+        super().__init__(value)
+        self.key = key
+
+    def cache_key(self) -> object:
+        return self.key
+
+
+def test_cache_key_caches_whole_output():
+    value = _Keyed("/a.css")
+    h = Head([Page(title="T"), Stylesheet(value)])
+
+    first = h.compile()
+    assert h.compile() == first
+    assert value.calls == 1
+
+    info = h.cache_info()
+    assert (info.outputs.hits, info.outputs.misses) == (1, 1)
+
+
+def test_cache_key_change_resolves_again():
+    value = _Keyed("/a.css")
+    h = Head([Stylesheet(value)])
+    str(h.compile())
+
+    value.key, value.value = "other", "/b.css"
+    assert 'href="/b.css"' in str(h.compile())
+    assert value.calls == 2
+
+
+def test_cache_key_none_skips_cache():
+    value = _Keyed("/a.css", key=None)
+    h = Head([Stylesheet(value)])
+    h.compile()
+    h.compile()
+    assert value.calls == 2
+
+
+def test_values_cached_when_output_is_not():
+    keyed = _Keyed("/a.css")
+    plain = _Counting("/a.js")
+    h = Head([Stylesheet(keyed), Script(plain)])
+
+    h.compile()
+    h.compile()
+
+    assert (keyed.calls, plain.calls) == (1, 2)
+    info = h.cache_info()
+    assert (info.values.hits, info.outputs.currsize) == (1, 0)
+
+
+def test_output_cached_with_keywords():
+    value = _Keyed("/a.css")
+    keywords = Keywords(from_list=["a"])
+    h = Head([Stylesheet(value), keywords])
+    str(h.compile())
+    str(h.compile())
+    assert h.cache_info().outputs.hits == 1
+
+    keywords._keywords = (*keywords._keywords, "b")
+    assert "a, b" in str(h.compile())
+
+
+def test_element_mutation_skips_cached_output():
+    value = _Keyed("/a.css")
+    stylesheet = Stylesheet(value)
+    h = Head([stylesheet])
+    str(h.compile())
+
+    stylesheet._id = "main"
+    assert 'id="main"' in str(h.compile())
+    assert value.calls == 1
+    assert h.cache_info().outputs.hits == 0
+
+
+def test_caches_shared_with_copies_and_layers():
+    value = _Keyed("/a.css")
+    site = Head([Page(title="T"), Stylesheet(value)])
+
+    str(site.compile())
+    for _ in range(3):
+        str(site.copy().extend([Script("/page.js")]).compile())
+    str(site.copy().compile())
+    str(site.layer([Script("/layer.js")]).compile())
+
+    assert value.calls == 1
+    info = site.cache_info()
+    assert (info.values.hits, info.values.misses) == (4, 1)
+    assert (info.outputs.hits, info.outputs.misses) == (1, 5)
+
+
+def test_shared_output_cache_keys_on_plan():
+    value = _Keyed("/a.css")
+    a = Head([Stylesheet(value)])
+    b = a.copy().extend([Description("B")])
+
+    assert "B" not in str(a.compile())
+    assert 'content="B"' in str(b.compile())
+    assert "B" not in str(a.compile())
+
+
+def test_rendered_head_can_be_deep_copied():
+    value = _Keyed("/a.css")
+    h = Head([Page(title="T"), Stylesheet(value)])
+    out = h.compile()
+
+    copied = deepcopy(h)
+    assert copied.cache_info().values.currsize == 0
+    assert copied.compile() == out
+    assert h.cache_info().outputs.currsize == 1
+
+
+def test_rendered_head_survives_pickle_round_trip():
+    h = Head([Page(title="T", description="D"), Stylesheet("/a.css")])
+    out = h.compile()
+    h.copy().compile()
+
+    loaded = pickle.loads(pickle.dumps(h))
+    assert loaded.compile() == out
+    assert loaded.cache_info().outputs.currsize == 0
+
+
+def test_varies_on_registered_dependency():
+    locale = contextvars.ContextVar("locale", default="en")
+    register_dependency("test_locale", locale.get)
+
+    class _Localized(_Counting):
+        def compile(self) -> str:
+            super().compile()
+            return f"/{locale.get()}.css"
+
+        def varies_on(self) -> tuple[str, ...]:
+            return ("test_locale",)
+
+    value = _Localized("")
+    h = Head([Stylesheet(value)])
+
+    assert 'href="/en.css"' in str(h.compile())
+    assert 'href="/en.css"' in str(h.compile())
+    locale.set("fr")
+    assert 'href="/fr.css"' in str(h.compile())
+    assert value.calls == 2
+
+
+def test_varies_on_unregistered_dependency_skips_cache():
+    class _Unknown(_Counting):
+        def varies_on(self) -> tuple[str, ...]:
+            return ("nowhere",)
+
+    value = _Unknown("/a.css")
+    h = Head([Stylesheet(value)])
+    h.compile()
+    h.compile()
+    assert value.calls == 2
+
+
+# ---------- render_into ----------
+
+
+@pytest.mark.parametrize("buffer", [list, io.StringIO])
+def test_render_into_matches_compile(buffer):
+    delayed = _Counting("/a & b.css")
+    h = Head(
+        [
+            Page(title="T", description="D"),
+            SocialMediaCard(title="S", image=_Counting("/og.png")),
+            Stylesheet(delayed),
+            Favicon(ico_icon_href="/favicon.ico"),
+        ]
+    )
+
+    for _ in range(2):
+        out = buffer()
+        h.render_into(out, render_title_tag=False)
+        rendered = "".join(out) if isinstance(out, list) else out.getvalue()
+        assert rendered == h.compile(render_title_tag=False)
+
+    delayed.value = "/b.css"
+    out = ["<html>"]
+    h.render_into(out)
+    assert "".join(out) == "<html>" + str(h.compile())
+
+
+def test_render_into_uses_cached_output():
+    value = _Keyed("/a.css")
+    h = Head([Page(title="T"), Stylesheet(value)])
+    first = h.compile()
+
+    out: list[str] = []
+    h.render_into(out)
+    assert out == [first]
+    assert value.calls == 1
+
+
+# ---------- Serializers ----------
+
+
+def _serialized_head() -> Head:
+    return Head(
+        [
+            Title("A & B"),
+            Meta(name="robots", content="index"),
+            Stylesheet("/main.css?v=1&x=2"),
+            Script("/app.js", defer=True),
+            Link(rel="preload", href="/font.woff2", type_="font/woff2", id_="font"),
+        ]
+    )
+
+
+def test_serialize_html_and_xhtml():
+    h = _serialized_head()
+    assert h.serialize(serializers.html) == h.compile(render_head_tag=False).lstrip(
+        "\n"
+    )
+    assert h.serialize(serializers.xhtml, render_title_tag=False).splitlines() == [
+        '<meta name="robots" content="index" />',
+        '<link rel="stylesheet" href="/main.css?v=1&amp;x=2" />',
+        '<script src="/app.js" defer="true"></script>',
+        '<link rel="preload" href="/font.woff2" type="font/woff2" id="font" />',
+    ]
+
+
+def test_serialize_link_header_and_json():
+    h = _serialized_head()
+    assert h.serialize(serializers.link_header) == (
+        '</main.css?v=1&x=2>; rel="stylesheet", '
+        '</font.woff2>; rel="preload"; type="font/woff2"'
+    )
+
+    records = json.loads(h.serialize(serializers.json))
+    assert records[0] == {"tag": "title", "attributes": {}, "text": "A & B"}
+    assert records[2]["attributes"] == {
+        "rel": "stylesheet",
+        "href": "/main.css?v=1&x=2",
+    }
+
+
+def test_serialize_resolves_batched_values():
+    class _Batched(_Counting):
+        batches = 0
+
+        @classmethod
+        def compile_many(cls, values):
+            cls.batches += 1
+            return [value.value for value in values]
+
+    h = Head([Stylesheet(_Batched("/a.css")), Script(_Batched("/a.js"))])
+    assert h.serialize(serializers.link_header) == '</a.css>; rel="stylesheet"'
+    assert _Batched.batches == 1
+
+
+# ---------- HeadTemplate ----------
+
+
+def _template_elements(title, description, url, image, stylesheet) -> list:
+    return [
+        Page(title=title, description=description, keywords="a, b"),
+        Link(rel="canonical", href=url),
+        SocialMediaCard(title=title, description=description, url=url, image=image),
+        Stylesheet(stylesheet),
+    ]
+
+
+@pytest.mark.parametrize("render_head_tag", [True, False])
+@pytest.mark.parametrize("render_title_tag", [True, False])
+def test_template_matches_head(render_head_tag, render_title_tag):
+    stylesheet = _Counting("/main.css")
+    template = HeadTemplate(
+        _template_elements(
+            Slot("title"), Slot("description"), Slot("url"), Slot("image"), stylesheet
+        )
+    )
+    assert template.slots == ("title", "description", "url", "image")
+
+    for title in ("Tom & Jerry {0}", "Don't"):
+        values = {
+            "title": title,
+            "description": '"Quoted"',
+            "url": "/a?b=1&c=2",
+            "image": _Counting("/og.png"),
+        }
+        head = Head(_template_elements(**values, stylesheet=stylesheet))
+        flags = {
+            "render_head_tag": render_head_tag,
+            "render_title_tag": render_title_tag,
+        }
+        assert template.render(**flags, **values) == head.compile(**flags)
+
+
+def test_template_requires_every_slot():
+    template = HeadTemplate([Title(Slot("title")), Meta(name="x", content=Slot("x"))])
+
+    with pytest.raises(TypeError, match="missing values for slots \\['x'\\]"):
+        template.render(title="T")
+    with pytest.raises(TypeError, match="unknown slots \\['y'\\]"):
+        template.render(title="T", x="X", y="Y")
+
+
+def test_template_finds_slots_elements_split_or_escape():
+    def elements(kw, en, fr):
+        return [
+            Page(title="T", keywords=kw),
+            Alternates({"en": en}),
+            LinkBatch(rel="alternate", href=[fr], hreflang=["fr"]),
+        ]
+
+    template = HeadTemplate(elements(Slot("kw"), Slot("en"), Slot("fr")))
+    assert template.slots == ("kw", "en", "fr")
+
+    values = {"kw": "a & b", "en": "/en?x=1&y=2", "fr": "/fr"}
+    assert template.render(**values) == Head(elements(**values)).compile()
+    with pytest.raises(TypeError, match="missing values for slots \\['kw'\\]"):
+        template.render(en="/en", fr="/fr")
+
+
+def test_template_rejects_slots_added_after_creation():
+    title = Title(Slot("title"))
+    template = HeadTemplate([title])
+
+    title.title_ = Slot("other")
+    with pytest.raises(TypeError, match="'other' was added"):
+        template.render(title="T")
+
+
+def test_template_compiles_again_after_element_mutation():
+    description = Meta(name="description", content="A")
+    template = HeadTemplate([Title(Slot("title")), description])
+    assert 'content="A"' in template.render(title="T")
+
+    description._content = "B"
+    assert 'content="B"' in template.render(title="T")
+
+
+# ---------- render_many ----------
+
+
+def _records(count: int):
+    for n in range(count):
+        yield {"title": f"Page {n} & co", "url": f"/pages/{n}"}
+
+
+def test_render_many_streams_rendered_heads():
+    template = HeadTemplate(
+        [Page(title=Slot("title")), Link(rel="canonical", href=Slot("url"))]
+    )
+    records = _records(5)
+
+    heads = render_many(records, template, render_head_tag=False)
+    first = next(heads)
+    assert first == template.render(False, title="Page 0 & co", url="/pages/0")
+    assert next(records)["title"] == "Page 1 & co"  # read one at a time
+    assert len(list(heads)) == 3
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_render_many_in_chunks_keeps_order(executor_class):
+    template = HeadTemplate(
+        [Page(title=Slot("title")), Link(rel="canonical", href=Slot("url"))]
+    )
+    expected = [template.render(**record) for record in _records(25)]
+
+    with executor_class(max_workers=2) as executor:
+        heads = list(
+            render_many(_records(25), template, executor=executor, chunk_size=4)
+        )
+    assert heads == expected
+
+
+def test_render_many_with_dynamic_elements():
+    template = HeadTemplate([Title(Slot("title")), Stylesheet(_Counting("/a.css"))])
+    records = [{"title": "A"}, {"title": "B"}]
+    assert list(render_many(records, template)) == [
+        template.render(**record) for record in records
+    ]
+
+    with ThreadPoolExecutor() as executor, pytest.raises(ValueError):
+        list(render_many(records, template, executor=executor))